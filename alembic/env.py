@@ -60,6 +60,9 @@ def do_run_migrations(connection: Connection) -> None:
         connection=connection,
         target_metadata=target_metadata,
         include_object=include_object,
+        # Each revision commits on its own, so revisions that need an
+        # autocommit block (CREATE INDEX CONCURRENTLY) can use one.
+        transaction_per_migration=True,
     )
     with context.begin_transaction():
         context.run_migrations()
@@ -74,7 +77,7 @@ async def run_migrations_online() -> None:
         future=True,
     )
 
-    async with connectable.begin() as connection:
+    async with connectable.connect() as connection:
         await connection.run_sync(do_run_migrations)
 
     await connectable.dispose()
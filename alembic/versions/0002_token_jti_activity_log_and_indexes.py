@@ -0,0 +1,116 @@
+"""token jti, activity log, schedule interest and hot path indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 20:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NOT_DELETED = sa.text("is_deleted IS NOT TRUE")
+
+# (name, table, columns, partial) -- partial indexes skip soft-deleted rows.
+INDEXES = (
+    ("ix_payment_schedules_loan_entry_id_month", "payment_schedules", ["loan_entry_id", "month"], True),
+    ("ix_payments_loan_entry_id", "payments", ["loan_entry_id"], True),
+    ("ix_payments_created_at_id", "payments", ["created_at", "id"], False),
+    ("ix_loan_entries_employee_id", "loan_entries", ["employee_id"], False),
+    ("ix_loan_entries_loan_id", "loan_entries", ["loan_id"], False),
+    ("ix_loan_entries_employee_code", "loan_entries", ["employee_code"], False),
+    ("ix_loan_entries_created_at_id", "loan_entries", ["created_at", "id"], False),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Revoked tokens are looked up by jti and purged once expired; the
+    # full token is no longer stored for new revocations.
+    with op.batch_alter_table('revokedtoken') as batch_op:
+        batch_op.add_column(sa.Column('jti', sa.String(length=32), nullable=True))
+        batch_op.add_column(sa.Column('expires_at', sa.DateTime(), nullable=True))
+        batch_op.alter_column('token', existing_type=sa.String(length=255), nullable=True)
+        batch_op.create_unique_constraint('revokedtoken_jti_key', ['jti'])
+    op.create_index(op.f('ix_revokedtoken_expires_at'), 'revokedtoken', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_revokedtoken_revoked_at'), 'revokedtoken', ['revoked_at'], unique=False)
+
+    op.create_table('user_activity_logs',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('ip', sa.String(length=45), nullable=True),
+    sa.Column('device', sa.String(length=255), nullable=True),
+    sa.Column('ip_changed', sa.Boolean(), nullable=True),
+    sa.Column('device_changed', sa.Boolean(), nullable=True),
+    sa.Column('seen_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_user_activity_logs_seen_at'), 'user_activity_logs', ['seen_at'], unique=False)
+    op.create_index(op.f('ix_user_activity_logs_username'), 'user_activity_logs', ['username'], unique=False)
+
+    # Interest on a large balance does not fit in DECIMAL(5, 2).
+    with op.batch_alter_table('payment_schedules') as batch_op:
+        batch_op.alter_column(
+            'interest',
+            existing_type=sa.DECIMAL(precision=5, scale=2),
+            type_=sa.DECIMAL(precision=10, scale=2),
+            existing_nullable=True,
+        )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns, partial in INDEXES:
+            where = NOT_DELETED if partial else None
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=where,
+                sqlite_where=where,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
+
+    # Fails on Postgres if any interest has outgrown the old precision.
+    with op.batch_alter_table('payment_schedules') as batch_op:
+        batch_op.alter_column(
+            'interest',
+            existing_type=sa.DECIMAL(precision=10, scale=2),
+            type_=sa.DECIMAL(precision=5, scale=2),
+            existing_nullable=True,
+        )
+
+    op.drop_index(op.f('ix_user_activity_logs_username'), table_name='user_activity_logs')
+    op.drop_index(op.f('ix_user_activity_logs_seen_at'), table_name='user_activity_logs')
+    op.drop_table('user_activity_logs')
+
+    # Revocations recorded by jti alone have no token to keep.
+    op.execute("DELETE FROM revokedtoken WHERE token IS NULL")
+    op.drop_index(op.f('ix_revokedtoken_revoked_at'), table_name='revokedtoken')
+    op.drop_index(op.f('ix_revokedtoken_expires_at'), table_name='revokedtoken')
+    with op.batch_alter_table('revokedtoken') as batch_op:
+        batch_op.drop_constraint('revokedtoken_jti_key', type_='unique')
+        batch_op.alter_column('token', existing_type=sa.String(length=255), nullable=False)
+        batch_op.drop_column('expires_at')
+        batch_op.drop_column('jti')
@@ -0,0 +1,107 @@
+"""schedule due dates and periods
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 21:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NOT_DELETED = sa.text("is_deleted IS NOT TRUE")
+
+# Installment n falls due n - 1 months after the loan's deduction start
+# period, matching the schedule preview.
+BACKFILL_DUE_DATE = {
+    "postgresql": """
+        UPDATE payment_schedules AS ps
+        SET due_date = (p.start_date + (ps.month - 1) * INTERVAL '1 month')::date
+        FROM loan_entries AS le
+        JOIN periods AS p ON p.id = le.deduction_start_period_id
+        WHERE le.id = ps.loan_entry_id AND ps.due_date IS NULL
+    """,
+    "sqlite": """
+        UPDATE payment_schedules AS ps
+        SET due_date = date(p.start_date, printf('+%d months', ps.month - 1))
+        FROM loan_entries AS le
+        JOIN periods AS p ON p.id = le.deduction_start_period_id
+        WHERE le.id = ps.loan_entry_id AND ps.due_date IS NULL
+    """,
+}
+
+# The earliest-created period of the due date's month, as the application does.
+BACKFILL_PERIOD_ID = {
+    "postgresql": """
+        UPDATE payment_schedules AS ps
+        SET period_id = p.id
+        FROM (
+            SELECT DISTINCT ON (date_trunc('month', start_date)) id, start_date
+            FROM periods
+            ORDER BY date_trunc('month', start_date), created_at
+        ) AS p
+        WHERE ps.period_id IS NULL
+          AND date_trunc('month', ps.due_date) = date_trunc('month', p.start_date)
+    """,
+    "sqlite": """
+        UPDATE payment_schedules
+        SET period_id = (
+            SELECT p.id FROM periods AS p
+            WHERE strftime('%Y-%m', p.start_date)
+                = strftime('%Y-%m', payment_schedules.due_date)
+            ORDER BY p.created_at
+            LIMIT 1
+        )
+        WHERE period_id IS NULL AND due_date IS NOT NULL
+    """,
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('payment_schedules') as batch_op:
+        batch_op.add_column(sa.Column('due_date', sa.Date(), nullable=True))
+        batch_op.add_column(sa.Column('period_id', sa.Uuid(), nullable=True))
+        batch_op.create_foreign_key(
+            'payment_schedules_period_id_fkey', 'periods', ['period_id'], ['id']
+        )
+
+    dialect = op.get_bind().dialect.name
+    if dialect in BACKFILL_DUE_DATE:
+        op.execute(BACKFILL_DUE_DATE[dialect])
+        op.execute(BACKFILL_PERIOD_ID[dialect])
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_payment_schedules_period_id_company_id',
+            'payment_schedules',
+            ['period_id', 'company_id'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+            postgresql_where=NOT_DELETED,
+            sqlite_where=NOT_DELETED,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_payment_schedules_period_id_company_id',
+            table_name='payment_schedules',
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+    with op.batch_alter_table('payment_schedules') as batch_op:
+        batch_op.drop_column('period_id')
+        batch_op.drop_column('due_date')
@@ -9,6 +9,7 @@ from api.v1.loan import router as loan_router
 from api.v1.loan_entry import router as loan_entry_router
 from api.v1.payment_schedule import router as payment_schedule_router
 from api.v1.auth import router as auth_router
+from api.v1.holiday import router as holiday_router
 
 api_router = APIRouter()
 
@@ -21,3 +22,4 @@ api_router.include_router(loan_router, prefix="/v1")
 api_router.include_router(loan_entry_router, prefix="/v1")
 api_router.include_router(payment_schedule_router, prefix="/v1")
 api_router.include_router(auth_router, prefix="/v1")
+api_router.include_router(holiday_router, prefix="/v1")
@@ -3,8 +3,9 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from config.db import get_session
 from services.user import UserService
-from config.dependencies import get_current_user
-from models.user import RevokedToken, User
+from config.dependencies import get_current_user, revoked_tokens
+from models.user import User
+from services.token import TokenRevocationService
 from schemas.user import RefreshToken, UserLogin, Token
 
 security = HTTPBearer()
@@ -39,10 +40,8 @@ async def logout(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     session: AsyncSession = Depends(get_session),
 ):
-    token = credentials.credentials
-
-    revoked = RevokedToken(token=token)
-    session.add(revoked)
-    await session.commit()
+    await TokenRevocationService.revoke(
+        token=credentials.credentials, session=session, revoked=revoked_tokens
+    )
 
     return {"detail": "Logged out successfully"}
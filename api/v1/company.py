@@ -1,12 +1,14 @@
 from uuid import UUID
 
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, Depends, Request, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from config.dependencies import get_current_user
 from models.user import User
 from schemas.company import CompanyRead, CompanyCreate, CompanyUpdate
 from schemas.base import ResponseModel
+from utils.pagination import page_response, with_links
+from utils.text_options import CountMode
 
 from config.db import get_session
 from services.company import CompanyService
@@ -33,20 +35,25 @@ async def get_company(
     return await CompanyService.get_company(id=id, session=session)
 
 
-@router.get("/", response_model=ResponseModel, status_code=status.HTTP_200_OK)
+@router.get(
+    "/", response_model=ResponseModel[CompanyRead], status_code=status.HTTP_200_OK
+)
 async def get_companies(
+    request: Request,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
     name: str | None = None,
     limit: int = 10,
-    offset: int = 0,
+    cursor: str | None = None,
+    count: CountMode | None = None,
 ):
-    return await CompanyService.get_companies(
-        session=session, name=name, limit=limit, offset=offset
+    page = await CompanyService.get_companies(
+        session=session, name=name, limit=limit, cursor=cursor, count=count
     )
+    return page_response(with_links(page, request), schema=CompanyRead)
 
 
-@router.patch("/{id}", response_model=ResponseModel, status_code=status.HTTP_200_OK)
+@router.patch("/{id}", response_model=CompanyRead, status_code=status.HTTP_200_OK)
 async def update_company(
     id: UUID,
     data: CompanyUpdate,
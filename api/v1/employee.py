@@ -1,5 +1,5 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.status import HTTP_200_OK
 
@@ -9,6 +9,13 @@ from models.user import User
 from schemas.base import ResponseModel
 from schemas.employee import EmployeeCreate, EmployeeRead, EmployeeUpdate
 from services.employee import EmployeeService
+from utils.pagination import (
+    item_response,
+    page_response,
+    parse_fields,
+    with_links,
+)
+from utils.text_options import CountMode
 
 
 router = APIRouter(prefix="/employees", tags=["employees"])
@@ -28,14 +35,20 @@ async def create_employee(
 @router.get("/{id}", response_model=EmployeeRead, status_code=HTTP_200_OK)
 async def get_employee(
     id: UUID,
+    fields: str | None = None,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    return await EmployeeService.get_employee(id=id, session=session)
+    field_names = parse_fields(fields, EmployeeRead)
+    employee = await EmployeeService.get_employee(id=id, session=session)
+    return item_response(employee, schema=EmployeeRead, fields=field_names)
 
 
-@router.get("/", response_model=ResponseModel, status_code=status.HTTP_200_OK)
+@router.get(
+    "/", response_model=ResponseModel[EmployeeRead], status_code=status.HTTP_200_OK
+)
 async def get_employees(
+    request: Request,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
     company_id: UUID | None = None,
@@ -47,9 +60,12 @@ async def get_employees(
     fullname: str | None = None,
     national_id: str | None = None,
     limit: int = 10,
-    offset: int = 0,
+    cursor: str | None = None,
+    count: CountMode | None = None,
+    fields: str | None = None,
 ):
-    return await EmployeeService.get_employees(
+    field_names = parse_fields(fields, EmployeeRead)
+    page = await EmployeeService.get_employees(
         session=session,
         company_id=company_id,
         code=code,
@@ -60,7 +76,12 @@ async def get_employees(
         fullname=fullname,
         national_id=national_id,
         limit=limit,
-        offset=offset,
+        cursor=cursor,
+        count=count,
+        fields=field_names,
+    )
+    return page_response(
+        with_links(page, request), schema=EmployeeRead, fields=field_names
     )
 
 
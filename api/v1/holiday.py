@@ -0,0 +1,102 @@
+from datetime import date
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Request, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config.db import get_session
+from config.dependencies import get_current_user
+from models.user import User
+from schemas.base import ResponseModel
+from schemas.holiday import HolidayCreate, HolidayRead, HolidayUpdate, WorkingDaysRead
+from services.holiday import HolidayService
+from utils.pagination import page_response, with_links
+from utils.text_options import CountMode
+
+
+router = APIRouter(prefix="/holidays", tags=["holidays"])
+
+
+@router.post("/", response_model=HolidayRead, status_code=status.HTTP_201_CREATED)
+async def create_holiday(
+    data: HolidayCreate,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    return await HolidayService.create_holiday(
+        data=data, session=session, current_user=current_user
+    )
+
+
+@router.get(
+    "/", response_model=ResponseModel[HolidayRead], status_code=status.HTTP_200_OK
+)
+async def get_holidays(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+    company_id: UUID | None = None,
+    country: str | None = None,
+    year: int | None = None,
+    limit: int = 10,
+    cursor: str | None = None,
+    count: CountMode | None = None,
+):
+    page = await HolidayService.get_holidays(
+        session=session,
+        company_id=company_id,
+        country=country,
+        year=year,
+        limit=limit,
+        cursor=cursor,
+        count=count,
+    )
+    return page_response(with_links(page, request), schema=HolidayRead)
+
+
+@router.get(
+    "/working_days", response_model=WorkingDaysRead, status_code=status.HTTP_200_OK
+)
+async def get_working_days(
+    start_date: date,
+    end_date: date,
+    company_id: UUID | None = None,
+    country: str | None = None,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    return await HolidayService.get_working_days(
+        start_date=start_date,
+        end_date=end_date,
+        session=session,
+        company_id=company_id,
+        country=country,
+    )
+
+
+@router.get("/{id}", response_model=HolidayRead, status_code=status.HTTP_200_OK)
+async def get_holiday(
+    id: UUID,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    return await HolidayService.get_holiday(id=id, session=session)
+
+
+@router.patch("/{id}", response_model=HolidayRead, status_code=status.HTTP_200_OK)
+async def update_holiday(
+    id: UUID,
+    data: HolidayUpdate,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    return await HolidayService.update_holiday(id=id, data=data, session=session)
+
+
+@router.delete("/{id}", response_model={}, status_code=status.HTTP_204_NO_CONTENT)
+async def delete_holiday(
+    id: UUID,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    return await HolidayService.delete_holiday(id=id, session=session)
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from config.db import get_session
@@ -9,14 +9,16 @@ from models.user import User
 from schemas.loan import LoanCreate, LoanRead, LoanUpdate
 from services.loan import LoanService
 from schemas.base import ResponseModel
-from utils.text_options import InterestCalculationType, InterestTerm
+from utils.pagination import page_response, with_links
+from utils.text_options import CountMode, InterestCalculationType, InterestTerm
 
 
 router = APIRouter(prefix="/loans", tags=["loans"])
 
 
-@router.get("/", response_model=ResponseModel, status_code=status.HTTP_200_OK)
+@router.get("/", response_model=ResponseModel[LoanRead], status_code=status.HTTP_200_OK)
 async def get_loans(
+    request: Request,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
     code: str | None = None,
@@ -24,17 +26,20 @@ async def get_loans(
     interest_term: InterestTerm | None = None,
     calculation_type: InterestCalculationType | None = None,
     limit: int = 10,
-    offset: int = 0,
+    cursor: str | None = None,
+    count: CountMode | None = None,
 ):
-    return await LoanService.get_loans(
+    page = await LoanService.get_loans(
         session=session,
         code=code,
         name=name,
         interest_term=interest_term,
         calculation_type=calculation_type,
         limit=limit,
-        offset=offset,
+        cursor=cursor,
+        count=count,
     )
+    return page_response(with_links(page, request), schema=LoanRead)
 
 
 @router.get("/{id}", response_model=LoanRead, status_code=status.HTTP_200_OK)
@@ -1,20 +1,41 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Request, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from config.dependencies import get_current_user
 from models.user import User
 from schemas.base import ResponseModel
+from services.idempotency import IdempotencyService
 from services.loan import LoanEntriesService
-from schemas.loan import LoanEntriesRead, LoanEntriesCreate, LoanEntriesUpdate
+from schemas.loan import (
+    LoanEntriesRead,
+    LoanEntriesCreate,
+    LoanEntriesPreview,
+    LoanEntriesPreviewRead,
+    LoanEntriesUpdate,
+)
 from config.db import get_session
-from utils.text_options import InterestCalculationType, InterestTerm
+from utils.pagination import (
+    item_response,
+    page_response,
+    parse_fields,
+    with_links,
+)
+from utils.text_options import (
+    CountMode,
+    ExportFormat,
+    InterestCalculationType,
+    InterestTerm,
+)
 
 router = APIRouter(prefix="/loan_entries", tags=["loan entries"])
 
 
-@router.get("/", response_model=ResponseModel, status_code=status.HTTP_200_OK)
+@router.get(
+    "/", response_model=ResponseModel[LoanEntriesRead], status_code=status.HTTP_200_OK
+)
 async def get_loan_entries(
+    request: Request,
     id: UUID | None = None,
     code: str | None = None,
     employee_id: UUID | None = None,
@@ -31,9 +52,12 @@ async def get_loan_entries(
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
     limit: int = 10,
-    offset: int = 0,
+    cursor: str | None = None,
+    count: CountMode | None = None,
+    fields: str | None = None,
 ):
-    return await LoanEntriesService.get_loan_entries(
+    field_names = parse_fields(fields, LoanEntriesRead)
+    page = await LoanEntriesService.get_loan_entries(
         session=session,
         id=id,
         code=code,
@@ -48,30 +72,94 @@ async def get_loan_entries(
         calculation_type=calculation_type,
         exclude=exclude,
         limit=limit,
-        offset=offset,
+        cursor=cursor,
+        count=count,
+        fields=field_names,
+    )
+    return page_response(
+        with_links(page, request), schema=LoanEntriesRead, fields=field_names
+    )
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_loan_entries(
+    format: ExportFormat = ExportFormat.NDJSON,
+    id: UUID | None = None,
+    code: str | None = None,
+    employee_id: UUID | None = None,
+    employee_code: str | None = None,
+    employee_fullname: str | None = None,
+    national_id: str | None = None,
+    loan_id: UUID | None = None,
+    loan_name: str | None = None,
+    description: str | None = None,
+    interest_term: InterestTerm | None = None,
+    calculation_type: InterestCalculationType | None = None,
+    exclude: bool | None = None,
+    current_user: User = Depends(get_current_user),
+):
+    return LoanEntriesService.export_loan_entries(
+        format=format,
+        id=id,
+        code=code,
+        employee_id=employee_id,
+        employee_code=employee_code,
+        employee_fullname=employee_fullname,
+        national_id=national_id,
+        loan_id=loan_id,
+        loan_name=loan_name,
+        description=description,
+        interest_term=interest_term,
+        calculation_type=calculation_type,
+        exclude=exclude,
     )
 
 
 @router.get("/{id}", response_model=LoanEntriesRead, status_code=status.HTTP_200_OK)
 async def get_loan_entry(
     id: UUID,
+    fields: str | None = None,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    return await LoanEntriesService.get_loan_entry(id=id, session=session)
+    field_names = parse_fields(fields, LoanEntriesRead)
+    loan_entry = await LoanEntriesService.get_loan_entry(id=id, session=session)
+    return item_response(loan_entry, schema=LoanEntriesRead, fields=field_names)
 
 
 @router.post("/", response_model=LoanEntriesRead, status_code=status.HTTP_201_CREATED)
 async def create_loan_entry(
     data: LoanEntriesCreate,
+    idempotency_key: str | None = Header(
+        default=None, alias="Idempotency-Key", max_length=255
+    ),
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    return await LoanEntriesService.create_loan_entry(
-        data=data, session=session, current_user=current_user
+    return await IdempotencyService.run(
+        key=idempotency_key,
+        scope="loan_entries",
+        data=data,
+        response_model=LoanEntriesRead,
+        status_code=status.HTTP_201_CREATED,
+        operation=lambda: LoanEntriesService.create_loan_entry(
+            data=data, session=session, current_user=current_user, commit=False
+        ),
+        session=session,
+        current_user=current_user,
     )
 
 
+@router.post(
+    "/preview", response_model=LoanEntriesPreviewRead, status_code=status.HTTP_200_OK
+)
+async def preview_loan_entry(
+    data: LoanEntriesPreview,
+    current_user: User = Depends(get_current_user),
+):
+    return await LoanEntriesService.preview_loan_entry(data=data)
+
+
 @router.put("/{id}", response_model=LoanEntriesRead, status_code=status.HTTP_200_OK)
 async def update_loan_entry(
     id: UUID,
@@ -3,16 +3,29 @@ from uuid import UUID
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Request, status
 
 from config.db import get_session
 from config.dependencies import get_current_user
 from models.user import User
 from schemas.base import ResponseModel
-from schemas.payment import PaymentCreate, PaymentRead
+from schemas.payment import (
+    PaymentBatchCreate,
+    PaymentBatchRead,
+    PaymentCreate,
+    PaymentRead,
+)
 from schemas.payment_schedule import PaymentScheduleRead
+from services.idempotency import IdempotencyService
 from services.payment import PaymentService
 from services.payment_schedule import PaymentScheduleService
+from utils.pagination import (
+    item_response,
+    page_response,
+    parse_fields,
+    with_links,
+)
+from utils.text_options import CountMode, ExportFormat
 
 router = APIRouter(prefix="/payment", tags=["payment"])
 
@@ -20,43 +33,109 @@ router = APIRouter(prefix="/payment", tags=["payment"])
 @router.post("/", response_model=PaymentRead, status_code=status.HTTP_200_OK)
 async def create_payment(
     data: PaymentCreate,
+    idempotency_key: str | None = Header(
+        default=None, alias="Idempotency-Key", max_length=255
+    ),
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    return await PaymentService.create_payment(
-        data=data, session=session, current_user=current_user
+    return await IdempotencyService.run(
+        key=idempotency_key,
+        scope="payment",
+        data=data,
+        response_model=PaymentRead,
+        status_code=status.HTTP_200_OK,
+        operation=lambda: PaymentService.create_payment(
+            data=data, session=session, current_user=current_user, commit=False
+        ),
+        session=session,
+        current_user=current_user,
     )
 
 
-@router.get("/", response_model=ResponseModel, status_code=status.HTTP_200_OK)
+@router.post("/batch", response_model=PaymentBatchRead, status_code=status.HTTP_200_OK)
+async def create_payments(
+    data: PaymentBatchCreate,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    return await PaymentService.create_payments(
+        data=data.payments, session=session, current_user=current_user
+    )
+
+
+@router.get(
+    "/", response_model=ResponseModel[PaymentRead], status_code=status.HTTP_200_OK
+)
 async def get_payments(
+    request: Request,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
     limit: int = 10,
-    offset: int = 0,
+    cursor: str | None = None,
+    count: CountMode | None = None,
+    fields: str | None = None,
 ):
-    return await PaymentService.get_payments(
-        session=session, limit=limit, offset=offset
+    field_names = parse_fields(fields, PaymentRead)
+    page = await PaymentService.get_payments(
+        session=session, limit=limit, cursor=cursor, count=count, fields=field_names
+    )
+    return page_response(
+        with_links(page, request), schema=PaymentRead, fields=field_names
+    )
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_payments(
+    format: ExportFormat = ExportFormat.NDJSON,
+    current_user: User = Depends(get_current_user),
+):
+    return PaymentService.export_payments(format=format)
+
+
+@router.get("/schedules/export", status_code=status.HTTP_200_OK)
+async def export_payment_schedules(
+    format: ExportFormat = ExportFormat.NDJSON,
+    loan_entry_id: UUID | None = None,
+    current_user: User = Depends(get_current_user),
+):
+    return PaymentScheduleService.export_schedules(
+        format=format, loan_entry_id=loan_entry_id
     )
 
 
 @router.get("/schedules/{id}", response_model=PaymentScheduleRead)
 async def get_payment_schedule(
     id: UUID,
+    fields: str | None = None,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    return await PaymentScheduleService.get_schedule(id=id, session=session)
+    field_names = parse_fields(fields, PaymentScheduleRead)
+    schedule = await PaymentScheduleService.get_schedule(id=id, session=session)
+    return item_response(schedule, schema=PaymentScheduleRead, fields=field_names)
 
 
-@router.get("/schedules", response_model=ResponseModel)
+@router.get("/schedules", response_model=ResponseModel[PaymentScheduleRead])
 async def get_payment_schedules(
+    request: Request,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
     loan_entry_id: UUID = None,
     limit: int = 10,
-    offset: int = 0,
+    cursor: str | None = None,
+    count: CountMode | None = None,
+    fields: str | None = None,
 ):
-    return await PaymentScheduleService.get_schedules(
-        session=session, limit=limit, offset=offset, loan_entry_id=loan_entry_id
+    field_names = parse_fields(fields, PaymentScheduleRead)
+    page = await PaymentScheduleService.get_schedules(
+        session=session,
+        limit=limit,
+        cursor=cursor,
+        count=count,
+        loan_entry_id=loan_entry_id,
+        fields=field_names,
+    )
+    return page_response(
+        with_links(page, request), schema=PaymentScheduleRead, fields=field_names
     )
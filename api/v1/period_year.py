@@ -1,12 +1,14 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from config.db import get_session
 from config.dependencies import get_current_user
 from models.user import User
 from schemas.base import ResponseModel
-from schemas.period_year import PeriodYearCreate, PeriodYearRead
+from utils.pagination import page_response, with_links
+from utils.text_options import CountMode
+from schemas.period_year import PeriodYearBulkCreate, PeriodYearCreate, PeriodYearRead
 from services.period_year import PeriodYearService
 
 
@@ -22,20 +24,26 @@ async def get_period_year(
     return await PeriodYearService.get_period(id=id, session=session)
 
 
-@router.get("/", response_model=ResponseModel, status_code=status.HTTP_200_OK)
+@router.get(
+    "/", response_model=ResponseModel[PeriodYearRead], status_code=status.HTTP_200_OK
+)
 async def get_period_years(
+    request: Request,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
     year: int | None = None,
     limit: int = 10,
-    offset: int = 0,
+    cursor: str | None = None,
+    count: CountMode | None = None,
 ):
-    return await PeriodYearService.get_periods(
+    page = await PeriodYearService.get_periods(
         session=session,
         year=year,
         limit=limit,
-        offset=offset,
+        cursor=cursor,
+        count=count,
     )
+    return page_response(with_links(page, request), schema=PeriodYearRead)
 
 
 @router.delete("/{id}", response_model={}, status_code=status.HTTP_204_NO_CONTENT)
@@ -56,3 +64,16 @@ async def create_period_year(
     return await PeriodYearService.create_period_year(
         data=data, session=session, current_user=current_user
     )
+
+
+@router.post(
+    "/bulk", response_model=list[PeriodYearRead], status_code=status.HTTP_201_CREATED
+)
+async def create_period_years(
+    data: PeriodYearBulkCreate,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    return await PeriodYearService.create_period_years(
+        years=data.years, session=session, current_user=current_user
+    )
@@ -1,11 +1,13 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from config.db import get_session
 from config.dependencies import get_current_user
 from models.user import User
 from schemas.base import ResponseModel
+from utils.pagination import page_response, with_links
+from utils.text_options import CountMode, ExportFormat
 from schemas.period_year import PeriodRead
 from services.period_year import PeriodService
 
@@ -13,24 +15,30 @@ from services.period_year import PeriodService
 router = APIRouter(prefix="/period", tags=["periods"])
 
 
-@router.get("/", response_model=ResponseModel, status_code=status.HTTP_200_OK)
+@router.get(
+    "/", response_model=ResponseModel[PeriodRead], status_code=status.HTTP_200_OK
+)
 async def get_periods(
+    request: Request,
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
     period_year_id: int | None = None,
     period_code: str | None = None,
     period_name: str | None = None,
     limit: int = 10,
-    offset: int = 0,
+    cursor: str | None = None,
+    count: CountMode | None = None,
 ):
-    return await PeriodService.get_periods(
+    page = await PeriodService.get_periods(
         session=session,
         period_year_id=period_year_id,
         period_code=period_code,
         period_name=period_name,
         limit=limit,
-        offset=offset,
+        cursor=cursor,
+        count=count,
     )
+    return page_response(with_links(page, request), schema=PeriodRead)
 
 
 @router.get("/{id}", response_model=PeriodRead, status_code=status.HTTP_200_OK)
@@ -40,3 +48,21 @@ async def get_period(
     current_user: User = Depends(get_current_user),
 ):
     return await PeriodService.get_period(id=id, session=session)
+
+
+@router.get("/{id}/deductions", status_code=status.HTTP_200_OK)
+async def get_period_deductions(
+    id: UUID,
+    company_id: UUID | None = None,
+    include_paid: bool = False,
+    format: ExportFormat = ExportFormat.CSV,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    return await PeriodService.export_deductions(
+        id=id,
+        session=session,
+        company_id=company_id,
+        include_paid=include_paid,
+        format=format,
+    )
@@ -2,12 +2,14 @@ from uuid import UUID
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 
 from config.db import get_session
 from config.dependencies import get_current_user
 from models.user import User
 from schemas.base import ResponseModel
+from utils.pagination import page_response, with_links
+from utils.text_options import CountMode
 from schemas.user import UserCreate, UserRead, UserUpdate
 from services.user import UserService
 
@@ -33,16 +35,19 @@ async def create_user(
     return await UserService.create_user(data=data, session=session)
 
 
-@router.get("/", response_model=ResponseModel)
+@router.get("/", response_model=ResponseModel[UserRead])
 async def get_users(
+    request: Request,
     username: str | None = None,
     limit: int = 10,
-    offset: int = 0,
+    cursor: str | None = None,
+    count: CountMode | None = None,
     session: AsyncSession = Depends(get_session),
 ):
-    return await UserService.get_users(
-        username=username, limit=limit, offset=offset, session=session
+    page = await UserService.get_users(
+        username=username, limit=limit, cursor=cursor, count=count, session=session
     )
+    return page_response(with_links(page, request), schema=UserRead)
 
 
 @router.patch("/{id}", response_model=UserRead, status_code=status.HTTP_200_OK)
@@ -0,0 +1,152 @@
+"""Shared setup for the benchmarks: the app on a scratch database.
+
+The app's settings are read at import time, so import this module before
+anything from the app.  ``BENCH_DATABASE_URL`` picks the database (a fresh
+SQLite file by default); its tables are dropped and created again, so never
+point it at data you want to keep.
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+DATABASE_URL = os.environ.get("BENCH_DATABASE_URL") or (
+    "sqlite+aiosqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+)
+os.environ["DATABASE_URL"] = DATABASE_URL
+os.environ.setdefault("SECRET_KEY", "bench-secret-key-of-at-least-32-bytes")
+# The benchmarks send far more requests per token than a client would.
+os.environ.setdefault("REQUESTS_PER_MINUTE", "1000000")
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from config.db import async_session, engine  # noqa: E402
+from main import app  # noqa: E402
+from models import Company, Employee, Loan, Period, PeriodYear, User  # noqa: E402
+from utils.crypto import hash_password  # noqa: E402
+
+USERNAME = "bench"
+PASSWORD = "bench-password"
+
+
+async def seed() -> dict:
+    """Create the tables and one company, user, employee, loan and period."""
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    async with async_session() as session:
+        company = Company(name="Bench")
+        user = User(
+            username=USERNAME,
+            email="bench@example.com",
+            firstname="Bench",
+            lastname="User",
+            password=hash_password(PASSWORD),
+            is_active=1,
+            is_super=1,
+            is_verified="0",
+            is_password_changed=True,
+            is_password_reset=False,
+        )
+        session.add_all([company, user])
+        await session.flush()
+
+        employee = Employee(
+            code="B1",
+            firstname="Bench",
+            lastname="Employee",
+            fullname="Employee Bench",
+            company_id=company.id,
+            company_name=company.name,
+        )
+        loan = Loan(code="BENCH", name="Bench loan")
+        period_year = PeriodYear(id=1, year=2026, user_id=user.id)
+        session.add_all([employee, loan, period_year])
+        await session.flush()
+
+        period = Period(
+            month=1,
+            year=2026,
+            period_code="JAN26",
+            period_name="January 2026",
+            start_date=date(2026, 1, 1),
+            end_date=date(2026, 1, 31),
+            no_of_days=31,
+            total_working_days=22,
+            total_working_hours=176,
+            total_hours_per_day=8,
+            period_year_id=period_year.id,
+            month_calender=[],
+        )
+        session.add(period)
+        await session.commit()
+
+        return dict(
+            user=user.id, employee=employee.id, loan=loan.id, period=period.id
+        )
+
+
+@asynccontextmanager
+async def client():
+    """An HTTP client on the app, with its startup and shutdown run."""
+    async with app.router.lifespan_context(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as c:
+            yield c
+
+
+async def login(c: AsyncClient) -> dict:
+    response = await c.post(
+        "/v1/auth/login", json={"username": USERNAME, "password": PASSWORD}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+class StatementCounter:
+    """Counts the statements sent to the app's database while entered."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        event.listen(engine.sync_engine, "before_cursor_execute", self.record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine.sync_engine, "before_cursor_execute", self.record)
+
+    def record(self, *args):
+        self.count += 1
+
+
+def summary(seconds: list[float]) -> str:
+    """Median, p99 and worst of ``seconds``, in milliseconds."""
+    ms = sorted(s * 1000 for s in seconds)
+    p99 = ms[min(len(ms) - 1, round(0.99 * (len(ms) - 1)))]
+    return (
+        f"median {statistics.median(ms):8.2f} ms  "
+        f"p99 {p99:8.2f} ms  max {ms[-1]:8.2f} ms"
+    )
+
+
+def timed(func):
+    """``func`` wrapped to return ``(seconds, result)``."""
+
+    async def run(*args, **kwargs):
+        started = time.perf_counter()
+        result = await func(*args, **kwargs)
+        return time.perf_counter() - started, result
+
+    return run
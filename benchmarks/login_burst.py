@@ -0,0 +1,83 @@
+"""Latency of other requests while a burst of logins hashes passwords.
+
+Fires ``--logins`` concurrent logins and, while they run, sends
+``GET /v1/auth/me`` one after another.  ``pool`` is the app as it is:
+bcrypt runs on the bounded hash pool.  ``inline`` runs bcrypt on the event
+loop instead, as login used to.
+
+    python benchmarks/login_burst.py [--logins 40] [--mode pool|inline|both]
+
+Logins beyond PASSWORD_HASH_MAX_QUEUE are turned away with 503 in ``pool``.
+"""
+
+import _app
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import utils.crypto
+
+
+async def run_inline(func, *args):
+    return func(*args)
+
+
+async def burst(c, headers, logins: int):
+    credentials = {"username": _app.USERNAME, "password": _app.PASSWORD}
+    started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(c.post("/v1/auth/login", json=credentials))
+        for _ in range(logins)
+    ]
+    done = asyncio.gather(*tasks)
+
+    probes = []
+    while not done.done():
+        sent = time.perf_counter()
+        response = await c.get("/v1/auth/me", headers=headers)
+        response.raise_for_status()
+        probes.append(time.perf_counter() - sent)
+        await asyncio.sleep(0.005)
+
+    statuses = Counter(response.status_code for response in await done)
+    return time.perf_counter() - started, statuses, probes
+
+
+async def main(logins: int, modes: list[str]):
+    await _app.seed()
+    original = utils.crypto._run
+    async with _app.client() as c:
+        headers = await _app.login(c)
+
+        quiet = []
+        for _ in range(50):
+            sent = time.perf_counter()
+            (await c.get("/v1/auth/me", headers=headers)).raise_for_status()
+            quiet.append(time.perf_counter() - sent)
+        print(f"GET /v1/auth/me, no logins:       {_app.summary(quiet)}")
+
+        for mode in modes:
+            utils.crypto._run = run_inline if mode == "inline" else original
+            try:
+                seconds, statuses, probes = await burst(c, headers, logins)
+            finally:
+                utils.crypto._run = original
+            print(
+                f"GET /v1/auth/me, {logins} logins, {mode:6s}: "
+                f"{_app.summary(probes)}  ({len(probes)} requests)"
+            )
+            print(
+                f"  logins took {seconds:.2f} s, statuses "
+                + ", ".join(f"{code}: {n}" for code, n in sorted(statuses.items()))
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--mode", choices=["pool", "inline", "both"], default="both")
+    args = parser.parse_args()
+    modes = ["pool", "inline"] if args.mode == "both" else [args.mode]
+    asyncio.run(main(args.logins, modes))
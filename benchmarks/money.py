@@ -0,0 +1,114 @@
+"""Integer-cents money core against the Decimal arithmetic it replaced.
+
+Pure compute, no database:
+
+    python benchmarks/money.py
+
+Each line is the best of five timings, per call.  The ``decimal`` lines are
+stand-ins for the former code paths (quantize per amount, Decimal schedule
+and allocation loops) to compare against.
+"""
+
+import sys
+import timeit
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import money  # noqa: E402
+from utils.amortization import amortize, amortize_many  # noqa: E402
+from utils.text_options import InterestCalculationType, InterestTerm  # noqa: E402
+
+CENT = Decimal("0.01")
+AMOUNT = Decimal("1234.565")
+PRINCIPAL = Decimal("250000")
+RATE = Decimal("12")
+MONTHS = 360
+
+
+def decimal_quantize(value):
+    return Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def decimal_reducing(principal, periods, rate):
+    """Equal principal, interest on the opening balance, all in Decimal."""
+    monthly_rate = rate / Decimal(100) / Decimal(12)
+    part = (principal / periods).quantize(CENT, rounding=ROUND_HALF_UP)
+    balance, rows = principal, []
+    for month in range(1, periods + 1):
+        principal_part = balance if month == periods else part
+        interest = (balance * monthly_rate).quantize(CENT, rounding=ROUND_HALF_UP)
+        rows.append((month, balance, principal_part, interest))
+        balance -= principal_part
+    return rows
+
+
+def decimal_allocate(amount, due, paid):
+    applied = []
+    for row_due, row_paid in zip(due, paid):
+        share = min(amount, row_due - row_paid) if amount > 0 else Decimal(0)
+        if share < 0:
+            share = Decimal(0)
+        applied.append(share)
+        amount -= share
+    return applied
+
+
+def bench(name, func, *args):
+    timer = timeit.Timer(lambda: func(*args))
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=5, number=number)) / number
+    unit, scale = ("ms", 1e3) if best >= 1e-3 else ("us", 1e6)
+    print(f"  {name:40s} {best * scale:9.2f} {unit}")
+
+
+def main():
+    print("one amount to cents")
+    bench("decimal quantize", decimal_quantize, AMOUNT)
+    bench("money.to_cents", money.to_cents, AMOUNT)
+
+    due_decimal = [Decimal("520.83")] * 48
+    paid_decimal = [Decimal("520.83")] * 10 + [Decimal(0)] * 38
+    due_cents = [money.to_cents(value) for value in due_decimal]
+    paid_cents = [money.to_cents(value) for value in paid_decimal]
+    print("\none payment allocated over 48 installments")
+    bench("decimal loop", decimal_allocate, Decimal("7000"), due_decimal, paid_decimal)
+    bench("money.allocate (cents)", money.allocate, 700000, due_cents, paid_cents)
+    bench(
+        "money.allocate incl. conversion",
+        lambda: money.allocate(
+            money.to_cents(Decimal("7000")),
+            [money.to_cents(value) for value in due_decimal],
+            [money.to_cents(value) for value in paid_decimal],
+        ),
+    )
+
+    print(f"\n{MONTHS}-month reducing balance schedule")
+    bench("decimal loop", decimal_reducing, PRINCIPAL, MONTHS, RATE)
+    reducing = dict(
+        principal=PRINCIPAL,
+        periods=MONTHS,
+        rate=RATE,
+        calculation_type=InterestCalculationType.REDUCING,
+        interest_term=InterestTerm.PER_ANNUM,
+    )
+    bench("amortize", lambda: amortize(**reducing))
+    bench("amortize + rows() as Decimal", lambda: amortize(**reducing).rows())
+
+    annuity = reducing | dict(calculation_type=InterestCalculationType.AMORTIZATION)
+    print(f"\n{MONTHS}-month annuity schedule")
+    bench("amortize", lambda: amortize(**annuity))
+
+    print("\n1000 loans of 60 to 360 months")
+    loans = [
+        reducing | dict(periods=60 + month % 301, calculation_type=calculation_type)
+        for month, calculation_type in zip(
+            range(1000), list(InterestCalculationType) * 200
+        )
+    ]
+    bench("amortize_many", amortize_many, loans)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Cost of writing a loan entry's payment schedule.
+
+Compares one multi-row INSERT in the caller's transaction (what loan
+creation does) with the former row-at-a-time writes, each with its own
+commit and refresh, for the same rows.  Then times the whole
+``POST /v1/loan_entries/``.
+
+    python benchmarks/schedule_writes.py [--repeat 20]
+"""
+
+import _app  # noqa: F401  (sets up the app's environment first)
+
+import argparse
+import asyncio
+import time
+from uuid import UUID
+
+from sqlmodel import select
+
+from models.payment_schedule import PaymentSchedule
+from schemas.payment_schedule import PaymentScheduleCreate
+from services.payment_schedule import PaymentScheduleService
+
+DURATIONS = (12, 60, 360)
+
+
+def loan_entry(ids: dict, duration: int) -> dict:
+    return {
+        "loan_id": str(ids["loan"]),
+        "employee_id": str(ids["employee"]),
+        "deduction_start_period_id": str(ids["period"]),
+        "amount": str(100 * duration),
+        "duration": str(duration),
+        "interest_rate": "12",
+        "calculation_type": "Reducing Balance",
+        "interest_term": "Per Annum",
+    }
+
+
+async def schedule_rows(loan_entry_id) -> list[PaymentScheduleCreate]:
+    async with _app.async_session() as session:
+        schedules = await session.exec(
+            select(PaymentSchedule).where(
+                PaymentSchedule.loan_entry_id == loan_entry_id
+            )
+        )
+        return [
+            PaymentScheduleCreate.model_validate(schedule.model_dump(exclude={"id"}))
+            for schedule in schedules.all()
+        ]
+
+
+async def bulk(rows):
+    async with _app.async_session() as session:
+        await PaymentScheduleService.create_schedules(data=rows, session=session)
+        await session.commit()
+
+
+async def row_at_a_time(rows):
+    async with _app.async_session() as session:
+        for row in rows:
+            await PaymentScheduleService.create_schedule(data=row, session=session)
+
+
+async def measure(write, rows, repeat):
+    seconds = []
+    with _app.StatementCounter() as statements:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await write(rows)
+            seconds.append(time.perf_counter() - started)
+    return statements.count // repeat, seconds
+
+
+async def main(repeat: int):
+    ids = await _app.seed()
+    print(f"database: {_app.DATABASE_URL}\n")
+
+    async with _app.client() as c:
+        headers = await _app.login(c)
+
+        print("schedule write only")
+        for duration in DURATIONS:
+            response = await c.post(
+                "/v1/loan_entries/", json=loan_entry(ids, duration), headers=headers
+            )
+            response.raise_for_status()
+            rows = await schedule_rows(UUID(response.json()["id"]))
+            for name, write in (("bulk", bulk), ("row at a time", row_at_a_time)):
+                count, seconds = await measure(write, rows, repeat)
+                print(
+                    f"  {duration:3d} months  {name:13s}  {count:4d} statements  "
+                    + _app.summary(seconds)
+                )
+
+        print("\nPOST /v1/loan_entries/")
+        for duration in DURATIONS:
+            seconds = []
+            with _app.StatementCounter() as statements:
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    response = await c.post(
+                        "/v1/loan_entries/",
+                        json=loan_entry(ids, duration),
+                        headers=headers,
+                    )
+                    seconds.append(time.perf_counter() - started)
+                    response.raise_for_status()
+            print(
+                f"  {duration:3d} months  {statements.count // repeat:4d} statements  "
+                + _app.summary(seconds)
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args().repeat))
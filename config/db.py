@@ -1,16 +1,98 @@
+import asyncio
+import time
+
+from prometheus_client import Gauge, Histogram
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
-from config.settings import DATABASE_URL
+from config.settings import (
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_PREWARM,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_CACHE_SIZE,
+)
+
+
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds", "Time spent waiting to check out a connection"
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started)
+
 
+def engine_options(url: str) -> dict:
+    # In-memory SQLite needs its single shared connection; leave it on the default pool.
+    if url.startswith("sqlite") and ":memory:" in url:
+        return {}
 
-engine = create_async_engine(url=DATABASE_URL, future=True)
+    options = {
+        "poolclass": InstrumentedPool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if "+asyncpg" in url:
+        options["connect_args"] = {
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+engine = create_async_engine(url=DATABASE_URL, future=True, **engine_options(DATABASE_URL))
 
 async_session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
+Gauge("db_pool_size", "Configured connection pool size").set_function(
+    lambda: engine.pool.size()
+)
+Gauge("db_pool_checked_out", "Connections currently in use").set_function(
+    lambda: engine.pool.checkedout()
+)
+Gauge("db_pool_idle", "Idle connections held by the pool").set_function(
+    lambda: engine.pool.checkedin()
+)
+Gauge("db_pool_overflow", "Connections opened beyond the pool size").set_function(
+    lambda: max(engine.pool.overflow(), 0)
+)
+
 
 async def get_session():
     async with async_session() as session:
         yield session
 
+
+async def prewarm_pool(connections: int = DB_POOL_PREWARM):
+    """Open ``connections`` connections up front so first requests skip the handshake."""
+    if connections <= 0:
+        return
+
+    conns = await asyncio.gather(*(engine.connect() for _ in range(connections)))
+    try:
+        for conn in conns:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        for conn in conns:
+            await conn.close()
+
+
+async def dispose_engine():
+    await engine.dispose()
@@ -1,15 +1,16 @@
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
 
+from config.auth import decode_token
 from config.db import get_session
-from models.user import RevokedToken
+from services.token import RevokedTokenFilter, TokenRevocationService
 from services.user import UserService, UserActivity
 
 security = HTTPBearer()
 
 user_activity = UserActivity()
+revoked_tokens = RevokedTokenFilter()
 
 
 async def get_current_user(
@@ -19,12 +20,22 @@ async def get_current_user(
 ):
     token = credentials.credentials
 
-    revoked_token = await session.exec(
-        select(RevokedToken).where(RevokedToken.token == token)
-    )
-    revoked_token = revoked_token.one_or_none()
+    payload = decode_token(token)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    jti = payload.get("jti")
+    if jti:
+        await revoked_tokens.refresh(session=session)
+        revoked = revoked_tokens.is_revoked(jti)
+    else:
+        revoked = await TokenRevocationService.is_token_revoked(token, session)
 
-    if revoked_token:
+    if revoked:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
@@ -9,3 +9,45 @@ ALGORITHM = env.str("ALGORITHM", default="HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = env.int("ACCESS_TOKEN_EXPIRE_MINUTES", default=30)
 REFRESH_TOKEN_EXPIRE_DAYS = env.int("REFRESH_TOKEN_EXPIRE_DAYS", default=7)
 REQUESTS_PER_MINUTE = env.int("REQUESTS_PER_MINUTE", default=60)
+RATE_LIMIT_BACKEND = env.str("RATE_LIMIT_BACKEND", default="memory")
+REDIS_URL = env.str("REDIS_URL", default=None)
+SCHEDULE_PREVIEW_CACHE_SIZE = env.int("SCHEDULE_PREVIEW_CACHE_SIZE", default=1024)
+MAX_LOAN_PERIODS = env.int("MAX_LOAN_PERIODS", default=600)
+REVOKED_TOKEN_REFRESH_SECONDS = env.int("REVOKED_TOKEN_REFRESH_SECONDS", default=30)
+REVOKED_TOKEN_PURGE_SECONDS = env.int("REVOKED_TOKEN_PURGE_SECONDS", default=3600)
+ACTIVITY_MAX_USERS = env.int("ACTIVITY_MAX_USERS", default=10_000)
+ACTIVITY_TTL_SECONDS = env.int("ACTIVITY_TTL_SECONDS", default=3600)
+ACTIVITY_BUFFER_SIZE = env.int("ACTIVITY_BUFFER_SIZE", default=10_000)
+ACTIVITY_FLUSH_SECONDS = env.int("ACTIVITY_FLUSH_SECONDS", default=30)
+USER_AGENT_CACHE_SIZE = env.int("USER_AGENT_CACHE_SIZE", default=1024)
+AUTH_CACHE_SIZE = env.int("AUTH_CACHE_SIZE", default=10_000)
+AUTH_CACHE_TTL_SECONDS = env.int("AUTH_CACHE_TTL_SECONDS", default=60)
+BCRYPT_ROUNDS = env.int("BCRYPT_ROUNDS", default=12)
+PASSWORD_HASH_WORKERS = env.int("PASSWORD_HASH_WORKERS", default=2)
+PASSWORD_HASH_MAX_QUEUE = env.int("PASSWORD_HASH_MAX_QUEUE", default=32)
+DB_POOL_SIZE = env.int("DB_POOL_SIZE", default=5)
+DB_MAX_OVERFLOW = env.int("DB_MAX_OVERFLOW", default=10)
+DB_POOL_TIMEOUT = env.int("DB_POOL_TIMEOUT", default=30)
+DB_POOL_RECYCLE = env.int("DB_POOL_RECYCLE", default=1800)
+DB_POOL_PRE_PING = env.bool("DB_POOL_PRE_PING", default=True)
+DB_POOL_PREWARM = env.int("DB_POOL_PREWARM", default=DB_POOL_SIZE)
+DB_STATEMENT_CACHE_SIZE = env.int("DB_STATEMENT_CACHE_SIZE", default=100)
+MAX_PAGE_SIZE = env.int("MAX_PAGE_SIZE", default=100)
+PAYMENT_BATCH_MAX_SIZE = env.int("PAYMENT_BATCH_MAX_SIZE", default=10_000)
+PAYMENT_BATCH_CHUNK_SIZE = env.int("PAYMENT_BATCH_CHUNK_SIZE", default=500)
+DB_RETRY_ATTEMPTS = env.int("DB_RETRY_ATTEMPTS", default=3)
+DB_RETRY_BACKOFF_SECONDS = env.float("DB_RETRY_BACKOFF_SECONDS", default=0.05)
+IDEMPOTENCY_TTL_SECONDS = env.int("IDEMPOTENCY_TTL_SECONDS", default=86_400)
+IDEMPOTENCY_LOCK_SECONDS = env.int("IDEMPOTENCY_LOCK_SECONDS", default=60)
+IDEMPOTENCY_CACHE_SIZE = env.int("IDEMPOTENCY_CACHE_SIZE", default=10_000)
+IDEMPOTENCY_PURGE_SECONDS = env.int("IDEMPOTENCY_PURGE_SECONDS", default=3600)
+EXPORT_BATCH_SIZE = env.int("EXPORT_BATCH_SIZE", default=1000)
+PERIOD_YEAR_BULK_MAX_SIZE = env.int("PERIOD_YEAR_BULK_MAX_SIZE", default=100)
+HOURS_PER_DAY = env.int("HOURS_PER_DAY", default=8)
+HOLIDAY_COUNTRY = env.str("HOLIDAY_COUNTRY", default=None)
+# Holidays are stored with upper-case country codes.
+HOLIDAY_COUNTRY = HOLIDAY_COUNTRY.upper() if HOLIDAY_COUNTRY else None
+HOLIDAY_CALENDAR_CACHE_SIZE = env.int("HOLIDAY_CALENDAR_CACHE_SIZE", default=256)
+HOLIDAY_CALENDAR_TTL_SECONDS = env.int("HOLIDAY_CALENDAR_TTL_SECONDS", default=300)
+REFERENCE_CACHE_SIZE = env.int("REFERENCE_CACHE_SIZE", default=4096)
+REFERENCE_CACHE_TTL_SECONDS = env.int("REFERENCE_CACHE_TTL_SECONDS", default=300)
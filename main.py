@@ -1,10 +1,78 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from api.router import api_router
 from prometheus_fastapi_instrumentator import Instrumentator
 
-app = FastAPI(title="Loans API", version="1.0.1")
+from config.db import async_session, dispose_engine, prewarm_pool
+from config.dependencies import revoked_tokens, user_activity
+from config.settings import (
+    ACTIVITY_FLUSH_SECONDS,
+    IDEMPOTENCY_PURGE_SECONDS,
+    REVOKED_TOKEN_PURGE_SECONDS,
+)
+from services.idempotency import IdempotencyService
+from services.token import TokenRevocationService
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_revoked_tokens():
+    async with async_session() as session:
+        await TokenRevocationService.purge_expired(session=session)
+    revoked_tokens.prune()
+
+
+async def purge_idempotency_keys():
+    async with async_session() as session:
+        await IdempotencyService.purge_expired(session=session)
+
+
+async def flush_user_activity():
+    async with async_session() as session:
+        await user_activity.flush(session=session)
+
+
+async def run_every(seconds: int, job):
+    while True:
+        await asyncio.sleep(seconds)
+        try:
+            await job()
+        except Exception:
+            logger.exception("Background job %s failed", job.__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await prewarm_pool()
+
+    async with async_session() as session:
+        await revoked_tokens.load(session=session)
+
+    tasks = [
+        asyncio.create_task(run_every(REVOKED_TOKEN_PURGE_SECONDS, purge_revoked_tokens)),
+        asyncio.create_task(run_every(ACTIVITY_FLUSH_SECONDS, flush_user_activity)),
+        asyncio.create_task(
+            run_every(IDEMPOTENCY_PURGE_SECONDS, purge_idempotency_keys)
+        ),
+    ]
+    yield
+
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+
+    await flush_user_activity()
+    await dispose_engine()
+
+
+app = FastAPI(title="Loans API", version="1.0.1", lifespan=lifespan)
 
 Instrumentator().instrument(app).expose(app)
 
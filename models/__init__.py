@@ -4,3 +4,5 @@ from models.employee import Employee
 from models.period_year import PeriodYear, Period
 from models.loan import Loan
 from models.payment_schedule import PaymentSchedule, Payment
+from models.idempotency import IdempotencyKey
+from models.holiday import Holiday
@@ -0,0 +1,33 @@
+import uuid
+from datetime import date, datetime
+from typing import Optional
+
+from sqlmodel import Column, Date, Field, SQLModel, String
+
+
+class Holiday(SQLModel, table=True):
+    """A non-working day.
+
+    Without a company or country it applies everywhere; otherwise only to
+    calendars of that company and/or country.
+    """
+
+    __tablename__ = "holidays"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    holiday_date: date = Field(sa_column=Column(Date, nullable=False, index=True))
+    name: str = Field(sa_column=Column(String(100), nullable=False))
+    country: Optional[str] = Field(
+        default=None, sa_column=Column(String(2), nullable=True)
+    )
+    company_id: Optional[uuid.UUID] = Field(
+        foreign_key="companies.id", nullable=True, default=None
+    )
+    user_id: Optional[uuid.UUID] = Field(
+        foreign_key="users.id", nullable=True, default=None
+    )
+
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(
+        default_factory=datetime.now, sa_column_kwargs={"onupdate": datetime.now}
+    )
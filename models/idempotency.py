@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlmodel import JSON, Column, DateTime, Field, Integer, SQLModel, String
+
+
+class IdempotencyKey(SQLModel, table=True):
+    """Outcome of a POST sent with an ``Idempotency-Key`` header.
+
+    A row without ``status_code`` is a placeholder for a request that is still
+    running; once it finishes the serialized response is stored so retries of
+    the same request can be answered from it.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    user_id: uuid.UUID = Field(primary_key=True)
+    key: str = Field(sa_column=Column(String(255), primary_key=True))
+    fingerprint: str = Field(sa_column=Column(String(64), nullable=False))
+    status_code: Optional[int] = Field(
+        default=None, sa_column=Column(Integer, nullable=True)
+    )
+    response: Optional[Any] = Field(default=None, sa_column=Column(JSON, nullable=True))
+    locked_at: datetime = Field(sa_column=Column(DateTime, nullable=False))
+    expires_at: datetime = Field(sa_column=Column(DateTime, nullable=False, index=True))
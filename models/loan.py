@@ -10,6 +10,7 @@ from sqlmodel import (
     Column,
     Enum,
     DECIMAL,
+    Index,
 )
 
 
@@ -83,6 +84,12 @@ class Loan(SQLModel, table=True):
 
 class LoanEntries(SQLModel, table=True):
     __tablename__ = "loan_entries"
+    __table_args__ = (
+        Index("ix_loan_entries_employee_id", "employee_id"),
+        Index("ix_loan_entries_loan_id", "loan_id"),
+        Index("ix_loan_entries_employee_code", "employee_code"),
+        Index("ix_loan_entries_created_at_id", "created_at", "id"),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     code: str = Field(sa_column=Column(String(20), nullable=True, default=None))
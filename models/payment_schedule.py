@@ -1,29 +1,60 @@
 from uuid import uuid4
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from uuid import UUID
 from sqlmodel import (
     DECIMAL,
     Boolean,
+    Date,
     Enum,
+    Index,
     Integer,
     SQLModel,
     Field,
     Column,
     String,
+    text,
 )
 
 from utils.text_options import PaymentType
 
 
+# Soft-deleted rows are never read on the hot paths, so keep them out of the
+# indexes those paths use.
+NOT_DELETED = text("is_deleted IS NOT TRUE")
+
+
 class PaymentSchedule(SQLModel, table=True):
     __tablename__ = "payment_schedules"
-    # __table_args__ = (UniqueConstraint("loan_entry_id", "month"),)
+    __table_args__ = (
+        Index(
+            "ix_payment_schedules_loan_entry_id_month",
+            "loan_entry_id",
+            "month",
+            postgresql_where=NOT_DELETED,
+            sqlite_where=NOT_DELETED,
+        ),
+        Index(
+            "ix_payment_schedules_period_id_company_id",
+            "period_id",
+            "company_id",
+            postgresql_where=NOT_DELETED,
+            sqlite_where=NOT_DELETED,
+        ),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     loan_entry_id: UUID = Field(foreign_key="loan_entries.id", nullable=False)
 
     month: int = Field(sa_column=Column(Integer, nullable=False))
+    # Resolved when the schedule is generated, so period reports need no date
+    # arithmetic.
+    due_date: date | None = Field(
+        sa_column=Column(Date, nullable=True, default=None)
+    )
+    period_id: UUID | None = Field(
+        foreign_key="periods.id", nullable=True, default=None
+    )
     monthly_payment: Decimal = Field(sa_column=Column(DECIMAL(10, 2), nullable=False))
 
     employee_code: str | None = Field(
@@ -34,7 +65,7 @@ class PaymentSchedule(SQLModel, table=True):
     )
 
     interest: Decimal | None = Field(
-        sa_column=Column(DECIMAL(5, 2), nullable=True, default=None)
+        sa_column=Column(DECIMAL(10, 2), nullable=True, default=None)
     )
     balance: Decimal | None = Field(
         sa_column=Column(DECIMAL(10, 2), nullable=True, default=None)
@@ -81,6 +112,15 @@ class PaymentSchedule(SQLModel, table=True):
 
 class Payment(SQLModel, table=True):
     __tablename__ = "payments"
+    __table_args__ = (
+        Index(
+            "ix_payments_loan_entry_id",
+            "loan_entry_id",
+            postgresql_where=NOT_DELETED,
+            sqlite_where=NOT_DELETED,
+        ),
+        Index("ix_payments_created_at_id", "created_at", "id"),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
     loan_entry_id: UUID = Field(foreign_key="loan_entries.id", nullable=False)
@@ -1,7 +1,7 @@
 import uuid
 from random import random
 from datetime import datetime
-from sqlmodel import Integer, SQLModel, Field, Column, String, Boolean
+from sqlmodel import Integer, SQLModel, Field, Column, String, Boolean, DateTime
 
 
 from typing import Optional
@@ -73,7 +73,30 @@ class User(SQLModel, table=True):
 
 class RevokedToken(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    token: str = Field(
-        sa_column=Column(String(255), nullable=False, index=True, unique=True)
+    jti: Optional[str] = Field(
+        default=None, sa_column=Column(String(32), nullable=True, unique=True)
     )
-    revoked_at: datetime = Field(default_factory=datetime.now)
+    token: Optional[str] = Field(
+        default=None,
+        sa_column=Column(String(255), nullable=True, index=True, unique=True),
+    )
+    expires_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime, nullable=True, index=True)
+    )
+    revoked_at: datetime = Field(default_factory=datetime.now, index=True)
+
+
+class UserActivityLog(SQLModel, table=True):
+    __tablename__ = "user_activity_logs"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    username: str = Field(sa_column=Column(String(50), nullable=False, index=True))
+    ip: str | None = Field(default=None, sa_column=Column(String(45), nullable=True))
+    device: str | None = Field(
+        default=None, sa_column=Column(String(255), nullable=True)
+    )
+    ip_changed: bool = Field(default=False, sa_column=Column(Boolean, default=False))
+    device_changed: bool = Field(
+        default=False, sa_column=Column(Boolean, default=False)
+    )
+    seen_at: datetime = Field(default_factory=datetime.now, index=True)
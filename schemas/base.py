@@ -1,11 +1,16 @@
 from typing import Generic, List, TypeVar
-from sqlmodel import SQLModel
+
+from pydantic import BaseModel, ConfigDict
 
 T = TypeVar("T")
 
 
-class ResponseModel(SQLModel, Generic[T]):
-    count: int
+# A plain pydantic model: SQLModel does not parametrize generics, so
+# ``ResponseModel[LoanRead]`` would otherwise leave ``results`` untyped.
+class ResponseModel(BaseModel, Generic[T]):
+    model_config = ConfigDict(from_attributes=True)
+
+    count: int | None = None
     next: str | None = None
     previous: str | None = None
     results: List[T]
@@ -0,0 +1,47 @@
+from datetime import date, datetime
+from uuid import UUID
+
+from pydantic import field_validator
+from sqlmodel import Field, SQLModel
+
+
+class HolidayBase(SQLModel):
+    holiday_date: date
+    name: str = Field(max_length=100)
+    country: str | None = Field(default=None, min_length=2, max_length=2)
+    company_id: UUID | None = None
+
+    @field_validator("country")
+    @classmethod
+    def upper_country(cls, value: str | None) -> str | None:
+        return value.upper() if value else value
+
+
+class HolidayCreate(HolidayBase):
+    pass
+
+
+class HolidayUpdate(SQLModel):
+    holiday_date: date | None = None
+    name: str | None = Field(default=None, max_length=100)
+    country: str | None = Field(default=None, min_length=2, max_length=2)
+    company_id: UUID | None = None
+
+    @field_validator("country")
+    @classmethod
+    def upper_country(cls, value: str | None) -> str | None:
+        return value.upper() if value else value
+
+
+class HolidayRead(HolidayBase):
+    id: UUID
+    user_id: UUID | None = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class WorkingDaysRead(SQLModel):
+    start_date: date
+    end_date: date
+    working_days: int
+    working_hours: int
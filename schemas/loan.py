@@ -3,9 +3,11 @@ from decimal import Decimal
 from uuid import UUID
 
 from pydantic.v1 import NoneStr
-from sqlmodel import SQLModel
+from sqlmodel import Field, SQLModel
 
+from config.settings import MAX_LOAN_PERIODS
 from models.loan import Loan
+from schemas.payment_schedule import PaymentSchedulePreview
 from utils.text_options import InterestCalculationType, InterestTerm
 
 
@@ -88,3 +90,24 @@ class LoanEntriesRead(LoanEntriesBase):
     exclude: bool = False
     created_at: datetime
     updated_at: datetime
+
+
+class LoanEntriesPreview(SQLModel):
+    amount: Decimal = Field(gt=0)
+    duration: Decimal | None = Field(default=None, gt=0, le=MAX_LOAN_PERIODS)
+    monthly_repayment: Decimal | None = Field(default=None, gt=0)
+    # Stored as DECIMAL(5, 2).
+    interest_rate: Decimal | None = Field(default=None, ge=0, le=Decimal("999.99"))
+    calculation_type: InterestCalculationType | None = None
+    interest_term: InterestTerm | None = None
+    deduction_start_date: date | None = None
+
+
+class LoanEntriesPreviewRead(SQLModel):
+    amount: Decimal
+    duration: Decimal | None = None
+    monthly_repayment: Decimal | None = None
+    total_interest: Decimal
+    total_payment: Decimal
+    deduction_end_date: date | None = None
+    schedules: list[PaymentSchedulePreview]
@@ -1,8 +1,9 @@
 from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
-from sqlmodel import SQLModel
+from sqlmodel import Field, SQLModel
 
+from config.settings import PAYMENT_BATCH_MAX_SIZE
 from utils.text_options import PaymentType
 
 
@@ -43,3 +44,24 @@ class PaymentCreate(PaymentBase):
 
 class PaymentUpdate(PaymentBase):
     updated_at: datetime = datetime.now()
+
+
+class PaymentBatchCreate(SQLModel):
+    payments: list[PaymentCreate] = Field(
+        min_length=1, max_length=PAYMENT_BATCH_MAX_SIZE
+    )
+
+
+class PaymentBatchResult(SQLModel):
+    index: int
+    loan_entry_id: UUID
+    created: bool
+    payment_id: UUID | None = None
+    remaining_balance: Decimal | None = None
+    detail: str | None = None
+
+
+class PaymentBatchRead(SQLModel):
+    created: int
+    failed: int
+    results: list[PaymentBatchResult]
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from uuid import UUID
 
@@ -8,6 +8,8 @@ from sqlmodel import SQLModel
 class PaymentScheduleBase(SQLModel):
     loan_entry_id: UUID
     month: int | None = None
+    due_date: date | None = None
+    period_id: UUID | None = None
     monthly_payment: Decimal | None = None
     employee_code: str | None = None
     employee_fullname: str | None = None
@@ -39,3 +41,13 @@ class PaymentScheduleRead(PaymentScheduleBase):
 class PaymentScheduleUpdate(PaymentScheduleBase):
     modified_by: UUID | None = None
     modified_by_name: str | None = None
+
+
+class PaymentSchedulePreview(SQLModel):
+    month: int
+    due_date: date | None = None
+    balance_bf: Decimal
+    principal: Decimal
+    interest: Decimal
+    monthly_payment: Decimal
+    balance: Decimal
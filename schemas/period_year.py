@@ -1,7 +1,10 @@
 from uuid import UUID
 from datetime import datetime, date
+from decimal import Decimal
 
-from sqlmodel import SQLModel
+from sqlmodel import Field, SQLModel
+
+from config.settings import PERIOD_YEAR_BULK_MAX_SIZE
 
 
 class PeriodYearBase(SQLModel):
@@ -12,6 +15,10 @@ class PeriodYearCreate(PeriodYearBase):
     pass
 
 
+class PeriodYearBulkCreate(SQLModel):
+    years: list[int] = Field(min_length=1, max_length=PERIOD_YEAR_BULK_MAX_SIZE)
+
+
 class PeriodYearUpdate(PeriodYearBase):
     user_id: UUID | None = None
     updated_at: datetime = datetime.now()
@@ -64,3 +71,19 @@ class PeriodRead(SQLModel):
 
 class PeriodUpdate(PeriodBase):
     updated_at: datetime = datetime.now()
+
+
+class PeriodDeductionRead(SQLModel):
+    company_id: UUID | None = None
+    company_name: str | None = None
+    employee_code: str | None = None
+    employee_fullname: str | None = None
+    loan_entry_id: UUID
+    loan_code: str | None = None
+    loan_name: str | None = None
+    month: int
+    due_date: date | None = None
+    amount_due: Decimal
+    amount_paid: Decimal
+    outstanding: Decimal
+    paid: bool
@@ -5,7 +5,9 @@ from fastapi import HTTPException, status
 
 from models.company import Company
 from schemas.company import CompanyCreate, CompanyUpdate
-from schemas.base import ResponseModel
+from utils.pagination import paginate
+from utils.reference_cache import reference_cache
+from utils.text_options import CountMode
 
 
 class CompanyService:
@@ -21,26 +23,25 @@ class CompanyService:
 
     @staticmethod
     async def get_companies(
-        session: AsyncSession, name: str | None = None, limit: int = 10, offset: int = 0
+        session: AsyncSession,
+        name: str | None = None,
+        limit: int = 10,
+        cursor: str | None = None,
+        count: CountMode | None = None,
     ):
-        query = (
-            select(Company)
-            .order_by(Company.created_at.desc())
-            .limit(limit=limit)
-            .offset(offset=offset)
-        )
+        query = select(Company)
 
         if name:
             query = query.where(Company.name == name)
 
-        results = await session.exec(query)
-        companies = results.unique().all()
-
-        count = len(companies)
-
-        return ResponseModel(
+        return await paginate(
+            session=session,
+            query=query,
+            keys=(Company.created_at, Company.id),
+            descending=True,
+            limit=limit,
+            cursor=cursor,
             count=count,
-            results=companies,
         )
 
     @staticmethod
@@ -72,6 +73,7 @@ class CompanyService:
 
         session.add(company)
         await session.commit()
+        reference_cache.invalidate(Company, id)
         await session.refresh(company)
 
         return company
@@ -86,5 +88,6 @@ class CompanyService:
             )
         await session.delete(company)
         await session.commit()
+        reference_cache.invalidate(Company, id)
 
         return {}
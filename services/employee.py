@@ -6,8 +6,9 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from models.company import Company
 from models.employee import Employee
 from models.user import User
-from schemas.employee import EmployeeCreate, EmployeeUpdate
-from schemas.base import ResponseModel
+from schemas.employee import EmployeeCreate, EmployeeRead, EmployeeUpdate
+from utils.pagination import paginate, projection
+from utils.text_options import CountMode
 
 
 class EmployeeService:
@@ -88,14 +89,12 @@ class EmployeeService:
         fullname: str | None = None,
         national_id: str | None = None,
         limit: int = 10,
-        offset: int = 0,
+        cursor: str | None = None,
+        count: CountMode | None = None,
+        fields: list[str] | None = None,
     ):
-        query = (
-            select(Employee)
-            .order_by(Employee.code.asc())
-            .limit(limit=limit)
-            .offset(offset=offset)
-        )
+        keys = (Employee.code, Employee.id)
+        query = select(*projection(Employee, EmployeeRead, fields=fields, keys=keys))
 
         if company_id:
             query = query.where(Employee.company_id == company_id)
@@ -121,11 +120,14 @@ class EmployeeService:
         if national_id:
             query = query.where(Employee.national_id == national_id)
 
-        results = await session.exec(query)
-        all_employees = results.unique().all()
-        count = len(all_employees)
-
-        return ResponseModel(count=count, results=all_employees)
+        return await paginate(
+            session=session,
+            query=query,
+            keys=keys,
+            limit=limit,
+            cursor=cursor,
+            count=count,
+        )
 
     @staticmethod
     async def delete_employee(id: UUID, session: AsyncSession):
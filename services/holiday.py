@@ -0,0 +1,252 @@
+from datetime import date
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlmodel import and_, or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config.settings import (
+    HOLIDAY_CALENDAR_CACHE_SIZE,
+    HOLIDAY_CALENDAR_TTL_SECONDS,
+    HOLIDAY_COUNTRY,
+    HOURS_PER_DAY,
+)
+from models.holiday import Holiday
+from models.period_year import Period
+from models.user import User
+from schemas.holiday import HolidayCreate, HolidayUpdate
+from utils.business_days import BusinessCalendar
+from utils.cache import TTLCache
+from utils.helper import bulk_update, count_working_days
+from utils.pagination import paginate
+from utils.reference_cache import reference_cache
+from utils.text_options import CountMode
+
+# Built calendars keyed by (company_id, country); cleared on any holiday change.
+business_calendars = TTLCache(
+    maxsize=HOLIDAY_CALENDAR_CACHE_SIZE, ttl=HOLIDAY_CALENDAR_TTL_SECONDS
+)
+
+
+def _scope(holiday: Holiday) -> tuple[UUID | None, str | None]:
+    return holiday.company_id, holiday.country
+
+
+def _applies_to_periods(company_id: UUID | None, country: str | None) -> bool:
+    """Periods are shared by every company, so they follow the default
+    calendar: holidays without a company, in ``HOLIDAY_COUNTRY`` or everywhere.
+    """
+    return company_id is None and (country is None or country == HOLIDAY_COUNTRY)
+
+
+class HolidayService:
+    @staticmethod
+    async def load_calendar(
+        session: AsyncSession,
+        company_id: UUID | None = None,
+        country: str | None = HOLIDAY_COUNTRY,
+    ) -> BusinessCalendar:
+        query = select(Holiday.holiday_date).where(
+            or_(Holiday.company_id.is_(None), Holiday.company_id == company_id),
+            or_(Holiday.country.is_(None), Holiday.country == country),
+        )
+        result = await session.exec(query)
+        return BusinessCalendar(result.all())
+
+    @staticmethod
+    async def get_calendar(
+        session: AsyncSession,
+        company_id: UUID | None = None,
+        country: str | None = HOLIDAY_COUNTRY,
+    ) -> BusinessCalendar:
+        key = (company_id, country)
+        calendar = business_calendars.get(key)
+        if calendar is None:
+            calendar = await HolidayService.load_calendar(
+                session=session, company_id=company_id, country=country
+            )
+            business_calendars.set(key, calendar)
+        return calendar
+
+    @staticmethod
+    async def recompute_periods(days: set[date], session: AsyncSession) -> int:
+        """Refresh the working days of only the periods containing ``days``.
+
+        Reads the calendar inside the current transaction, so the pending
+        holiday change is already part of it.  Nothing is committed here.
+        """
+        if not days:
+            return 0
+
+        query = select(Period).where(
+            or_(
+                *(
+                    and_(Period.start_date <= day, Period.end_date >= day)
+                    for day in days
+                )
+            )
+        )
+        result = await session.exec(query)
+        periods = result.all()
+        if not periods:
+            return 0
+
+        calendar = await HolidayService.load_calendar(session=session)
+        rows = []
+        for period in periods:
+            working_days = count_working_days(
+                start_date=period.start_date,
+                end_date=period.end_date,
+                business_calendar=calendar,
+            )
+            if working_days != period.total_working_days:
+                rows.append(
+                    {
+                        "id": period.id,
+                        "total_working_days": working_days,
+                        "total_working_hours": working_days
+                        * period.total_hours_per_day,
+                    }
+                )
+        return await bulk_update(Period, rows, session)
+
+    @staticmethod
+    async def _save(
+        holiday: Holiday,
+        before: tuple[date, UUID | None, str | None] | None,
+        session: AsyncSession,
+        delete: bool = False,
+    ):
+        """Write ``holiday`` and recompute the periods its old and new dates
+        fall in, all in one transaction."""
+        days = set()
+        if before and _applies_to_periods(*before[1:]):
+            days.add(before[0])
+        if not delete and _applies_to_periods(*_scope(holiday)):
+            days.add(holiday.holiday_date)
+
+        try:
+            if delete:
+                await session.delete(holiday)
+            else:
+                session.add(holiday)
+            await session.flush()
+            await HolidayService.recompute_periods(days=days, session=session)
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        finally:
+            business_calendars.clear()
+            if days:
+                reference_cache.invalidate(Period)
+
+    @staticmethod
+    async def create_holiday(
+        data: HolidayCreate, session: AsyncSession, current_user: User
+    ):
+        holiday = Holiday(**data.model_dump(), user_id=current_user.id)
+
+        await HolidayService._save(holiday=holiday, before=None, session=session)
+        await session.refresh(holiday)
+
+        return holiday
+
+    @staticmethod
+    async def get_holidays(
+        session: AsyncSession,
+        company_id: UUID | None = None,
+        country: str | None = None,
+        year: int | None = None,
+        limit: int = 10,
+        cursor: str | None = None,
+        count: CountMode | None = None,
+    ):
+        query = select(Holiday)
+
+        if company_id:
+            query = query.where(Holiday.company_id == company_id)
+        if country:
+            query = query.where(Holiday.country == country.upper())
+        if year:
+            query = query.where(
+                Holiday.holiday_date >= date(year, 1, 1),
+                Holiday.holiday_date <= date(year, 12, 31),
+            )
+
+        return await paginate(
+            session=session,
+            query=query,
+            keys=(Holiday.holiday_date, Holiday.id),
+            descending=False,
+            limit=limit,
+            cursor=cursor,
+            count=count,
+        )
+
+    @staticmethod
+    async def get_holiday(id: UUID, session: AsyncSession):
+        query = select(Holiday).where(Holiday.id == id)
+        result = await session.exec(query)
+
+        holiday = result.unique().one_or_none()
+
+        if not holiday:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Holiday not found"
+            )
+
+        return holiday
+
+    @staticmethod
+    async def update_holiday(id: UUID, data: HolidayUpdate, session: AsyncSession):
+        holiday = await HolidayService.get_holiday(id=id, session=session)
+        before = (holiday.holiday_date, *_scope(holiday))
+
+        for key, value in data.model_dump(exclude_unset=True).items():
+            setattr(holiday, key, value)
+
+        await HolidayService._save(holiday=holiday, before=before, session=session)
+        await session.refresh(holiday)
+
+        return holiday
+
+    @staticmethod
+    async def delete_holiday(id: UUID, session: AsyncSession):
+        holiday = await HolidayService.get_holiday(id=id, session=session)
+        before = (holiday.holiday_date, *_scope(holiday))
+
+        await HolidayService._save(
+            holiday=holiday, before=before, session=session, delete=True
+        )
+
+        return {}
+
+    @staticmethod
+    async def get_working_days(
+        start_date: date,
+        end_date: date,
+        session: AsyncSession,
+        company_id: UUID | None = None,
+        country: str | None = None,
+    ):
+        if end_date < start_date:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail="end_date must not be before start_date",
+            )
+
+        calendar = await HolidayService.get_calendar(
+            session=session,
+            company_id=company_id,
+            country=country.upper() if country else HOLIDAY_COUNTRY,
+        )
+        working_days = count_working_days(
+            start_date=start_date, end_date=end_date, business_calendar=calendar
+        )
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "working_days": working_days,
+            "working_hours": working_days * HOURS_PER_DAY,
+        }
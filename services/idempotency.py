@@ -0,0 +1,215 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import SQLModel, delete, insert, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config.settings import (
+    IDEMPOTENCY_CACHE_SIZE,
+    IDEMPOTENCY_LOCK_SECONDS,
+    IDEMPOTENCY_TTL_SECONDS,
+)
+from models.idempotency import IdempotencyKey
+from models.user import User
+from utils.cache import TTLCache
+
+
+# (user id, key) -> (fingerprint, status code, body) of finished requests, so
+# a retry storm is answered without touching the database.
+idempotent_responses = TTLCache(
+    maxsize=IDEMPOTENCY_CACHE_SIZE, ttl=IDEMPOTENCY_TTL_SECONDS
+)
+
+
+def fingerprint(scope: str, data: SQLModel) -> str:
+    payload = json.dumps(
+        [scope, data.model_dump(mode="json")], sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def check_fingerprint(stored_fingerprint: str, request_fingerprint: str):
+    if stored_fingerprint != request_fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Idempotency-Key was already used with a different request",
+        )
+
+
+def replay(stored: tuple[str, int, Any], request_fingerprint: str) -> JSONResponse:
+    stored_fingerprint, status_code, body = stored
+    check_fingerprint(stored_fingerprint, request_fingerprint)
+    return JSONResponse(
+        content=body, status_code=status_code, headers={"Idempotent-Replayed": "true"}
+    )
+
+
+class IdempotencyService:
+    @staticmethod
+    async def run(
+        key: str | None,
+        scope: str,
+        data: SQLModel,
+        response_model: type[SQLModel],
+        status_code: int,
+        operation: Callable[[], Awaitable[Any]],
+        session: AsyncSession,
+        current_user: User,
+    ):
+        """Run ``operation`` at most once per ``Idempotency-Key``.
+
+        ``operation`` must flush its changes without committing: they are
+        committed here together with the stored response, so the key can
+        never be left pointing at work that did not happen, or miss work
+        that did.  Without a key the operation simply runs and is committed.
+
+        With a key, a placeholder row is claimed first; a retry that arrives
+        while it is held gets 409, and one that arrives after it finished
+        gets the stored response back without running the operation again.
+        If the transaction rolls back the key is released so the request
+        can be retried.
+        """
+        if key is None:
+            try:
+                result = await operation()
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+            return result
+
+        request_fingerprint = fingerprint(scope, data)
+        cache_key = (current_user.id, key)
+
+        stored = idempotent_responses.get(cache_key)
+        if stored is not None:
+            return replay(stored, request_fingerprint)
+
+        claimed = await IdempotencyService.claim(
+            user_id=current_user.id,
+            key=key,
+            request_fingerprint=request_fingerprint,
+            session=session,
+        )
+        if isinstance(claimed, tuple):
+            return replay(claimed, request_fingerprint)
+
+        try:
+            result = await operation()
+            body = response_model.model_validate(result).model_dump(mode="json")
+            stored = await session.exec(
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.user_id == current_user.id,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.locked_at == claimed,
+                )
+                .values(status_code=status_code, response=body)
+            )
+            # Our claim was taken over after outliving the lock: let the
+            # request that holds it now do the work instead.
+            if stored.rowcount != 1:
+                raise IdempotencyService.in_progress()
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            await session.exec(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.user_id == current_user.id,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.locked_at == claimed,
+                )
+            )
+            await session.commit()
+            raise
+
+        idempotent_responses.set(cache_key, (request_fingerprint, status_code, body))
+
+        return body
+
+    @staticmethod
+    async def claim(
+        user_id: UUID, key: str, request_fingerprint: str, session: AsyncSession
+    ) -> datetime | tuple[str, int, Any]:
+        """Take the key for this request.
+
+        Returns the lock timestamp identifying our claim, or the stored
+        ``(fingerprint, status code, body)`` when the request already ran.
+        """
+        now = datetime.now()
+        values = dict(
+            fingerprint=request_fingerprint,
+            status_code=None,
+            response=None,
+            locked_at=now,
+            expires_at=now + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS),
+        )
+
+        result = await session.exec(
+            select(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id, IdempotencyKey.key == key
+            )
+        )
+        record = result.one_or_none()
+
+        if record is None:
+            try:
+                await session.exec(
+                    insert(IdempotencyKey).values(user_id=user_id, key=key, **values)
+                )
+                await session.commit()
+                return now
+            except IntegrityError:
+                await session.rollback()
+                raise IdempotencyService.in_progress()
+
+        expired = record.expires_at <= now
+        if not expired:
+            if record.status_code is not None:
+                stored = (record.fingerprint, record.status_code, record.response)
+                idempotent_responses.set(
+                    (user_id, key),
+                    stored,
+                    ttl=(record.expires_at - now).total_seconds(),
+                )
+                return stored
+            check_fingerprint(record.fingerprint, request_fingerprint)
+            if record.locked_at > now - timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS):
+                raise IdempotencyService.in_progress()
+
+        # Expired, or abandoned by a worker that died mid-request: take it
+        # over unless another request beat us to it.
+        result = await session.exec(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.locked_at == record.locked_at,
+            )
+            .values(**values)
+        )
+        await session.commit()
+        if result.rowcount != 1:
+            raise IdempotencyService.in_progress()
+        return now
+
+    @staticmethod
+    def in_progress() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still being processed",
+        )
+
+    @staticmethod
+    async def purge_expired(session: AsyncSession) -> int:
+        result = await session.exec(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at < datetime.now())
+        )
+        await session.commit()
+        return result.rowcount
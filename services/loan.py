@@ -1,5 +1,6 @@
 from datetime import date
-import math
+from decimal import Decimal
+from functools import lru_cache
 from uuid import UUID
 from fastapi import HTTPException, status
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -7,16 +8,82 @@ from sqlmodel import select
 
 from dateutil.relativedelta import relativedelta
 
+from models.company import Company
+from models.employee import Employee
 from models.loan import Loan, LoanEntries
 from models.period_year import Period
 from models.user import User
-from schemas.base import ResponseModel
-from schemas.loan import LoanCreate, LoanEntriesCreate, LoanEntriesUpdate, LoanUpdate
-from services.company import CompanyService
-from services.employee import EmployeeService
+from config.settings import SCHEDULE_PREVIEW_CACHE_SIZE
+from schemas.loan import (
+    LoanCreate,
+    LoanEntriesCreate,
+    LoanEntriesPreview,
+    LoanEntriesPreviewRead,
+    LoanEntriesRead,
+    LoanEntriesUpdate,
+    LoanUpdate,
+)
+from schemas.payment_schedule import PaymentSchedulePreview
 from services.payment_schedule import PaymentScheduleService
-from utils.helper import defualt_schedule_generation, delete_payment_by_loan_entry_id
-from utils.text_options import InterestCalculationType, InterestTerm
+from utils.helper import (
+    defualt_schedule_generation,
+    delete_payment_by_loan_entry_id,
+    resolve_term,
+    whole_periods,
+)
+from utils import money
+from utils.amortization import amortize
+from utils.export import export_response
+from utils.pagination import paginate, projection
+from utils.reference_cache import reference_cache
+from utils.text_options import (
+    CountMode,
+    ExportFormat,
+    InterestCalculationType,
+    InterestTerm,
+)
+
+
+@lru_cache(maxsize=SCHEDULE_PREVIEW_CACHE_SIZE)
+def schedule_preview(
+    amount: Decimal,
+    interest_rate: Decimal,
+    periods: int,
+    installment: Decimal | None,
+    calculation_type: InterestCalculationType | None,
+    interest_term: InterestTerm | None,
+    deduction_start_date: date | None,
+) -> LoanEntriesPreviewRead:
+    """Compute a schedule preview; memoized since it only depends on its args."""
+    schedule = amortize(
+        principal=amount,
+        periods=periods,
+        rate=interest_rate,
+        calculation_type=calculation_type,
+        interest_term=interest_term,
+        installment=installment,
+    )
+
+    schedules = [
+        PaymentSchedulePreview(
+            **row,
+            due_date=(
+                deduction_start_date + relativedelta(months=row["month"] - 1)
+                if deduction_start_date
+                else None
+            ),
+        )
+        for row in schedule.rows()
+    ]
+
+    return LoanEntriesPreviewRead(
+        amount=amount,
+        monthly_repayment=schedules[0].monthly_payment if schedules else None,
+        total_interest=money.to_decimal(schedule.total_interest),
+        total_payment=money.to_decimal(schedule.total_payment),
+        deduction_end_date=schedules[-1].due_date if schedules else None,
+        schedules=schedules,
+    )
 
 
 class LoanService:
@@ -63,14 +130,10 @@ class LoanService:
         interest_term: InterestTerm | None = None,
         calculation_type: InterestCalculationType | None = None,
         limit: int = 10,
-        offset: int = 0,
+        cursor: str | None = None,
+        count: CountMode | None = None,
     ):
-        query = (
-            select(Loan)
-            .order_by(Loan.code.asc())
-            .limit(limit=limit)
-            .offset(offset=offset)
-        )
+        query = select(Loan)
         if code:
             query = query.where(Loan.code == code)
         if name:
@@ -79,12 +142,15 @@ class LoanService:
             query = query.where(Loan.interest_term == interest_term)
         if calculation_type:
             query = query.where(Loan.calculation_type == calculation_type)
-        result = await session.exec(query)
 
-        loans = result.unique().all()
-        count = len(loans)
-
-        return ResponseModel(count=count, results=loans)
+        return await paginate(
+            session=session,
+            query=query,
+            keys=(Loan.code, Loan.id),
+            limit=limit,
+            cursor=cursor,
+            count=count,
+        )
 
     @staticmethod
     async def delete_loan(id: UUID, session: AsyncSession):
@@ -97,6 +163,7 @@ class LoanService:
             setattr(loan, "exclude", True)
             session.add(loan)
             await session.commit()
+            reference_cache.invalidate(Loan, id)
 
             return {}
         except Exception as e:
@@ -118,9 +185,10 @@ class LoanService:
             for key, value in data.model_dump(exclude_unset=True).items():
                 setattr(loan, key, value)
 
-            loan["modified_by_id"] = current_user.id
+            loan.modified_by_id = current_user.id
             session.add(loan)
             await session.commit()
+            reference_cache.invalidate(Loan, id)
             await session.refresh(loan)
 
             return loan
@@ -134,43 +202,62 @@ class LoanService:
 class LoanEntriesService:
     @staticmethod
     async def create_loan_entry(
-        data: LoanEntriesCreate, session: AsyncSession, current_user: User
+        data: LoanEntriesCreate,
+        session: AsyncSession,
+        current_user: User,
+        commit: bool = True,
     ):
-        try:
-            deduction_period: date | None = None
+        """Create a loan entry and its payment schedule.
 
-            if data.employee_id:
-                employee = await EmployeeService.get_employee(
-                    id=data.employee_id, session=session
+        With ``commit=False`` the entry is only flushed, and the caller
+        commits it together with whatever else belongs to the transaction.
+        """
+        try:
+            references = {
+                "employee_id": Employee,
+                "loan_id": Loan,
+                "company_id": Company,
+                "deduction_start_period_id": Period,
+            }
+            ids = {
+                field: getattr(data, field)
+                for field in references
+                if getattr(data, field)
+            }
+            # Employees change too often to cache; the rest come from the
+            # reference cache, and whatever is left is read in one query.
+            found = await reference_cache.get_together(
+                refs={references[field]: id for field, id in ids.items()},
+                session=session,
+                uncached=(Employee,),
+            )
+            missing = [field for field in ids if found[references[field]] is None]
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Not found: {', '.join(missing)}",
                 )
-                if not employee:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail="Employee not found",
-                    )
+
+            employee = found.get(Employee)
+            loan = found.get(Loan)
+            company = found.get(Company)
+            deduction_period = found.get(Period)
+
+            if employee:
                 data.employee_code = employee.code
                 data.employee_fullname = employee.fullname
                 data.national_id = employee.national_id
 
-            if data.loan_id:
-                loan = await LoanService.get_loan(id=data.loan_id, session=session)
-                if not loan:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND, detail="Loan not found"
-                    )
+            if loan:
                 data.code = loan.code
                 data.description = loan.name
                 data.loan_name = loan.name
+                data.calculation_type = data.calculation_type or loan.calculation_type
+                data.interest_term = data.interest_term or loan.interest_term
+                if data.interest_rate is None:
+                    data.interest_rate = loan.interest_rate
 
-            if data.company_id:
-                company = await CompanyService.get_company(
-                    id=data.company_id, session=session
-                )
-                if not company:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail="Company not found",
-                    )
+            if company:
                 data.company_name = company.name
 
             data.user_id = current_user.id
@@ -180,15 +267,7 @@ class LoanEntriesService:
 
             await session.flush()
 
-            if data.deduction_start_period_id:
-                deduction_period = await session.get(
-                    Period, data.deduction_start_period_id
-                )
-                if not deduction_period:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail="Period not found",
-                    )
+            if deduction_period:
                 loan_entry.deduction_start_period_name = deduction_period.period_name
                 loan_entry.deduction_start_period_code = deduction_period.period_code
 
@@ -203,7 +282,7 @@ class LoanEntriesService:
 
             if duration:
                 if isinstance(deduction_period.start_date, date):
-                    duration_in_months = math.ceil(data.duration)
+                    duration_in_months = whole_periods(data.duration)
                     data.deduction_end_date = (
                         deduction_period.start_date
                         + relativedelta(months=duration_in_months - 1)
@@ -214,17 +293,48 @@ class LoanEntriesService:
                         detail="Deduction start period is required",
                     )
 
-            await session.commit()
+            if commit:
+                await session.commit()
+            else:
+                await session.flush()
             await session.refresh(loan_entry)
 
             return loan_entry
+        except HTTPException:
+            await session.rollback()
+            raise
         except Exception as e:
             await session.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     @staticmethod
-    async def get_loan_entries(
-        session: AsyncSession,
+    async def preview_loan_entry(data: LoanEntriesPreview) -> LoanEntriesPreviewRead:
+        periods, installment, duration = resolve_term(
+            amount=data.amount,
+            duration=data.duration,
+            monthly_repayment=data.monthly_repayment,
+        )
+
+        if not periods:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Amount and either duration or monthly repayment are required",
+            )
+
+        preview = schedule_preview(
+            amount=money.quantize(data.amount),
+            interest_rate=money.quantize(data.interest_rate),
+            periods=periods,
+            installment=money.quantize(installment) if installment else None,
+            calculation_type=data.calculation_type,
+            interest_term=data.interest_term,
+            deduction_start_date=data.deduction_start_date,
+        )
+
+        return preview.model_copy(update={"duration": duration})
+
+    @staticmethod
+    def loan_entries_query(
         id: UUID | None = None,
         code: str | None = None,
         employee_id: UUID | None = None,
@@ -238,15 +348,9 @@ class LoanEntriesService:
         calculation_type: InterestCalculationType | None = None,
         # company_id: UUID | None = None,
         exclude: bool | None = None,
-        limit: int = 10,
-        offset: int = 0,
+        columns: list | None = None,
     ):
-        query = (
-            select(LoanEntries)
-            .order_by(LoanEntries.id)
-            .limit(limit=limit)
-            .offset(offset=offset)
-        )
+        query = select(*columns) if columns else select(LoanEntries)
         if id:
             query = query.where(LoanEntries.id == id)
         if code:
@@ -273,16 +377,72 @@ class LoanEntriesService:
         #     query = query.where(LoanEntries.company_id == company_id)
         if exclude:
             query = query.where(LoanEntries.exclude == exclude)
-        result = await session.exec(query)
+        return query
+
+    @staticmethod
+    async def get_loan_entries(
+        session: AsyncSession,
+        id: UUID | None = None,
+        code: str | None = None,
+        employee_id: UUID | None = None,
+        employee_code: str | None = None,
+        employee_fullname: str | None = None,
+        national_id: str | None = None,
+        loan_id: UUID | None = None,
+        loan_name: str | None = None,
+        description: str | None = None,
+        interest_term: InterestTerm | None = None,
+        calculation_type: InterestCalculationType | None = None,
+        # company_id: UUID | None = None,
+        exclude: bool | None = None,
+        limit: int = 10,
+        cursor: str | None = None,
+        count: CountMode | None = None,
+        fields: list[str] | None = None,
+    ):
+        keys = (LoanEntries.created_at, LoanEntries.id)
+        query = LoanEntriesService.loan_entries_query(
+            id=id,
+            code=code,
+            employee_id=employee_id,
+            employee_code=employee_code,
+            employee_fullname=employee_fullname,
+            national_id=national_id,
+            loan_id=loan_id,
+            loan_name=loan_name,
+            description=description,
+            interest_term=interest_term,
+            calculation_type=calculation_type,
+            exclude=exclude,
+            columns=projection(LoanEntries, LoanEntriesRead, fields=fields, keys=keys),
+        )
 
-        loan_entries = result.unique().all()
-        count = len(loan_entries)
+        return await paginate(
+            session=session,
+            query=query,
+            keys=keys,
+            descending=True,
+            limit=limit,
+            cursor=cursor,
+            count=count,
+        )
 
-        return ResponseModel(count=count, results=loan_entries)
+    @staticmethod
+    def export_loan_entries(format: ExportFormat = ExportFormat.NDJSON, **filters):
+        query = LoanEntriesService.loan_entries_query(**filters).order_by(
+            LoanEntries.created_at, LoanEntries.id
+        )
+        return export_response(
+            query=query, schema=LoanEntriesRead, format=format, filename="loan_entries"
+        )
 
     @staticmethod
-    async def get_loan_entry(id: UUID, session: AsyncSession):
+    async def get_loan_entry(id: UUID, session: AsyncSession, for_update: bool = False):
         query = select(LoanEntries).where(LoanEntries.id == id)
+        if for_update:
+            # Lock the row until the caller commits, and re-read it in case an
+            # older copy is already in the session.
+            query = query.with_for_update().execution_options(populate_existing=True)
         result = await session.exec(query)
 
         loan_entry = result.unique().one_or_none()
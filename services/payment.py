@@ -1,30 +1,74 @@
-from decimal import Decimal
+from collections import defaultdict
+
 from fastapi import HTTPException, status
-from sqlmodel import select
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import insert, select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from models.payment_schedule import Payment
+from config.settings import PAYMENT_BATCH_CHUNK_SIZE
+from models.company import Company
+from models.loan import LoanEntries
+from models.payment_schedule import Payment, PaymentSchedule
 from models.user import User
-from schemas.base import ResponseModel
-from schemas.payment import PaymentCreate
+from schemas.payment import (
+    PaymentBatchRead,
+    PaymentBatchResult,
+    PaymentCreate,
+    PaymentRead,
+)
 from uuid import UUID
 
-from schemas.payment_schedule import PaymentScheduleUpdate
-from services.company import CompanyService
 from services.loan import LoanEntriesService
-from services.payment_schedule import PaymentScheduleService
 
-from utils.helper import get_sorted_schedules_and_min_month
-from utils.text_options import PaymentType
+from utils import money
+from utils.helper import (
+    bulk_update,
+    first_unpaid_schedule,
+    get_sorted_schedules_and_min_month,
+)
+from utils.export import export_response
+from utils.pagination import paginate, projection
+from utils.reference_cache import reference_cache
+from utils.retry import is_retryable, retry_on_conflict
+from utils.text_options import CountMode, ExportFormat, PaymentType
 
 
 class PaymentService:
     @staticmethod
     async def create_payment(
-        data: PaymentCreate, session: AsyncSession, current_user: User
+        data: PaymentCreate,
+        session: AsyncSession,
+        current_user: User,
+        commit: bool = True,
     ):
+        """Post one payment.
+
+        With ``commit=False`` the payment is only flushed, and the caller
+        commits it together with whatever else belongs to the transaction.
+        """
         try:
+            return await retry_on_conflict(
+                lambda: PaymentService._create_payment(
+                    data=data,
+                    session=session,
+                    current_user=current_user,
+                    commit=commit,
+                )
+            )
+        except DBAPIError:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Payment conflicted with concurrent updates, please retry",
+            )
+
+    @staticmethod
+    async def _create_payment(
+        data: PaymentCreate, session: AsyncSession, current_user: User, commit: bool
+    ):
+        try:
+            # Payments for one loan are serialized on its row lock; other
+            # loans are unaffected.
             loan_entry = await LoanEntriesService.get_loan_entry(
-                id=data.loan_entry_id, session=session
+                id=data.loan_entry_id, session=session, for_update=True
             )
             if not loan_entry:
                 raise HTTPException(
@@ -33,156 +77,393 @@ class PaymentService:
 
             company = None
             if data.company_id:
-                company = await CompanyService.get_company(
-                    id=data.company_id, session=session
-                )
+                company = await reference_cache.get(Company, data.company_id, session)
                 if not company:
                     raise HTTPException(
                         status_code=status.HTTP_404_NOT_FOUND,
                         detail="Company not found",
                     )
 
-            schedules, min_month = await get_sorted_schedules_and_min_month(
+            schedules, _ = await get_sorted_schedules_and_min_month(
                 loan_entry_id=loan_entry.id, session=session
             )
 
-            if not min_month:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="No payment schedule found for this loan entry",
-                )
-
-            payment = Payment.model_validate(data, update={"user_id": current_user.id})
-            payment.employee_id = loan_entry.employee_id
-            payment.employee_code = loan_entry.employee_code
-            payment.employee_fullname = loan_entry.employee_fullname
-            payment.loan_amount = loan_entry.amount
-            payment.loan_entry_description = loan_entry.description
-            payment.loan_entry_name = loan_entry.loan_name
-            payment.loan_entry_code = loan_entry.code
-            payment.user_name = current_user.username
-            payment.company_name = company.name if company else ""
-            payment.company_id = company.id if company else None
+            payment = PaymentService.build_payment(
+                data=data,
+                loan_entry=loan_entry,
+                company=company,
+                current_user=current_user,
+            )
 
             session.add(payment)
-            await session.flush()
 
-            if payment.payment_type == PaymentType.Default:
-                current_total_payment = (
-                    loan_entry.total_amount_paid if loan_entry.total_amount_paid else 0
-                )
-                expected_monthly_amount = min_month.monthly_payment
-                loan_entry.monthly_repayment = expected_monthly_amount
+            # The allocation is written back with one UPDATE below, so the
+            # schedules must not also be flushed one by one.
+            for schedule in schedules:
+                session.expunge(schedule)
 
-                amount_paid = min(
-                    payment.amount_paid or 0, loan_entry.amount - current_total_payment
-                )
+            changed = PaymentService.apply_payment(
+                payment=payment,
+                loan_entry=loan_entry,
+                schedules=schedules,
+                current_user=current_user,
+            )
+            await PaymentService.save_allocations(schedules=changed, session=session)
 
-                schedule_update = PaymentScheduleUpdate(
-                    loan_entry_id=loan_entry.id,
-                    amount_paid=amount_paid,
-                    paid=True,
-                    difference=round(amount_paid - expected_monthly_amount, 2),
-                    modified_by=current_user.id,
-                    modified_by_name=current_user.username,
-                )
+            if commit:
+                await session.commit()
+            else:
+                await session.flush()
+            await session.refresh(payment)
 
-                await PaymentScheduleService.update_schedule(
-                    id=min_month.id, data=schedule_update, session=session
-                )
+            return payment
 
-                new_total_paid = round(current_total_payment + amount_paid, 2)
-                remaining_amount = round(loan_entry.amount - new_total_paid, 2)
-                loan_entry.total_amount_paid = new_total_paid
-                loan_entry.remaining_balance = remaining_amount
+        except HTTPException:
+            await session.rollback()
+            raise
+        except Exception as e:
+            await session.rollback()
+            if is_retryable(e):
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error creating payment: {str(e)}",
+            )
 
-                payment.remaining_balance = remaining_amount
+    @staticmethod
+    def build_payment(
+        data: PaymentCreate,
+        loan_entry: LoanEntries,
+        company: Company | None,
+        current_user: User,
+    ) -> Payment:
+        return Payment.model_validate(
+            data,
+            update={
+                "user_id": current_user.id,
+                "user_name": current_user.username,
+                "employee_id": loan_entry.employee_id,
+                "employee_code": loan_entry.employee_code,
+                "employee_fullname": loan_entry.employee_fullname,
+                "loan_amount": loan_entry.amount,
+                "loan_entry_description": loan_entry.description,
+                "loan_entry_name": loan_entry.loan_name,
+                "loan_entry_code": loan_entry.code,
+                "company_name": company.name if company else "",
+                "company_id": company.id if company else None,
+            },
+        )
 
-                if remaining_amount <= 0:
-                    loan_entry.closed = True
-                    loan_entry.status = False
+    @staticmethod
+    def apply_payment(
+        payment: Payment,
+        loan_entry: LoanEntries,
+        schedules: list[PaymentSchedule],
+        current_user: User,
+    ) -> list[PaymentSchedule]:
+        """Allocate ``payment`` over the loan's sorted ``schedules`` in memory.
+
+        Updates the schedules, loan entry and payment in place and returns the
+        schedules that changed; writing them back is up to the caller.
+        """
+        min_month = first_unpaid_schedule(schedules)
+        if not min_month:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No outstanding payment schedule found for this loan entry",
+            )
 
-            elif payment.payment_type == PaymentType.Custom:
-                amount_paid = payment.amount_paid
-                total_paid = 0
+        total_due = money.total(schedule.monthly_payment for schedule in schedules)
+        current_total_payment = money.to_cents(loan_entry.total_amount_paid)
+        changed = []
 
-                for schedule in schedules:
-                    if amount_paid <= 0:
-                        break
+        if payment.payment_type == PaymentType.Default:
+            expected_monthly_amount = money.to_cents(min_month.monthly_payment)
+            loan_entry.monthly_repayment = min_month.monthly_payment
 
-                    amount_left = schedule.monthly_payment - (
-                        schedule.amount_paid or Decimal(0)
-                    )
-                    amount_to_pay = min(amount_paid, amount_left)
-                    if amount_to_pay <= 0:
-                        continue
+            amount_paid = max(
+                min(
+                    money.to_cents(payment.amount_paid),
+                    total_due - current_total_payment,
+                ),
+                0,
+            )
 
-                    schedule_amount_paid = amount_to_pay + (
-                        schedule.amount_paid or Decimal(0)
-                    )
-                    difference = schedule.monthly_payment - schedule_amount_paid
-
-                    if schedule_amount_paid >= schedule.monthly_payment:
-                        processed = True
-                    else:
-                        processed = False
-
-                    schedule_update = PaymentScheduleUpdate(
-                        loan_entry_id=loan_entry.id,
-                        amount_paid=schedule_amount_paid,
-                        paid=processed,
-                        difference=round(difference, 2),
-                        month=schedule.month,
-                        monthly_payment=schedule.monthly_payment,
-                        modified_by=current_user.id,
-                        modified_by_name=current_user.username,
+            min_month.amount_paid = money.to_decimal(amount_paid)
+            min_month.paid = True
+            min_month.difference = money.to_decimal(
+                amount_paid - expected_monthly_amount
+            )
+            changed.append(min_month)
+            new_total_paid = current_total_payment + amount_paid
+
+        else:
+            due = [money.to_cents(schedule.monthly_payment) for schedule in schedules]
+            paid = [money.to_cents(schedule.amount_paid) for schedule in schedules]
+            applied = money.allocate(
+                money.to_cents(payment.amount_paid), due=due, paid=paid
+            )
+
+            for schedule, row_due, row_paid, amount_to_pay in zip(
+                schedules, due, paid, applied
+            ):
+                if not amount_to_pay:
+                    continue
+
+                schedule_amount_paid = row_paid + amount_to_pay
+                schedule.amount_paid = money.to_decimal(schedule_amount_paid)
+                schedule.paid = schedule_amount_paid >= row_due
+                schedule.difference = money.to_decimal(row_due - schedule_amount_paid)
+                changed.append(schedule)
+
+            new_total_paid = current_total_payment + sum(applied)
+
+        for schedule in changed:
+            schedule.modified_by = current_user.id
+            schedule.modified_by_name = current_user.username
+
+        remaining_amount = total_due - new_total_paid
+        loan_entry.total_amount_paid = money.to_decimal(new_total_paid)
+        loan_entry.remaining_balance = money.to_decimal(remaining_amount)
+
+        if payment.payment_type == PaymentType.Default:
+            payment.remaining_balance = loan_entry.remaining_balance
+
+        if remaining_amount <= 0:
+            loan_entry.closed = True
+            loan_entry.status = False
+
+        return changed
+
+    @staticmethod
+    async def save_allocations(
+        schedules: list[PaymentSchedule], session: AsyncSession
+    ) -> int:
+        """Write the allocation columns of ``schedules`` back in one UPDATE."""
+        return await bulk_update(
+            PaymentSchedule,
+            [
+                {
+                    "id": schedule.id,
+                    "amount_paid": schedule.amount_paid,
+                    "paid": schedule.paid,
+                    "difference": schedule.difference,
+                    "modified_by": schedule.modified_by,
+                    "modified_by_name": schedule.modified_by_name,
+                }
+                for schedule in schedules
+            ],
+            session=session,
+        )
+
+    @staticmethod
+    async def create_payments(
+        data: list[PaymentCreate], session: AsyncSession, current_user: User
+    ) -> PaymentBatchRead:
+        """Post a batch of payments, committing every ``PAYMENT_BATCH_CHUNK_SIZE``.
+
+        A row that cannot be posted is reported and skipped; the rest of its
+        chunk still goes through.
+        """
+        results = []
+        for start in range(0, len(data), PAYMENT_BATCH_CHUNK_SIZE):
+            chunk = data[start : start + PAYMENT_BATCH_CHUNK_SIZE]
+            try:
+                results.extend(
+                    await retry_on_conflict(
+                        lambda: PaymentService._create_payment_chunk(
+                            data=chunk,
+                            start=start,
+                            session=session,
+                            current_user=current_user,
+                        )
                     )
-                    await PaymentScheduleService.update_schedule(
-                        id=schedule.id, data=schedule_update, session=session
+                )
+            except DBAPIError as e:
+                await session.rollback()
+                results.extend(
+                    PaymentBatchResult(
+                        index=index,
+                        loan_entry_id=item.loan_entry_id,
+                        created=False,
+                        detail=f"Error creating payment: {str(e)[:100]}",
                     )
-                    total_paid += amount_to_pay
-                    amount_paid -= amount_to_pay
-
-                current_total_payment = loan_entry.total_amount_paid or Decimal(0)
-                new_total_payment = current_total_payment + total_paid
-                new_remaining = loan_entry.amount - new_total_payment
+                    for index, item in enumerate(chunk, start=start)
+                )
 
-                loan_entry.total_amount_paid = new_total_payment
-                loan_entry.remaining_balance = new_remaining
+        created = sum(result.created for result in results)
+        return PaymentBatchRead(
+            created=created, failed=len(results) - created, results=results
+        )
 
-                if new_total_payment >= loan_entry.amount:
-                    loan_entry.status = False
-                    loan_entry.closed = True
+    @staticmethod
+    async def _create_payment_chunk(
+        data: list[PaymentCreate],
+        start: int,
+        session: AsyncSession,
+        current_user: User,
+    ) -> list[PaymentBatchResult]:
+        loan_entry_ids = {item.loan_entry_id for item in data}
+        company_ids = {item.company_id for item in data if item.company_id}
 
-            await session.commit()
-            await session.refresh(payment)
+        try:
+            # Lock every loan in the chunk in id order, so concurrent batches
+            # touching the same loans queue up instead of deadlocking.
+            result = await session.exec(
+                select(LoanEntries)
+                .where(LoanEntries.id.in_(loan_entry_ids))
+                .order_by(LoanEntries.id)
+                .with_for_update()
+            )
+            loan_entries = {loan_entry.id: loan_entry for loan_entry in result.all()}
 
-            return payment
+            companies = await reference_cache.get_many(Company, company_ids, session)
 
-        except HTTPException:
+            result = await session.exec(
+                select(PaymentSchedule)
+                .where(
+                    PaymentSchedule.loan_entry_id.in_(loan_entry_ids),
+                    PaymentSchedule.is_deleted.is_not(True),
+                )
+                .order_by(PaymentSchedule.loan_entry_id, PaymentSchedule.month)
+            )
+            schedules = defaultdict(list)
+            for schedule in result.all():
+                schedules[schedule.loan_entry_id].append(schedule)
+        except DBAPIError:
             await session.rollback()
             raise
+
+        # Allocation happens on detached copies and is written back in bulk
+        # below, instead of one UPDATE per object at flush time.
+        session.expunge_all()
+
+        results = []
+        payments = []
+        changed_schedules = {}
+        changed_loan_entries = {}
+
+        for index, item in enumerate(data, start=start):
+            try:
+                loan_entry = loan_entries.get(item.loan_entry_id)
+                if not loan_entry:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Loan entry not found",
+                    )
+
+                company = None
+                if item.company_id:
+                    company = companies.get(item.company_id)
+                    if not company:
+                        raise HTTPException(
+                            status_code=status.HTTP_404_NOT_FOUND,
+                            detail="Company not found",
+                        )
+
+                payment = PaymentService.build_payment(
+                    data=item,
+                    loan_entry=loan_entry,
+                    company=company,
+                    current_user=current_user,
+                )
+                changed = PaymentService.apply_payment(
+                    payment=payment,
+                    loan_entry=loan_entry,
+                    schedules=schedules[loan_entry.id],
+                    current_user=current_user,
+                )
+            except HTTPException as e:
+                results.append(
+                    PaymentBatchResult(
+                        index=index,
+                        loan_entry_id=item.loan_entry_id,
+                        created=False,
+                        detail=e.detail,
+                    )
+                )
+                continue
+
+            payments.append(payment)
+            changed_loan_entries[loan_entry.id] = loan_entry
+            for schedule in changed:
+                changed_schedules[schedule.id] = schedule
+
+            results.append(
+                PaymentBatchResult(
+                    index=index,
+                    loan_entry_id=item.loan_entry_id,
+                    created=True,
+                    payment_id=payment.id,
+                    remaining_balance=loan_entry.remaining_balance,
+                )
+            )
+
+        if not payments:
+            return results
+
+        try:
+            await session.exec(
+                insert(Payment.__table__),
+                params=[payment.model_dump() for payment in payments],
+            )
+            await PaymentService.save_allocations(
+                schedules=list(changed_schedules.values()), session=session
+            )
+            await bulk_update(
+                LoanEntries,
+                [
+                    {
+                        "id": loan_entry.id,
+                        "monthly_repayment": loan_entry.monthly_repayment,
+                        "total_amount_paid": loan_entry.total_amount_paid,
+                        "remaining_balance": loan_entry.remaining_balance,
+                        "closed": loan_entry.closed,
+                        "status": loan_entry.status,
+                    }
+                    for loan_entry in changed_loan_entries.values()
+                ],
+                session=session,
+            )
+            await session.commit()
         except Exception as e:
             await session.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Error creating payment: {str(e)}",
-            )
+            if is_retryable(e):
+                raise
+            for result in results:
+                if result.created:
+                    result.created = False
+                    result.payment_id = None
+                    result.remaining_balance = None
+                    result.detail = f"Error creating payment: {str(e)[:100]}"
+
+        return results
 
     @staticmethod
-    async def get_payments(session: AsyncSession, limit: int = 10, offset: int = 0):
-        query = (
-            select(Payment)
-            .order_by(Payment.created_at.desc())
-            .limit(limit=limit)
-            .offset(offset=offset)
+    async def get_payments(
+        session: AsyncSession,
+        limit: int = 10,
+        cursor: str | None = None,
+        count: CountMode | None = None,
+        fields: list[str] | None = None,
+    ):
+        keys = (Payment.created_at, Payment.id)
+        return await paginate(
+            session=session,
+            query=select(*projection(Payment, PaymentRead, fields=fields, keys=keys)),
+            keys=keys,
+            descending=True,
+            limit=limit,
+            cursor=cursor,
+            count=count,
         )
-        result = await session.exec(query)
-
-        payments = result.unique().all()
-        count = len(payments)
 
-        return ResponseModel(count=count, results=payments)
+    @staticmethod
+    def export_payments(format: ExportFormat = ExportFormat.NDJSON):
+        query = select(Payment).order_by(Payment.created_at, Payment.id)
+        return export_response(
+            query=query, schema=PaymentRead, format=format, filename="payments"
+        )
 
     @staticmethod
     async def get_payment(id: UUID, session: AsyncSession):
@@ -228,7 +509,10 @@ class PaymentService:
         loan_entry_id: UUID, session: AsyncSession
     ):
         try:
-            query = select(Payment).where(Payment.loan_entry_id == loan_entry_id)
+            query = select(Payment).where(
+                Payment.loan_entry_id == loan_entry_id,
+                Payment.is_deleted.is_not(True),
+            )
             result = await session.exec(query)
 
             payments = result.unique().all()
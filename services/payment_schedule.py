@@ -1,11 +1,17 @@
 from uuid import UUID
 from fastapi import HTTPException, status
-from sqlmodel import select
+from sqlmodel import insert, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from models.payment_schedule import PaymentSchedule
-from schemas.base import ResponseModel
-from schemas.payment_schedule import PaymentScheduleCreate, PaymentScheduleUpdate
+from schemas.payment_schedule import (
+    PaymentScheduleCreate,
+    PaymentScheduleRead,
+    PaymentScheduleUpdate,
+)
+from utils.export import export_response
+from utils.pagination import paginate, projection
+from utils.text_options import CountMode, ExportFormat
 
 
 class PaymentScheduleService:
@@ -25,6 +31,25 @@ class PaymentScheduleService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)[:100]
             )
 
+    @staticmethod
+    async def create_schedules(
+        data: list[PaymentScheduleCreate], session: AsyncSession
+    ) -> int:
+        """Insert every schedule row in one multi-row INSERT.
+
+        Runs inside the caller's transaction: nothing is committed here, so a
+        failure leaves no partial schedule behind.
+        """
+        if not data:
+            return 0
+
+        rows = [
+            PaymentSchedule.model_validate(schedule).model_dump() for schedule in data
+        ]
+        await session.exec(insert(PaymentSchedule).values(rows))
+
+        return len(rows)
+
     @staticmethod
     async def get_schedule(id: UUID, session: AsyncSession):
         query = select(PaymentSchedule).where(PaymentSchedule.id == id)
@@ -40,28 +65,51 @@ class PaymentScheduleService:
 
         return schedule
 
+    @staticmethod
+    def schedules_query(loan_entry_id: UUID | None = None, columns: list | None = None):
+        query = select(*columns) if columns else select(PaymentSchedule)
+        query = query.where(PaymentSchedule.is_deleted.is_not(True))
+        if loan_entry_id:
+            query = query.where(PaymentSchedule.loan_entry_id == loan_entry_id)
+        return query
+
     @staticmethod
     async def get_schedules(
         session: AsyncSession,
         loan_entry_id: UUID | None = None,
         limit: int = 10,
-        offset: int = 0,
+        cursor: str | None = None,
+        count: CountMode | None = None,
+        fields: list[str] | None = None,
     ):
-        query = (
-            select(PaymentSchedule)
-            .order_by(PaymentSchedule.month.asc())
-            .limit(limit=limit)
-            .offset(offset=offset)
+        keys = (PaymentSchedule.month, PaymentSchedule.id)
+        return await paginate(
+            session=session,
+            query=PaymentScheduleService.schedules_query(
+                loan_entry_id=loan_entry_id,
+                columns=projection(
+                    PaymentSchedule, PaymentScheduleRead, fields=fields, keys=keys
+                ),
+            ),
+            keys=keys,
+            limit=limit,
+            cursor=cursor,
+            count=count,
         )
-        if loan_entry_id:
-            query = query.where(PaymentSchedule.loan_entry_id == loan_entry_id)
-
-        result = await session.exec(query)
-
-        schedules = result.unique().all()
-        count = len(schedules)
 
-        return ResponseModel(count=count, results=schedules)
+    @staticmethod
+    def export_schedules(
+        format: ExportFormat = ExportFormat.NDJSON, loan_entry_id: UUID | None = None
+    ):
+        query = PaymentScheduleService.schedules_query(
+            loan_entry_id=loan_entry_id
+        ).order_by(PaymentSchedule.loan_entry_id, PaymentSchedule.month)
+        return export_response(
+            query=query,
+            schema=PaymentScheduleRead,
+            format=format,
+            filename="payment_schedules",
+        )
 
     @staticmethod
     async def delete_schedule(id: UUID, session: AsyncSession):
@@ -120,17 +168,19 @@ class PaymentScheduleService:
     ):
         try:
             query = select(PaymentSchedule).where(
-                PaymentSchedule.loan_entry_id == loan_entry_id
+                PaymentSchedule.loan_entry_id == loan_entry_id,
+                PaymentSchedule.is_deleted.is_not(True),
             )
             result = await session.exec(query)
 
             schedules = result.unique().all()
+            if not schedules:
+                return {}
 
             for schedule in schedules:
                 schedule.is_deleted = True
                 session.add(schedule)
             await session.commit()
-            await session.refresh(schedule)
 
             return {}
         except Exception as e:
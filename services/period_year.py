@@ -2,82 +2,126 @@ from uuid import UUID
 from datetime import date
 from fastapi import HTTPException, status
 
-from sqlmodel import select
+from sqlmodel import case, cast, func, insert, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 
+from config.settings import HOURS_PER_DAY
+from models.loan import LoanEntries
+from models.payment_schedule import PaymentSchedule
 from models.period_year import PeriodYear, Period
 from models.user import User
-from schemas.base import ResponseModel
 from schemas.period_year import (
     PeriodCreate,
-    PeriodRead,
+    PeriodDeductionRead,
     PeriodYearCreate,
 )
+from services.holiday import HolidayService
+from utils.business_days import BusinessCalendar
 from utils.helper import (
     MONTH_NAMES,
+    backfill_due_periods,
     count_working_days,
     generate_calender,
     get_days_in_month,
 )
+from utils.export import export_response
+from utils.pagination import paginate
+from utils.reference_cache import reference_cache
+from utils.text_options import CountMode, ExportFormat
 
 
 class PeriodYearService:
     @staticmethod
-    async def create_period_year(
-        data: PeriodYearCreate, session: AsyncSession, current_user: User
-    ):
-        try:
-            period_year = PeriodYear.model_validate(
-                data, update={"user_id": current_user.id}
+    def build_periods(
+        period_year: PeriodYear,
+        user_id: UUID | None,
+        business_calendar: BusinessCalendar | None = None,
+    ) -> list[dict]:
+        """Rows for the twelve periods of ``period_year``, ready to insert.
+
+        Working days leave out the holidays of ``business_calendar``.
+        """
+        year = period_year.year
+        rows = []
+        for month, calender in generate_calender(year).items():
+            days_in_month = get_days_in_month(year=year, month=month)
+            start_date = date(year, month, 1)
+            end_date = date(year, month, days_in_month)
+            total_working_days = count_working_days(
+                start_date=start_date,
+                end_date=end_date,
+                business_calendar=business_calendar,
             )
+            period = PeriodCreate(
+                period_year_id=period_year.id,
+                month=month,
+                month_calender=calender,
+                year=year,
+                user_id=user_id,
+                period_code=f"{MONTH_NAMES[month][:3].upper()}{str(year)[2:]}",
+                period_name=f"{MONTH_NAMES[month]} {year}",
+                start_date=start_date,
+                end_date=end_date,
+                no_of_days=days_in_month,
+                total_working_days=total_working_days,
+                total_working_hours=total_working_days * HOURS_PER_DAY,
+                total_hours_per_day=HOURS_PER_DAY,
+            )
+            rows.append(Period.model_validate(period).model_dump())
+        return rows
 
-            session.add(period_year)
+    @staticmethod
+    async def create_period_years(
+        years: list[int], session: AsyncSession, current_user: User
+    ) -> list[PeriodYear]:
+        """Create each year with its twelve periods in a single transaction.
+
+        The years are flushed together to get their ids, then every period is
+        written with one multi-row INSERT.  Working days follow the default
+        holiday calendar.  Installments already scheduled in these years are
+        attached to their new periods in the same transaction.
+        """
+        user_id = current_user.id
+        try:
+            business_calendar = await HolidayService.get_calendar(session=session)
+            period_years = [
+                PeriodYear(year=year, user_id=user_id) for year in sorted(set(years))
+            ]
+            session.add_all(period_years)
+            await session.flush()
+
+            rows = [
+                row
+                for period_year in period_years
+                for row in PeriodYearService.build_periods(
+                    period_year=period_year,
+                    user_id=user_id,
+                    business_calendar=business_calendar,
+                )
+            ]
+            await session.exec(insert(Period).values(rows))
+            await backfill_due_periods(
+                start_date=date(period_years[0].year, 1, 1),
+                end_date=date(period_years[-1].year, 12, 31),
+                session=session,
+            )
             await session.commit()
-            await session.refresh(period_year)
-
-            month_calender = generate_calender(period_year.year)
-            for month, calender in month_calender.items():
-                if calender:
-                    first_day = calender[0][0]
-                    last_week = calender[-1]
-                    last_day = last_week[-1] if last_week[-1] != 0 else last_week[-2]
-                    days_in_month = get_days_in_month(
-                        year=period_year.year, month=month
-                    )
-                    period_code = f"{MONTH_NAMES.get(month)[:3].upper()}{str(period_year.year)[2:]}"
-                    period_name = f"{MONTH_NAMES.get(month)} {period_year.year}"
-                    start_date = date(period_year.year, month, first_day)
-                    end_date = date(period_year.year, month, last_day)
-                    no_of_days = days_in_month
-                    total_working_days = count_working_days(
-                        start_date=start_date, end_date=end_date
-                    )
-                    total_working_hours = total_working_days * 8
-                    total_hours_per_day = 8
-                    data = {
-                        "period_year_id": period_year.id,
-                        "month": month,
-                        "month_calender": calender,
-                        "year": period_year.year,
-                        "user_id": current_user.id,
-                        "period_code": period_code,
-                        "period_name": period_name,
-                        "start_date": start_date,
-                        "end_date": end_date,
-                        "no_of_days": no_of_days,
-                        "total_working_days": total_working_days,
-                        "total_working_hours": total_working_hours,
-                        "total_hours_per_day": total_hours_per_day,
-                    }
-                    period_data = PeriodCreate(**data)
-                    period = await PeriodService.create_period(
-                        data=period_data, session=session
-                    )
-            return period_year
+
+            return period_years
         except Exception as e:
+            await session.rollback()
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+    @staticmethod
+    async def create_period_year(
+        data: PeriodYearCreate, session: AsyncSession, current_user: User
+    ):
+        period_years = await PeriodYearService.create_period_years(
+            years=[data.year], session=session, current_user=current_user
+        )
+        return period_years[0]
+
     @staticmethod
     async def get_period(id: int, session: AsyncSession):
         query = select(PeriodYear).where(PeriodYear.id == id)
@@ -97,25 +141,26 @@ class PeriodYearService:
         session: AsyncSession,
         year: int | None = None,
         limit: int = 10,
-        offset: int = 0,
+        cursor: str | None = None,
+        count: CountMode | None = None,
     ):
         try:
-            query = (
-                select(PeriodYear)
-                .order_by(PeriodYear.year.desc())
-                .limit(limit=limit)
-                .offset(offset=offset)
-            )
+            query = select(PeriodYear)
 
             if year:
                 query = query.where(PeriodYear.year == year)
 
-            results = await session.exec(query)
-            periods = results.unique().all()
-
-            count = len(periods)
-
-            return ResponseModel(count=count, results=periods)
+            return await paginate(
+                session=session,
+                query=query,
+                keys=(PeriodYear.year, PeriodYear.id),
+                descending=True,
+                limit=limit,
+                cursor=cursor,
+                count=count,
+            )
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -132,6 +177,7 @@ class PeriodYearService:
 
             await session.delete(period_year)
             await session.commit()
+            reference_cache.invalidate(Period)
 
             return {}
         except Exception as e:
@@ -152,6 +198,10 @@ class PeriodService:
             period = Period.model_validate(data, update=extra_fields)
 
             session.add(period)
+            await session.flush()
+            await backfill_due_periods(
+                start_date=period.start_date, end_date=period.end_date, session=session
+            )
             await session.commit()
             await session.refresh(period)
 
@@ -169,15 +219,11 @@ class PeriodService:
         period_name: str | None = None,
         period_year_id: int | None = None,
         limit: int = 10,
-        offset: int = 0,
+        cursor: str | None = None,
+        count: CountMode | None = None,
     ):
         try:
-            query = (
-                select(Period)
-                .order_by(Period.period_code.desc())
-                .limit(limit=limit)
-                .offset(offset=offset)
-            )
+            query = select(Period)
 
             if period_code:
                 query = query.where(Period.period_code == period_code)
@@ -186,12 +232,17 @@ class PeriodService:
             if period_year_id:
                 query = query.where(Period.period_year_id == period_year_id)
 
-            results = await session.exec(query)
-            periods = results.unique().all()
-
-            count = len(periods)
-            periods_result = [PeriodRead.model_validate(period) for period in periods]
-            return ResponseModel(count=count, results=periods_result)
+            return await paginate(
+                session=session,
+                query=query,
+                keys=(Period.period_code, Period.id),
+                descending=True,
+                limit=limit,
+                cursor=cursor,
+                count=count,
+            )
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -205,9 +256,78 @@ class PeriodService:
 
             if not period:
                 raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND, details="Period not found"
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Period not found"
                 )
 
             return period
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    @staticmethod
+    async def export_deductions(
+        id: UUID,
+        session: AsyncSession,
+        company_id: UUID | None = None,
+        include_paid: bool = False,
+        format: ExportFormat = ExportFormat.CSV,
+    ):
+        """Stream the payroll deduction file for a period, grouped by company.
+
+        A single query over the ``(period_id, company_id)`` schedule index; the
+        join to the loan entry is by primary key.
+        """
+        period = await PeriodService.get_period(id=id, session=session)
+
+        money = PaymentSchedule.monthly_payment.type
+        amount_paid = cast(func.coalesce(PaymentSchedule.amount_paid, 0), money)
+        query = (
+            select(
+                PaymentSchedule.company_id,
+                PaymentSchedule.company_name,
+                PaymentSchedule.employee_code,
+                PaymentSchedule.employee_fullname,
+                PaymentSchedule.loan_entry_id,
+                LoanEntries.code.label("loan_code"),
+                LoanEntries.loan_name,
+                PaymentSchedule.month,
+                PaymentSchedule.due_date,
+                PaymentSchedule.monthly_payment.label("amount_due"),
+                amount_paid.label("amount_paid"),
+                cast(
+                    case(
+                        (
+                            PaymentSchedule.paid.is_not(True),
+                            PaymentSchedule.monthly_payment - amount_paid,
+                        ),
+                        else_=0,
+                    ),
+                    money,
+                ).label("outstanding"),
+                PaymentSchedule.paid,
+            )
+            .join(LoanEntries, LoanEntries.id == PaymentSchedule.loan_entry_id)
+            .where(
+                PaymentSchedule.period_id == period.id,
+                PaymentSchedule.is_deleted.is_not(True),
+                LoanEntries.is_deleted.is_not(True),
+            )
+            .order_by(
+                PaymentSchedule.company_id,
+                PaymentSchedule.employee_code,
+                PaymentSchedule.loan_entry_id,
+            )
+        )
+        if company_id:
+            query = query.where(PaymentSchedule.company_id == company_id)
+        if not include_paid:
+            query = query.where(PaymentSchedule.paid.is_not(True))
+
+        return export_response(
+            query=query,
+            schema=PeriodDeductionRead,
+            format=format,
+            filename=f"deductions_{period.period_code}",
+            scalars=False,
+        )
@@ -0,0 +1,120 @@
+import time
+from datetime import datetime, timedelta
+
+from sqlmodel import delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config.auth import decode_token
+from config.settings import REVOKED_TOKEN_REFRESH_SECONDS
+from models.user import RevokedToken
+from services.user import UserService
+
+
+class RevokedTokenFilter:
+    """In-process set of revoked token ids (``jti``), mapped to their expiry.
+
+    Loaded once at startup and then refreshed incrementally from the
+    ``revokedtoken`` table at most every ``refresh_seconds``, so checking a
+    token costs a dict lookup instead of a query.  Entries drop out once the
+    token they revoke has expired anyway.
+    """
+
+    # Re-read rows this far behind the watermark so a revocation committed by
+    # another worker shortly after our last refresh is not skipped.
+    OVERLAP = timedelta(minutes=1)
+
+    def __init__(self, refresh_seconds: int = REVOKED_TOKEN_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.revoked: dict[str, datetime | None] = {}
+        self.watermark: datetime | None = None
+        self.refreshed_at: float | None = None
+
+    def add(self, jti: str, expires_at: datetime | None = None):
+        self.revoked[jti] = expires_at
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self.revoked
+
+    def prune(self, now: datetime | None = None) -> int:
+        now = now or datetime.now()
+        expired = [
+            jti
+            for jti, expires_at in self.revoked.items()
+            if expires_at is not None and expires_at <= now
+        ]
+        for jti in expired:
+            del self.revoked[jti]
+        return len(expired)
+
+    async def load(self, session: AsyncSession):
+        self.revoked.clear()
+        self.watermark = None
+        await self.refresh(session=session, force=True)
+
+    async def refresh(self, session: AsyncSession, force: bool = False):
+        now = time.monotonic()
+        if (
+            not force
+            and self.refreshed_at is not None
+            and now - self.refreshed_at < self.refresh_seconds
+        ):
+            return
+
+        self.refreshed_at = now
+        query = select(
+            RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at
+        ).where(
+            RevokedToken.jti.is_not(None),
+            (RevokedToken.expires_at.is_(None))
+            | (RevokedToken.expires_at > datetime.now()),
+        )
+        if self.watermark is not None:
+            query = query.where(RevokedToken.revoked_at > self.watermark - self.OVERLAP)
+
+        result = await session.exec(query)
+        for jti, expires_at, revoked_at in result.all():
+            self.add(jti, expires_at)
+            if self.watermark is None or revoked_at > self.watermark:
+                self.watermark = revoked_at
+
+        self.prune()
+
+
+class TokenRevocationService:
+    @staticmethod
+    async def revoke(token: str, session: AsyncSession, revoked: RevokedTokenFilter):
+        payload = decode_token(token) or {}
+        jti = payload.get("jti")
+        expires_at = (
+            datetime.fromtimestamp(payload["exp"]) if payload.get("exp") else None
+        )
+
+        if jti:
+            revoked_token = RevokedToken(jti=jti, expires_at=expires_at)
+        else:
+            revoked_token = RevokedToken(token=token, expires_at=expires_at)
+
+        session.add(revoked_token)
+        await session.commit()
+
+        if jti:
+            revoked.add(jti, expires_at)
+        UserService.invalidate_token(token)
+
+        return revoked_token
+
+    @staticmethod
+    async def is_token_revoked(token: str, session: AsyncSession) -> bool:
+        """Fallback lookup for tokens issued before ``jti`` claims existed."""
+        result = await session.exec(
+            select(RevokedToken.id).where(RevokedToken.token == token)
+        )
+        return result.first() is not None
+
+    @staticmethod
+    async def purge_expired(session: AsyncSession) -> int:
+        result = await session.exec(
+            delete(RevokedToken).where(RevokedToken.expires_at < datetime.now())
+        )
+        await session.commit()
+        return result.rowcount
@@ -1,13 +1,20 @@
-from collections import defaultdict
-from datetime import datetime, timedelta
-from uuid import UUID
+import time
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from uuid import UUID, uuid4
 from fastapi import HTTPException, Request, status
 from ua_parser.user_agent_parser import Parse
 
-from sqlmodel import select
+from sqlmodel import insert, select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from config.auth import create_access_token, create_refresh_token, verify_token
-from models.user import User
+from config.auth import (
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    verify_token,
+)
+from models.user import User, UserActivityLog
 from schemas.user import (
     RefreshToken,
     UserCreate,
@@ -16,17 +23,39 @@ from schemas.user import (
     UserUpdate,
     Token,
 )
-from schemas.base import ResponseModel
-from utils.crypto import hash_password, verify_password
+from utils.cache import TTLCache
+from utils.crypto import (
+    PasswordHasherBusy,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
+
+from config.settings import (
+    ACTIVITY_BUFFER_SIZE,
+    AUTH_CACHE_SIZE,
+    AUTH_CACHE_TTL_SECONDS,
+    ACTIVITY_MAX_USERS,
+    ACTIVITY_TTL_SECONDS,
+    REQUESTS_PER_MINUTE,
+    USER_AGENT_CACHE_SIZE,
+)
+from utils.pagination import paginate
+from utils.rate_limit import RateLimiter, get_rate_limiter
+from utils.text_options import CountMode
+
 
-from config.settings import REQUESTS_PER_MINUTE
+# Verified token -> detached User snapshot, so authenticated requests need no
+# query.  Entries never outlive the token and are dropped when the user is
+# updated, deleted or logs out on this worker.
+authenticated_users = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL_SECONDS)
 
 
 class UserService:
     @staticmethod
     async def create_user(data: UserCreate, session: AsyncSession) -> UserRead:
         try:
-            hashed_password = hash_password(data.password)
+            hashed_password = await hash_password_async(data.password)
             fullname = User.get_fullname(data)
             username = User.get_username(data)
             pin = User.generate_pin(data)
@@ -69,22 +98,24 @@ class UserService:
 
     @staticmethod
     async def get_users(
-        session: AsyncSession, username: str = None, limit: int = 10, offset: int = 0
+        session: AsyncSession,
+        username: str = None,
+        limit: int = 10,
+        cursor: str | None = None,
+        count: CountMode | None = None,
     ):
-        query = (
-            select(User)
-            .order_by(User.username)
-            .limit(limit=limit)
-            .offset(offset=offset)
-        )
+        query = select(User)
         if username:
             query = query.where(User.username == username)
-        result = await session.exec(query)
-        users = result.unique().all()
-        users_read = [UserRead.model_validate(user) for user in users]
-        count = len(users_read)
 
-        return ResponseModel(count=count, results=users_read)
+        return await paginate(
+            session=session,
+            query=query,
+            keys=(User.username, User.id),
+            limit=limit,
+            cursor=cursor,
+            count=count,
+        )
 
     @staticmethod
     async def update_user(id: UUID, data: UserUpdate, session: AsyncSession):
@@ -96,10 +127,20 @@ class UserService:
                     status_code=status.HTTP_404_NOT_FOUND, detail="No user found"
                 )
 
-            for key, value in data.model_dump(exclude_unset=True).items():
-                if value:
+            payload = data.model_dump(exclude_unset=True)
+            if payload.get("password"):
+                payload["password"] = await hash_password_async(payload["password"])
+
+            for key, value in payload.items():
+                if value is not None:
                     setattr(user, key, value)
 
+            session.add(user)
+            await session.commit()
+            await session.refresh(user)
+
+            UserService.invalidate_user(id)
+
             return user
         except Exception as e:
             await session.rollback()
@@ -120,6 +161,8 @@ class UserService:
             await session.delete(user)
             await session.commit()
 
+            UserService.invalidate_user(id)
+
             return {}
         except Exception as e:
             await session.rollback()
@@ -146,7 +189,7 @@ class UserService:
                     detail="Invalid email or password",
                 )
 
-            valid_pass = verify_password(data.password, user.password)
+            valid_pass = await verify_password_async(data.password, user.password)
 
             if not valid_pass:
                 raise HTTPException(
@@ -154,9 +197,22 @@ class UserService:
                     detail="Invalid email or password",
                 )
 
+            if needs_rehash(user.password):
+                user.password = await hash_password_async(data.password)
+                session.add(user)
+                await session.commit()
+
             access_token = create_access_token(data={"sub": str(user.id)})
             refresh_token = create_refresh_token(data={"sub": str(user.id)})
             return Token(access_token=access_token, refresh_token=refresh_token)
+        except PasswordHasherBusy:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many login attempts in progress, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        except HTTPException:
+            raise
         except Exception as e:
             await session.rollback()
             raise HTTPException(
@@ -196,7 +252,8 @@ class UserService:
 
     @staticmethod
     async def verify_token_and_get_user(token: str, session: AsyncSession) -> User:
-        user_id = verify_token(token)
+        payload = decode_token(token)
+        user_id = payload.get("sub") if payload else None
 
         if not user_id:
             raise HTTPException(
@@ -205,36 +262,66 @@ class UserService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        user = await session.get(User, user_id)
-        if not user:
+        user = authenticated_users.get(token)
+        if user is not None:
+            return user
+
+        user = await session.get(User, UUID(user_id))
+        if not user or not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
+                detail="User not found or inactive",
             )
 
-        return user
+        snapshot = User.model_validate(user)
+        expires_in = payload["exp"] - time.time() if payload.get("exp") else None
+        authenticated_users.set(
+            token,
+            snapshot,
+            ttl=min(AUTH_CACHE_TTL_SECONDS, expires_in)
+            if expires_in is not None
+            else None,
+        )
+
+        return snapshot
+
+    @staticmethod
+    def invalidate_user(id: UUID):
+        """Drop every cached authentication for the user, on any of their tokens."""
+        authenticated_users.pop_where(lambda token, user: user.id == id)
+
+    @staticmethod
+    def invalidate_token(token: str):
+        authenticated_users.pop(token)
+
+
+@lru_cache(maxsize=USER_AGENT_CACHE_SIZE)
+def parse_device_identifier(user_agent: str) -> str:
+    ua = Parse(user_agent)
+
+    browser = ua["user_agent"]["family"]
+    os = ua["os"]["family"]
+    device = ua["device"]["family"]
+
+    return f"{browser}_{os}_{device}"
 
 
 class UserActivity:
-    def __init__(self, requests_per_minute: int = REQUESTS_PER_MINUTE):
+    def __init__(
+        self,
+        requests_per_minute: int = REQUESTS_PER_MINUTE,
+        rate_limiter: RateLimiter | None = None,
+    ):
         self.requests_per_minute = requests_per_minute
-        self.requests = defaultdict(list)
-        self.user_info = defaultdict(list)
+        self.rate_limiter = rate_limiter or get_rate_limiter(limit=requests_per_minute)
+        self.user_info = TTLCache(
+            maxsize=ACTIVITY_MAX_USERS, ttl=ACTIVITY_TTL_SECONDS
+        )
+        self.pending: deque[dict] = deque(maxlen=ACTIVITY_BUFFER_SIZE)
 
     async def is_rate_limited(self, token: str) -> bool:
         """Check if token has exceeded rate limit"""
-        now = datetime.now()
-        minutes_ago = now - timedelta(minutes=1)
-
-        self.requests[token] = [
-            req for req in self.requests[token] if req > minutes_ago
-        ]
-
-        if len(self.requests[token]) >= self.requests_per_minute:
-            return True
-
-        self.requests[token].append(now)
-        return False
+        return await self.rate_limiter.is_rate_limited(token)
 
     async def get_client_ip(self, request: Request):
         forwarded = request.headers.get("X-Forwarded-For")
@@ -245,40 +332,58 @@ class UserActivity:
         return request.client.host if request.client else "unknown"
 
     async def get_device_identifier(self, user_agent: str):
-        ua = Parse(user_agent)
-
-        browser = ua["user_agent"]["family"]
-        os = ua["os"]["family"]
-        device = ua["device"]["family"]
-
-        return f"{browser}_{os}_{device}"
+        return parse_device_identifier(user_agent)
 
     async def track_user_activity(self, user_id: str, ip: str, device: str):
         current_time = datetime.now()
+        previous = self.user_info.get(user_id)
 
         activity = {
             "ip": ip,
             "device": device,
             "last_seen": current_time,
-            "ip_changed": False,
-            "device_changed": False,
+            "ip_changed": previous is not None and previous["ip"] != ip,
+            "device_changed": previous is not None and previous["device"] != device,
             "username": user_id,
         }
+        self.user_info.set(user_id, activity)
+
+        if previous is None or activity["ip_changed"] or activity["device_changed"]:
+            self.pending.append(activity)
+
+        return activity
+
+    async def flush(self, session: AsyncSession) -> int:
+        """Write buffered activity records to ``user_activity_logs`` in one INSERT.
+
+        The records go back in front of the buffer if the write fails, so the
+        next flush retries them.
+        """
+        if not self.pending:
+            return 0
+
+        batch = self.pending
+        self.pending = deque(maxlen=batch.maxlen)
+        rows = [
+            {
+                "id": uuid4(),
+                "username": activity["username"],
+                "ip": activity["ip"],
+                "device": activity["device"],
+                "ip_changed": activity["ip_changed"],
+                "device_changed": activity["device_changed"],
+                "seen_at": activity["last_seen"],
+            }
+            for activity in batch
+        ]
 
-        if user_id not in self.user_info:
-            self.user_info[user_id] = [activity]
-            return True
-
-        user_data = self.user_info[user_id]
-
-        ip_changed = user_data[-1]["ip"] != ip
-        device_changed = user_data[-1]["device"] != device
-
-        user_data[-1]["ip_changed"] = ip_changed
-        user_data[-1]["ip"] = ip
-        user_data[-1]["device_changed"] = device_changed
-        user_data[-1]["last_seen"] = current_time
-        user_data[-1]["device"] = device
-        user_data[-1]["username"] = user_id
+        try:
+            await session.exec(insert(UserActivityLog).values(rows))
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            # Records tracked meanwhile are newer; a full buffer drops the oldest.
+            self.pending = deque([*batch, *self.pending], maxlen=batch.maxlen)
+            raise
 
-        return user_data
+        return len(rows)
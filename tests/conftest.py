@@ -0,0 +1,173 @@
+import os
+from datetime import date
+from decimal import Decimal
+
+# config.settings reads these at import time; the tests bring their own
+# databases, so any value will do.
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config.db import get_session
+from config.dependencies import get_current_user
+from main import app
+from models import Company, Employee, Loan, Period, PeriodYear, User
+from schemas.loan import LoanEntriesCreate
+from services.loan import LoanEntriesService
+
+# Tests that need Postgres (row locks, EXPLAIN plans) run only when this
+# points at a database they may freely drop and recreate tables in.
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+
+async def create_schema(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    await create_schema(engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def postgres_engine():
+    if not POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    engine = create_async_engine(POSTGRES_URL)
+    await create_schema(engine)
+    yield engine
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+    await engine.dispose()
+
+
+async def create_references(engine) -> dict:
+    """A company, user, employee, loan product and January period."""
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        company = Company(name="Acme")
+        user = User(
+            username="admin",
+            email="admin@example.com",
+            firstname="Ada",
+            lastname="Admin",
+            password="x",
+            is_active=1,
+            is_super=1,
+            is_verified="0",
+            is_password_changed=False,
+            is_password_reset=False,
+        )
+        session.add_all([company, user])
+        await session.flush()
+
+        employee = Employee(
+            code="E1",
+            firstname="Eve",
+            lastname="Employee",
+            fullname="Employee Eve",
+            company_id=company.id,
+            company_name=company.name,
+        )
+        loan = Loan(code="CAR", name="Car loan")
+        period_year = PeriodYear(id=1, year=2026, user_id=user.id)
+        session.add_all([employee, loan, period_year])
+        await session.flush()
+
+        period = Period(
+            month=1,
+            year=2026,
+            period_code="JAN26",
+            period_name="January 2026",
+            start_date=date(2026, 1, 1),
+            end_date=date(2026, 1, 31),
+            no_of_days=31,
+            total_working_days=22,
+            total_working_hours=176,
+            total_hours_per_day=8,
+            period_year_id=period_year.id,
+            month_calender=[],
+        )
+        session.add(period)
+        await session.commit()
+
+        return dict(
+            company=company, user=user, employee=employee, loan=loan, period=period
+        )
+
+
+async def create_loan_entry(engine, references: dict, amount, duration: int):
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        return await LoanEntriesService.create_loan_entry(
+            data=LoanEntriesCreate(
+                loan_id=references["loan"].id,
+                employee_id=references["employee"].id,
+                amount=Decimal(amount),
+                duration=Decimal(duration),
+                deduction_start_period_id=references["period"].id,
+            ),
+            session=session,
+            current_user=references["user"],
+        )
+
+
+class StatementRecorder:
+    """Collects the ``(sql, parameters)`` sent through ``engine`` while entered."""
+
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.statements = []
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self.record)
+        return self.statements
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self.record)
+
+    def record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+
+@pytest.fixture
+def record_statements():
+    """``with record_statements(engine) as statements:`` lists the SQL run."""
+    return StatementRecorder
+
+
+async def copy_rows(conn, table, rows, count, change):
+    """Insert ``count`` copies of ``rows``, each passed through ``change(row, i)``."""
+    copies = [change(dict(row), i) for i in range(count) for row in rows]
+    for start in range(0, len(copies), 5000):
+        await conn.execute(insert(table), copies[start : start + 5000])
+
+
+@pytest.fixture
+async def references(engine):
+    return await create_references(engine)
+
+
+@pytest.fixture
+async def client(engine, references):
+    """An HTTP client for the app on ``engine``, signed in as the reference user."""
+
+    async def session():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = session
+    app.dependency_overrides[get_current_user] = lambda: references["user"]
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
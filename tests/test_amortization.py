@@ -0,0 +1,154 @@
+from decimal import Decimal
+
+import pytest
+
+from utils.amortization import (
+    ANNUITY_METHODS,
+    RATE_SCALE,
+    _annuity,
+    _annuity_closed_form,
+    amortize,
+    amortize_many,
+)
+from utils.money import to_cents
+from utils.text_options import InterestCalculationType, InterestTerm
+
+LOANS = [
+    # (principal, periods, rate)
+    (Decimal("1200"), 12, Decimal("12")),
+    (Decimal("1000"), 7, Decimal("9.99")),
+    (Decimal("250000"), 360, Decimal("12.5")),
+    (Decimal("0.05"), 12, Decimal("30")),
+    (Decimal("5000"), 1, Decimal("18")),
+    # Rounding the payment to the cent compounds enough over these terms to
+    # pay the loan off early or leave a balloon.
+    (Decimal("2210.22"), 481, Decimal("10.62")),
+    (Decimal("232.15"), 250, Decimal("24.04")),
+    (Decimal("170.90"), 289, Decimal("13.07")),
+]
+
+CALCULATION_TYPES = [*InterestCalculationType, None]
+
+
+@pytest.mark.parametrize("interest_term", list(InterestTerm))
+@pytest.mark.parametrize("calculation_type", CALCULATION_TYPES)
+@pytest.mark.parametrize("principal, periods, rate", LOANS)
+def test_schedule_repays_principal_exactly(
+    principal, periods, rate, calculation_type, interest_term
+):
+    schedule = amortize(
+        principal=principal,
+        periods=periods,
+        rate=rate,
+        calculation_type=calculation_type,
+        interest_term=interest_term,
+    )
+
+    assert schedule.periods == periods
+    assert schedule.balance[-1] == 0
+    assert sum(schedule.principal) == to_cents(principal)
+    assert schedule.total_payment == to_cents(principal) + schedule.total_interest
+    assert min(schedule.principal) >= 0
+    assert min(schedule.interest) >= 0
+    assert schedule.balance_bf[1:] == schedule.balance[:-1]
+
+
+@pytest.mark.parametrize("interest_term", list(InterestTerm))
+@pytest.mark.parametrize("calculation_type", sorted(ANNUITY_METHODS))
+@pytest.mark.parametrize("principal, periods, rate", LOANS)
+def test_annuity_payments_are_level(
+    principal, periods, rate, calculation_type, interest_term
+):
+    schedule = amortize(
+        principal=principal,
+        periods=periods,
+        rate=rate,
+        calculation_type=calculation_type,
+        interest_term=interest_term,
+    )
+
+    level = schedule.payment[0]
+    assert set(schedule.payment[:-1]) <= {level}
+    # Only the final installment settles the rounding, and never by more
+    # than another installment.
+    assert 0 < schedule.payment[-1] <= 2 * level
+
+
+def test_annuity_payment_matches_formula():
+    schedule = amortize(
+        principal=Decimal("10000"),
+        periods=12,
+        rate=Decimal("12"),
+        calculation_type=InterestCalculationType.AMORTIZATION,
+        interest_term=InterestTerm.PER_ANNUM,
+    )
+
+    # 10,000 at 1% a month over a year: 888.49 a month.
+    assert schedule.payment[:-1] == (88849,) * 11
+    assert schedule.interest[0] == 10000
+
+
+def test_zero_rate_annuity_repays_principal_only():
+    schedule = amortize(
+        principal=Decimal("100"),
+        periods=3,
+        rate=Decimal("0"),
+        calculation_type=InterestCalculationType.AMORTIZATION,
+    )
+
+    assert schedule.principal == (3333, 3333, 3334)
+    assert schedule.total_interest == 0
+
+
+@pytest.mark.parametrize("calculation_type", list(InterestCalculationType))
+def test_negative_rate_is_rejected(calculation_type):
+    with pytest.raises(ValueError, match="cannot be negative"):
+        amortize(
+            principal=Decimal("1000"),
+            periods=12,
+            rate=Decimal("-200"),
+            calculation_type=calculation_type,
+            interest_term=InterestTerm.PER_MONTH,
+        )
+
+
+@pytest.mark.parametrize("split", [_annuity, _annuity_closed_form])
+def test_annuity_without_growth_repays_principal_only(split):
+    # A -200% monthly rate over an even term: (1 + r) ** n == 1, no span.
+    parts, interest = split(100000, 12, -2 * RATE_SCALE, RATE_SCALE)
+
+    assert sum(parts) == 100000
+    assert interest == [0] * 12
+
+
+def test_installment_fixes_the_period_count():
+    schedule = amortize(
+        principal=Decimal("1000"),
+        periods=1,
+        calculation_type=InterestCalculationType.REDUCING,
+        rate=Decimal("12"),
+        installment=Decimal("300"),
+    )
+
+    assert schedule.principal == (30000, 30000, 30000, 10000)
+    assert schedule.balance[-1] == 0
+
+
+def test_empty_loan_has_no_schedule():
+    assert amortize(principal=Decimal("0"), periods=12).periods == 0
+    assert amortize(principal=Decimal("100"), periods=0).periods == 0
+
+
+def test_amortize_many_matches_amortize():
+    loans = [
+        dict(
+            principal=principal,
+            periods=periods,
+            rate=rate,
+            calculation_type=calculation_type,
+        )
+        for principal, periods, rate in LOANS
+        for calculation_type in InterestCalculationType
+    ]
+
+    assert amortize_many(loans) == [amortize(**loan) for loan in loans]
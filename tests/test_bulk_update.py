@@ -0,0 +1,64 @@
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models.payment_schedule import PaymentSchedule
+from utils.helper import MAX_BIND_PARAMS, bulk_update
+
+from conftest import copy_rows, create_loan_entry, create_references
+
+COLUMNS = ("amount_paid", "paid", "difference", "interest", "balance")
+
+
+async def update_past_the_parameter_limit(engine):
+    references = await create_references(engine)
+    loan_entry = await create_loan_entry(engine, references, amount=1200, duration=12)
+
+    schedules = PaymentSchedule.__table__
+    async with engine.begin() as conn:
+        rows = (
+            await conn.execute(
+                select(schedules).where(schedules.c.loan_entry_id == loan_entry.id)
+            )
+        ).mappings().all()
+        await copy_rows(
+            conn, schedules, rows, 500, lambda row, i: row | dict(id=uuid4())
+        )
+        ids = (await conn.execute(select(schedules.c.id))).scalars().all()
+
+    # More rows than one statement's worth of parameters can carry.
+    assert len(ids) * (len(COLUMNS) + 1) > MAX_BIND_PARAMS
+    updates = [
+        {
+            "id": id,
+            "amount_paid": Decimal(i % 100),
+            "paid": True,
+            "difference": Decimal(-(i % 7)),
+            "interest": Decimal("1.25"),
+            "balance": Decimal(i % 1000),
+        }
+        for i, id in enumerate(ids)
+    ]
+
+    async with AsyncSession(engine) as session:
+        assert await bulk_update(PaymentSchedule, updates, session) == len(updates)
+        await session.commit()
+
+    async with engine.connect() as conn:
+        stored = {
+            row.id: dict(row._mapping)
+            for row in await conn.execute(
+                select(schedules.c.id, *(schedules.c[key] for key in COLUMNS))
+            )
+        }
+    assert stored == {row["id"]: row for row in updates}
+
+
+async def test_bulk_update_splits_rows_past_the_parameter_limit(postgres_engine):
+    await update_past_the_parameter_limit(postgres_engine)
+
+
+async def test_bulk_update_many_rows_on_sqlite(engine):
+    await update_past_the_parameter_limit(engine)
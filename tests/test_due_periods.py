@@ -0,0 +1,84 @@
+from datetime import date
+
+from sqlalchemy import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import Period
+from models.payment_schedule import PaymentSchedule
+from utils.helper import backfill_due_periods
+
+from conftest import create_loan_entry
+
+
+async def add_period(engine, references, code, start_date, end_date) -> Period:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        period = Period(
+            month=end_date.month,
+            year=end_date.year,
+            period_code=code,
+            period_name=code,
+            start_date=start_date,
+            end_date=end_date,
+            no_of_days=(end_date - start_date).days + 1,
+            total_working_days=22,
+            total_working_hours=176,
+            total_hours_per_day=8,
+            period_year_id=references["period"].period_year_id,
+            month_calender=[],
+        )
+        session.add(period)
+        await session.commit()
+        return period
+
+
+async def placed(engine, loan_entry) -> dict[date, object]:
+    schedules = PaymentSchedule.__table__
+    async with engine.connect() as conn:
+        rows = await conn.execute(
+            select(schedules.c.due_date, schedules.c.period_id)
+            .where(schedules.c.loan_entry_id == loan_entry.id)
+            .order_by(schedules.c.due_date)
+        )
+        return dict(rows.all())
+
+
+async def test_new_and_backfilled_installments_land_in_the_same_period(
+    engine, references
+):
+    # Payroll periods running from the 26th, next to the calendar January.
+    february = await add_period(
+        engine, references, "PAYFEB26", date(2026, 1, 26), date(2026, 2, 25)
+    )
+    march = await add_period(
+        engine, references, "PAYMAR26", date(2026, 2, 26), date(2026, 3, 25)
+    )
+    expected = {
+        date(2026, 1, 1): references["period"].id,
+        date(2026, 2, 1): february.id,
+        date(2026, 3, 1): march.id,
+    }
+
+    # Installments fall due on the 1st from the January period on.
+    loan_entry = await create_loan_entry(engine, references, amount=300, duration=3)
+    assert await placed(engine, loan_entry) == expected
+
+    async with AsyncSession(engine) as session:
+        await session.exec(
+            update(PaymentSchedule)
+            .where(PaymentSchedule.loan_entry_id == loan_entry.id)
+            .values(period_id=None)
+        )
+        assert await backfill_due_periods(
+            date(2026, 1, 1), date(2026, 12, 31), session
+        ) == 3
+        await session.commit()
+    assert await placed(engine, loan_entry) == expected
+
+
+async def test_installments_without_a_period_wait_for_one(engine, references):
+    loan_entry = await create_loan_entry(engine, references, amount=300, duration=3)
+    assert list((await placed(engine, loan_entry)).values()) == [
+        references["period"].id,
+        None,
+        None,
+    ]
@@ -0,0 +1,39 @@
+import pytest
+
+PREVIEW = "/v1/loan_entries/preview"
+
+
+def preview(**changes) -> dict:
+    return {
+        "amount": "1200",
+        "duration": "12",
+        "interest_rate": "10",
+        "calculation_type": "Amortization",
+        "interest_term": "Per Month",
+    } | changes
+
+
+async def test_preview_builds_the_schedule(client):
+    response = await client.post(PREVIEW, json=preview())
+
+    assert response.status_code == 200, response.text
+    assert len(response.json()["schedules"]) == 12
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"interest_rate": "-200"},
+        {"interest_rate": "-0.01"},
+        {"interest_rate": "1000"},
+        {"amount": "0"},
+        {"duration": "0"},
+        {"duration": "601"},
+        {"monthly_repayment": "-1"},
+    ],
+    ids=lambda changes: "-".join(f"{k}={v}" for k, v in changes.items()),
+)
+async def test_preview_rejects_out_of_range_inputs(client, changes):
+    response = await client.post(PREVIEW, json=preview(**changes))
+
+    assert response.status_code == 422, response.text
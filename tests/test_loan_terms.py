@@ -0,0 +1,62 @@
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models.payment_schedule import PaymentSchedule
+from utils.helper import resolve_term, whole_periods
+
+from conftest import create_loan_entry
+
+
+@pytest.mark.parametrize(
+    "duration, periods",
+    [
+        (Decimal("2"), 2),
+        (Decimal("2.00"), 2),
+        (Decimal("2.004"), 3),
+        (Decimal("2.5"), 3),
+        ("11.0001", 12),
+        (12, 12),
+    ],
+)
+def test_whole_periods_rounds_any_fraction_up(duration, periods):
+    assert whole_periods(duration) == periods
+
+
+def test_term_from_duration():
+    assert resolve_term(amount=Decimal("1000"), duration=Decimal("2.004")) == (
+        3,
+        None,
+        Decimal("2.004"),
+    )
+
+
+def test_term_from_monthly_repayment():
+    assert resolve_term(
+        amount=Decimal("1000"), monthly_repayment=Decimal("300")
+    ) == (4, Decimal("300"), Decimal("3.33"))
+
+
+def test_term_longer_than_the_maximum_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        resolve_term(amount=Decimal("1000"), duration=Decimal("600.001"))
+    assert error.value.status_code == 422
+
+
+async def test_fractional_duration_gets_a_schedule_row_per_started_month(
+    engine, references
+):
+    loan_entry = await create_loan_entry(
+        engine, references, amount=1000, duration=Decimal("2.004")
+    )
+
+    async with AsyncSession(engine) as session:
+        rows = await session.exec(
+            select(func.count()).where(
+                PaymentSchedule.loan_entry_id == loan_entry.id
+            )
+        )
+        assert rows.one() == 3
@@ -0,0 +1,159 @@
+import json
+from decimal import Decimal
+
+import pytest
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models.loan import LoanEntries
+from models.payment_schedule import Payment, PaymentSchedule
+from schemas.base import ResponseModel
+from schemas.loan import LoanEntriesRead
+from schemas.payment import PaymentCreate, PaymentRead
+from schemas.payment_schedule import PaymentScheduleRead
+from services.payment import PaymentService
+from utils.pagination import item_response, page_response, paginate, projection
+from utils.text_options import PaymentType
+
+from conftest import create_loan_entry
+
+
+@pytest.fixture
+async def loan_entries(engine, references):
+    """Three loan entries of 12 installments, the first with two payments."""
+    entries = [
+        await create_loan_entry(engine, references, amount=1200 * n, duration=12)
+        for n in (1, 2, 3)
+    ]
+    for amount in ("150", "75.50"):
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            await PaymentService.create_payment(
+                data=PaymentCreate(
+                    loan_entry_id=entries[0].id,
+                    amount_paid=Decimal(amount),
+                    payment_type=PaymentType.Custom,
+                ),
+                session=session,
+                current_user=references["user"],
+            )
+    return entries
+
+
+def body(response) -> dict:
+    return json.loads(response.body)
+
+
+LISTS = pytest.mark.parametrize(
+    "model, schema, keys",
+    [
+        (LoanEntries, LoanEntriesRead, ("created_at", "id")),
+        (Payment, PaymentRead, ("created_at", "id")),
+        (PaymentSchedule, PaymentScheduleRead, ("month", "id")),
+    ],
+)
+
+
+@LISTS
+async def test_page_json_is_the_typed_envelope(
+    engine, loan_entries, model, schema, keys
+):
+    keys = [getattr(model, key) for key in keys]
+    async with AsyncSession(engine) as session:
+        page = await paginate(session=session, query=select(model), keys=keys, limit=5)
+
+    validated = ResponseModel[schema](
+        count=page.count,
+        next=page.next,
+        previous=page.previous,
+        results=[schema.model_validate(row) for row in page.results],
+    )
+    assert body(page_response(page, schema)) == validated.model_dump(mode="json")
+
+
+async def test_item_json_is_the_read_schema(engine, loan_entries):
+    async with AsyncSession(engine) as session:
+        entry = await session.get(LoanEntries, loan_entries[0].id)
+
+    expected = LoanEntriesRead.model_validate(entry).model_dump(mode="json")
+    assert body(item_response(entry, LoanEntriesRead)) == expected
+    assert body(item_response(entry, LoanEntriesRead, fields=["id", "amount"])) == {
+        "id": expected["id"],
+        "amount": expected["amount"],
+    }
+
+
+async def every_page(engine, query, keys, schema) -> list[dict]:
+    pages, cursor = [], None
+    async with AsyncSession(engine) as session:
+        while True:
+            page = await paginate(
+                session=session, query=query, keys=keys, limit=5, cursor=cursor
+            )
+            pages.append(body(page_response(page, schema)))
+            if not (cursor := page.next):
+                return pages
+
+
+@LISTS
+async def test_projected_pages_match_entity_pages(
+    engine, loan_entries, model, schema, keys
+):
+    keys = [getattr(model, key) for key in keys]
+    entities = await every_page(engine, select(model), keys, schema)
+    projected = await every_page(
+        engine, select(*projection(model, schema, keys=keys)), keys, schema
+    )
+
+    assert projected == entities
+    assert sum(len(page["results"]) for page in entities) == len(
+        {row["id"] for page in entities for row in page["results"]}
+    )
+
+
+@pytest.mark.parametrize(
+    "url", ["/v1/loan_entries/", "/v1/payment/", "/v1/payment/schedules"]
+)
+async def test_unknown_fields_are_rejected(client, loan_entries, url):
+    response = await client.get(url, params={"fields": "id,bogus,nope"})
+    assert response.status_code == 422, response.text
+    assert response.json()["detail"] == "Unknown fields: bogus, nope"
+
+    response = await client.get(url, params={"fields": " , "})
+    assert response.status_code == 422, response.text
+
+
+async def test_cursors_work_without_the_sort_keys_in_fields(client, loan_entries):
+    params = {
+        "loan_entry_id": str(loan_entries[0].id),
+        "fields": "month,amount_paid",
+        "limit": 5,
+    }
+    pages = [(await client.get("/v1/payment/schedules", params=params)).json()]
+    while pages[-1]["next"]:
+        pages.append((await client.get(pages[-1]["next"])).json())
+
+    rows = [row for page in pages for row in page["results"]]
+    assert [row["month"] for row in rows] == list(range(1, 13))
+    assert all(row.keys() == {"month", "amount_paid"} for row in rows)
+
+    back = (await client.get(pages[-1]["previous"])).json()
+    assert back["results"] == pages[-2]["results"]
+
+
+async def test_item_fields(client, loan_entries):
+    page = (
+        await client.get(
+            "/v1/payment/schedules",
+            params={"loan_entry_id": str(loan_entries[0].id), "fields": "id"},
+        )
+    ).json()
+    id = page["results"][0]["id"]
+
+    response = await client.get(
+        f"/v1/payment/schedules/{id}", params={"fields": "month,id"}
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {"id": id, "month": 1}
+
+    response = await client.get(f"/v1/payment/schedules/{id}", params={"fields": "x"})
+    assert response.status_code == 422, response.text
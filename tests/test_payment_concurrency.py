@@ -0,0 +1,123 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import utils.retry
+from models.loan import LoanEntries
+from models.payment_schedule import Payment, PaymentSchedule
+from schemas.payment import PaymentCreate
+from services.payment import PaymentService
+from utils.text_options import PaymentType
+
+from conftest import create_loan_entry, create_references
+
+PAYMENTS = 300
+AMOUNT = Decimal("150.00")
+# 480 installments of 125: room for every payment, Default ones included.
+PRINCIPAL = Decimal("60000")
+DURATION = 480
+
+
+@pytest.fixture
+def retries(monkeypatch):
+    """Count the conflicts ``retry_on_conflict`` decided to retry."""
+    seen = []
+    is_retryable = utils.retry.is_retryable
+
+    def counting(error):
+        retryable = is_retryable(error)
+        seen.append(retryable)
+        return retryable
+
+    monkeypatch.setattr(utils.retry, "is_retryable", counting)
+    return seen
+
+
+async def pay(engine, references, loan_entry, payment_type):
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        try:
+            payment = await PaymentService.create_payment(
+                data=PaymentCreate(
+                    loan_entry_id=loan_entry.id,
+                    amount_paid=AMOUNT,
+                    payment_type=payment_type,
+                ),
+                session=session,
+                current_user=references["user"],
+            )
+        except HTTPException as e:
+            # Out of retries: the payment must not have been posted at all.
+            assert e.status_code == 409
+            return None
+        return payment.id
+
+
+@pytest.mark.parametrize("isolation_level", ["READ COMMITTED", "REPEATABLE READ"])
+@pytest.mark.parametrize("payment_type", [PaymentType.Custom, PaymentType.Default])
+async def test_concurrent_payments_allocate_each_amount_once(
+    postgres_engine, retries, isolation_level, payment_type
+):
+    """Payments racing for one loan entry never lose or double an allocation.
+
+    Under READ COMMITTED they queue on the loan entry's row lock; under
+    REPEATABLE READ the losers fail with 40001 and are run again.
+    """
+    engine = postgres_engine.execution_options(isolation_level=isolation_level)
+    references = await create_references(engine)
+    loan_entry = await create_loan_entry(
+        engine, references, amount=PRINCIPAL, duration=DURATION
+    )
+
+    posted = await asyncio.gather(
+        *(
+            pay(engine, references, loan_entry, payment_type)
+            for _ in range(PAYMENTS)
+        )
+    )
+    posted = [id for id in posted if id is not None]
+
+    async with AsyncSession(engine) as session:
+        entry = await session.get(LoanEntries, loan_entry.id)
+        payments = (
+            await session.exec(
+                select(Payment).where(Payment.loan_entry_id == loan_entry.id)
+            )
+        ).all()
+        schedules = (
+            await session.exec(
+                select(PaymentSchedule)
+                .where(PaymentSchedule.loan_entry_id == loan_entry.id)
+                .order_by(PaymentSchedule.month)
+            )
+        ).all()
+
+    assert sorted(payment.id for payment in payments) == sorted(posted)
+
+    # Every posted payment is counted once, and only once, against the loan.
+    allocated = sum(schedule.amount_paid or 0 for schedule in schedules)
+    assert entry.total_amount_paid == allocated == AMOUNT * len(posted)
+    assert entry.remaining_balance == PRINCIPAL - allocated
+
+    if payment_type == PaymentType.Custom:
+        # Allocation fills installments in order, none beyond what it owes.
+        for schedule in schedules:
+            assert (schedule.amount_paid or 0) <= schedule.monthly_payment
+        settled = [schedule.paid for schedule in schedules]
+        assert settled == sorted(settled, reverse=True)
+    else:
+        # A Default payment settles exactly one installment each, in order.
+        settled = [schedule for schedule in schedules if schedule.paid]
+        assert [schedule.month for schedule in settled] == list(
+            range(1, len(posted) + 1)
+        )
+        assert {schedule.amount_paid for schedule in settled} <= {AMOUNT}
+
+    if isolation_level == "REPEATABLE READ":
+        assert any(retries), "no serialization failure was retried"
+        assert posted
+    else:
+        assert len(posted) == PAYMENTS
@@ -0,0 +1,48 @@
+from decimal import Decimal
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from schemas.payment import PaymentCreate
+from services.payment import PaymentService
+from utils.text_options import PaymentType
+
+from conftest import create_loan_entry
+
+
+async def pay(engine, references, loan_entry, amount, record_statements):
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        with record_statements(engine) as statements:
+            await PaymentService.create_payment(
+                data=PaymentCreate(
+                    loan_entry_id=loan_entry.id,
+                    amount_paid=Decimal(amount),
+                    payment_type=PaymentType.Custom,
+                ),
+                session=session,
+                current_user=references["user"],
+            )
+    return [statement for statement, _ in statements]
+
+
+@pytest.mark.parametrize("duration", [3, 12, 120])
+async def test_custom_payment_statement_count_is_constant(
+    engine, references, record_statements, duration
+):
+    """However many installments one payment settles, it is the same queries:
+
+    lock the loan entry, read its schedules, update the settled schedules in
+    one statement, update the loan entry, insert the payment and re-read it.
+    """
+    loan_entry = await create_loan_entry(
+        engine, references, amount=100 * duration, duration=duration
+    )
+
+    # Settles every installment but the last, plus part of the last.
+    statements = await pay(
+        engine, references, loan_entry, 100 * duration - 50, record_statements
+    )
+
+    assert len(statements) == 6, statements
+    updates = [s for s in statements if s.startswith("UPDATE payment_schedules")]
+    assert len(updates) == 1
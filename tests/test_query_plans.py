@@ -0,0 +1,198 @@
+import json
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import Employee, Loan
+from models.loan import LoanEntries
+from models.payment_schedule import Payment, PaymentSchedule
+from schemas.payment import PaymentCreate
+from services.loan import LoanEntriesService
+from services.payment import PaymentService
+from services.payment_schedule import PaymentScheduleService
+from utils.text_options import PaymentType
+
+from conftest import copy_rows, create_loan_entry, create_references
+
+# Other employees' loans, so the lookups below pick a few rows out of many.
+ENTRIES = 2000
+
+
+@pytest.fixture
+async def seeded(postgres_engine):
+    """One loan entry with its schedules and a payment, among ``ENTRIES``
+    entries of another employee on another loan product."""
+    engine = postgres_engine
+    references = await create_references(engine)
+    loan_entry = await create_loan_entry(engine, references, amount=1200, duration=12)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await PaymentService.create_payment(
+            data=PaymentCreate(
+                loan_entry_id=loan_entry.id,
+                amount_paid=100,
+                payment_type=PaymentType.Default,
+            ),
+            session=session,
+            current_user=references["user"],
+        )
+
+        loan = Loan(code="HOME", name="Home loan")
+        employee = Employee(
+            code="E2",
+            firstname="Olu",
+            lastname="Other",
+            fullname="Other Olu",
+            company_id=references["company"].id,
+            company_name=references["company"].name,
+        )
+        session.add_all([loan, employee])
+        await session.commit()
+
+    entries = LoanEntries.__table__
+    schedules = PaymentSchedule.__table__
+    payments = Payment.__table__
+    ids = [uuid4() for _ in range(ENTRIES)]
+
+    def other_entry(row, i):
+        return row | dict(
+            id=ids[i],
+            code=f"L{i}",
+            loan_id=loan.id,
+            employee_id=employee.id,
+            employee_code=f"C{i}",
+            created_at=row["created_at"] - timedelta(minutes=i + 1),
+        )
+
+    def child_of_other_entry(row, i):
+        return row | dict(id=uuid4(), loan_entry_id=ids[i])
+
+    async with engine.begin() as conn:
+        for table, parent, change in (
+            (entries, entries.c.id, other_entry),
+            (schedules, schedules.c.loan_entry_id, child_of_other_entry),
+            (payments, payments.c.loan_entry_id, child_of_other_entry),
+        ):
+            rows = (
+                await conn.execute(select(table).where(parent == loan_entry.id))
+            ).mappings().all()
+            await copy_rows(conn, table, rows, ENTRIES, change)
+
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+
+    return references, loan_entry
+
+
+async def plans(engine, record_statements, call):
+    """The EXPLAIN plans of the SELECTs ``call(session)`` runs."""
+    async with AsyncSession(engine) as session:
+        with record_statements(engine) as statements:
+            await call(session)
+        result = []
+        conn = await session.connection()
+        for statement, parameters in statements:
+            if not statement.lstrip().upper().startswith("SELECT"):
+                continue
+            explained = await conn.exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + statement, parameters
+            )
+            plan = explained.scalar_one()
+            result.append(json.loads(plan) if isinstance(plan, str) else plan)
+    return result
+
+
+def nodes(plan):
+    if isinstance(plan, list):
+        for item in plan:
+            yield from nodes(item)
+    elif isinstance(plan, dict):
+        if "Node Type" in plan:
+            yield plan
+        for value in plan.values():
+            if isinstance(value, (list, dict)):
+                yield from nodes(value)
+
+
+def assert_uses(found, table, index):
+    scans = [node for plan in found for node in nodes(plan)]
+    assert scans, "no SELECT was run"
+    assert not [
+        node
+        for node in scans
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") == table
+    ], json.dumps(found, indent=1)
+    assert index in {node.get("Index Name") for node in scans}, json.dumps(
+        found, indent=1
+    )
+
+
+async def test_schedules_of_a_loan_entry_use_their_index(
+    seeded, postgres_engine, record_statements
+):
+    _, loan_entry = seeded
+    found = await plans(
+        postgres_engine,
+        record_statements,
+        lambda session: PaymentScheduleService.get_schedules(
+            session=session, loan_entry_id=loan_entry.id, limit=12
+        ),
+    )
+    assert_uses(found, "payment_schedules", "ix_payment_schedules_loan_entry_id_month")
+
+
+async def test_payments_of_a_loan_entry_use_their_index(
+    seeded, postgres_engine, record_statements
+):
+    _, loan_entry = seeded
+    # The same lookup delete_payment_by_loan_entry_id runs.
+    found = await plans(
+        postgres_engine,
+        record_statements,
+        lambda session: session.exec(
+            select(Payment).where(
+                Payment.loan_entry_id == loan_entry.id,
+                Payment.is_deleted.is_not(True),
+            )
+        ),
+    )
+    assert_uses(found, "payments", "ix_payments_loan_entry_id")
+
+
+@pytest.mark.parametrize(
+    "filter, index",
+    [
+        (lambda refs: {"employee_code": "E1"}, "ix_loan_entries_employee_code"),
+        (lambda refs: {"employee_id": refs["employee"].id}, "ix_loan_entries_employee_id"),
+        (lambda refs: {"loan_id": refs["loan"].id}, "ix_loan_entries_loan_id"),
+        (lambda refs: {}, "ix_loan_entries_created_at_id"),
+    ],
+    ids=["employee_code", "employee_id", "loan_id", "unfiltered"],
+)
+async def test_loan_entry_listings_use_their_index(
+    seeded, postgres_engine, record_statements, filter, index
+):
+    references, _ = seeded
+    found = await plans(
+        postgres_engine,
+        record_statements,
+        lambda session: LoanEntriesService.get_loan_entries(
+            session=session, **filter(references)
+        ),
+    )
+    assert_uses(found, "loan_entries", index)
+
+
+async def test_payment_listing_pages_by_its_index(
+    seeded, postgres_engine, record_statements
+):
+    async def two_pages(session):
+        page = await PaymentService.get_payments(session=session, limit=10)
+        await PaymentService.get_payments(session=session, limit=10, cursor=page.next)
+
+    found = await plans(postgres_engine, record_statements, two_pages)
+    assert len(found) == 2
+    assert_uses(found, "payments", "ix_payments_created_at_id")
@@ -0,0 +1,145 @@
+import pytest
+
+import utils.rate_limit
+from utils.rate_limit import RedisRateLimiter, get_rate_limiter
+
+LIMIT = 10
+WINDOW = 60
+
+
+class Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+class FakePipeline:
+    def __init__(self, redis, transaction: bool):
+        self.redis = redis
+        self.transaction = transaction
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def get(self, key):
+        self.commands.append(lambda: self.redis.values.get(key))
+
+    def incr(self, key):
+        def incr():
+            self.redis.values[key] = self.redis.values.get(key, 0) + 1
+            return self.redis.values[key]
+
+        self.commands.append(incr)
+
+    def expire(self, key, seconds):
+        def expire():
+            self.redis.ttls[key] = seconds
+            return key in self.redis.values
+
+        self.commands.append(expire)
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        return [command() for command in self.commands]
+
+
+class FakeRedis:
+    """The slice of redis.asyncio.Redis the limiter uses: one pipeline of
+    GET, INCR and EXPIRE per check."""
+
+    def __init__(self):
+        self.values: dict[str, int] = {}
+        self.ttls: dict[str, int] = {}
+        self.round_trips = 0
+        self.transactions = []
+
+    def pipeline(self, transaction: bool = True):
+        self.transactions.append(transaction)
+        return FakePipeline(self, transaction)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(now=100 * WINDOW)
+    monkeypatch.setattr(utils.rate_limit, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def redis():
+    return FakeRedis()
+
+
+def limiter(redis) -> RedisRateLimiter:
+    return RedisRateLimiter(limit=LIMIT, window=WINDOW, client=redis)
+
+
+async def checks(limiter, key, count) -> list[bool]:
+    return [await limiter.is_rate_limited(key) for _ in range(count)]
+
+
+async def test_limits_after_limit_requests_in_a_window(clock, redis):
+    results = await checks(limiter(redis), "token", LIMIT + 2)
+
+    assert results == [False] * LIMIT + [True, True]
+
+
+async def test_each_check_is_one_transactional_round_trip(clock, redis):
+    await checks(limiter(redis), "token", 3)
+
+    assert redis.round_trips == 3
+    assert redis.transactions == [True] * 3
+
+
+async def test_keys_are_hashed_and_expire_after_two_windows(clock, redis):
+    await limiter(redis).is_rate_limited("secret-token")
+
+    (key,) = redis.values
+    assert "secret-token" not in key
+    assert key.startswith("ratelimit:")
+    assert redis.ttls == {key: 2 * WINDOW}
+
+
+async def test_workers_sharing_redis_share_the_count(clock, redis):
+    first, second = limiter(redis), limiter(redis)
+
+    await checks(first, "token", LIMIT)
+
+    assert await second.is_rate_limited("token")
+
+
+async def test_keys_are_counted_separately(clock, redis):
+    await checks(limiter(redis), "one", LIMIT)
+
+    assert not await limiter(redis).is_rate_limited("two")
+
+
+async def test_previous_window_weighs_by_its_overlap(clock, redis):
+    rate_limiter = limiter(redis)
+    await checks(rate_limiter, "token", LIMIT)
+
+    # Halfway into the next window the full previous one still counts for
+    # half the limit, leaving room for the other half.
+    clock.now += 1.5 * WINDOW - clock.now % WINDOW
+    results = await checks(rate_limiter, "token", LIMIT // 2 + 1)
+    assert results == [False] * (LIMIT // 2) + [True]
+
+    # Two windows on, nothing from before counts any more.
+    clock.now += 2 * WINDOW
+    assert await checks(rate_limiter, "token", LIMIT) == [False] * LIMIT
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown rate limit backend"):
+        get_rate_limiter(backend="memcached")
+
+
+def test_redis_backend_needs_a_url():
+    with pytest.raises(RuntimeError, match="REDIS_URL"):
+        RedisRateLimiter(limit=LIMIT, window=WINDOW, url=None)
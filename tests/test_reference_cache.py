@@ -0,0 +1,149 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlmodel import update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import Company, Employee, Loan, Period
+from utils.reference_cache import ReferenceCache
+
+
+@pytest.fixture
+def cache():
+    return ReferenceCache(maxsize=16)
+
+
+async def rename(engine, id, name):
+    async with AsyncSession(engine) as session:
+        await session.exec(update(Loan).where(Loan.id == id).values(name=name))
+        await session.commit()
+
+
+async def test_second_read_is_a_hit(engine, references, cache, record_statements):
+    loan_id = references["loan"].id
+    async with AsyncSession(engine) as session:
+        with record_statements(engine) as statements:
+            first = await cache.get(Loan, loan_id, session)
+            second = await cache.get(Loan, loan_id, session)
+
+    assert len(statements) == 1
+    assert first is second
+    assert first.name == "Car loan"
+    assert first not in session
+
+
+async def test_missing_row_is_not_cached(engine, references, cache, record_statements):
+    async with AsyncSession(engine) as session:
+        with record_statements(engine) as statements:
+            assert await cache.get(Loan, uuid4(), session) is None
+            assert await cache.get(Loan, uuid4(), session) is None
+
+    assert len(statements) == 2
+
+
+@pytest.mark.parametrize("whole_table", [False, True])
+async def test_invalidate_throws_away_reads_that_finish_after_it(
+    engine, references, cache, whole_table
+):
+    loan_id = references["loan"].id
+    read, resume = asyncio.Event(), asyncio.Event()
+
+    async with AsyncSession(engine) as session:
+        get = session.get
+
+        async def slow_get(*args, **kwargs):
+            # The row is read before the change but stored after it.
+            obj = await get(*args, **kwargs)
+            read.set()
+            await resume.wait()
+            return obj
+
+        session.get = slow_get
+        reading = asyncio.create_task(cache.get(Loan, loan_id, session))
+        await read.wait()
+
+        await rename(engine, loan_id, "Home loan")
+        cache.invalidate(Loan, None if whole_table else loan_id)
+
+        resume.set()
+        assert (await reading).name == "Car loan"
+
+    async with AsyncSession(engine) as session:
+        assert (await cache.get(Loan, loan_id, session)).name == "Home loan"
+
+
+async def test_invalidate_one_row_keeps_the_others(engine, references, cache):
+    loan_id = references["loan"].id
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        other = Loan(code="HOME", name="Home loan")
+        session.add(other)
+        await session.commit()
+
+        await cache.get(Loan, loan_id, session)
+        await cache.get(Loan, other.id, session)
+
+    await rename(engine, other.id, "Renamed")
+    cache.invalidate(Loan, loan_id)
+
+    async with AsyncSession(engine) as session:
+        assert (await cache.get(Loan, other.id, session)).name == "Home loan"
+
+
+async def test_together_reads_the_misses_in_one_query(
+    engine, references, cache, record_statements
+):
+    refs = {
+        Loan: references["loan"].id,
+        Company: uuid4(),
+        Period: references["period"].id,
+        Employee: references["employee"].id,
+    }
+    async with AsyncSession(engine) as session:
+        await cache.get(Loan, references["loan"].id, session)
+        with record_statements(engine) as statements:
+            found = await cache.get_together(refs, session, uncached=(Employee,))
+
+    assert len(statements) == 1
+    assert found[Company] is None
+    assert found[Loan].id == references["loan"].id
+    assert found[Period].id == references["period"].id
+    assert found[Employee].id == references["employee"].id
+
+
+async def test_together_caches_what_it_read(
+    engine, references, cache, record_statements
+):
+    refs = {Loan: references["loan"].id, Employee: references["employee"].id}
+    async with AsyncSession(engine) as session:
+        await cache.get_together(refs, session, uncached=(Employee,))
+        with record_statements(engine) as statements:
+            found = await cache.get_together({Loan: refs[Loan]}, session)
+
+    assert statements == []
+    assert found[Loan].id == refs[Loan]
+
+
+async def test_together_with_one_missing_row(engine, references, cache):
+    async with AsyncSession(engine) as session:
+        assert await cache.get_together({Company: uuid4()}, session) == {
+            Company: None
+        }
+
+
+async def test_loan_entry_names_every_missing_reference(client, references):
+    response = await client.post(
+        "/v1/loan_entries/",
+        json={
+            "loan_id": str(uuid4()),
+            "employee_id": str(references["employee"].id),
+            "deduction_start_period_id": str(uuid4()),
+            "amount": "1200",
+            "duration": "12",
+        },
+    )
+
+    assert response.status_code == 404, response.text
+    assert response.json()["detail"] == (
+        "Not found: loan_id, deduction_start_period_id"
+    )
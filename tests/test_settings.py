@@ -0,0 +1,26 @@
+import importlib
+
+import pytest
+
+import config.settings
+
+
+@pytest.fixture
+def reload_settings(monkeypatch):
+    """Re-read the settings under the environment the test sets up."""
+    yield lambda: importlib.reload(config.settings)
+    monkeypatch.undo()
+    importlib.reload(config.settings)
+
+
+@pytest.mark.parametrize("value", ["gh", "Gh", "GH"])
+def test_holiday_country_is_upper_cased(monkeypatch, reload_settings, value):
+    monkeypatch.setenv("HOLIDAY_COUNTRY", value)
+
+    assert reload_settings().HOLIDAY_COUNTRY == "GH"
+
+
+def test_holiday_country_defaults_to_none(monkeypatch, reload_settings):
+    monkeypatch.delenv("HOLIDAY_COUNTRY", raising=False)
+
+    assert reload_settings().HOLIDAY_COUNTRY is None
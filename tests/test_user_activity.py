@@ -0,0 +1,56 @@
+import pytest
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models.user import UserActivityLog
+from services.user import UserActivity
+from utils.rate_limit import InMemoryRateLimiter
+
+
+@pytest.fixture
+def activity():
+    return UserActivity(rate_limiter=InMemoryRateLimiter())
+
+
+async def logged(engine) -> list[str]:
+    async with AsyncSession(engine) as session:
+        rows = await session.exec(
+            select(UserActivityLog.username).order_by(UserActivityLog.seen_at)
+        )
+        return list(rows.all())
+
+
+async def test_flush_writes_new_and_changed_activity(engine, activity):
+    await activity.track_user_activity("ada", ip="10.0.0.1", device="a")
+    await activity.track_user_activity("ada", ip="10.0.0.1", device="a")
+    await activity.track_user_activity("ada", ip="10.0.0.2", device="a")
+    await activity.track_user_activity("bob", ip="10.0.0.3", device="b")
+
+    async with AsyncSession(engine) as session:
+        assert await activity.flush(session=session) == 3
+        assert await activity.flush(session=session) == 0
+
+    assert await logged(engine) == ["ada", "ada", "bob"]
+
+
+async def test_failed_flush_keeps_the_records(engine, activity, monkeypatch):
+    await activity.track_user_activity("ada", ip="10.0.0.1", device="a")
+
+    async with AsyncSession(engine) as session:
+
+        async def commit():
+            # A record tracked while the INSERT is in flight.
+            await activity.track_user_activity("bob", ip="10.0.0.3", device="b")
+            raise ConnectionError("database went away")
+
+        monkeypatch.setattr(session, "commit", commit)
+        with pytest.raises(ConnectionError):
+            await activity.flush(session=session)
+
+    assert [record["username"] for record in activity.pending] == ["ada", "bob"]
+    assert await logged(engine) == []
+
+    async with AsyncSession(engine) as session:
+        assert await activity.flush(session=session) == 2
+
+    assert await logged(engine) == ["ada", "bob"]
@@ -0,0 +1,55 @@
+from array import array
+from datetime import date
+from typing import Iterable
+
+
+class BusinessCalendar:
+    """Working days (weekdays that are not holidays) indexed per year.
+
+    Each year is built once into a bitmap of its working days plus a running
+    count, so whether a day is worked and how many working days a range holds
+    are both answered from lookups instead of walking the dates.
+    """
+
+    def __init__(self, holidays: Iterable[date] = ()):
+        self.holidays = frozenset(holidays)
+        self.years: dict[int, tuple[int, array]] = {}
+
+    def _year(self, year: int) -> tuple[int, array]:
+        index = self.years.get(year)
+        if index is None:
+            first = date(year, 1, 1).toordinal()
+            days = date(year, 12, 31).toordinal() - first + 1
+            holidays = {
+                day.toordinal() - first for day in self.holidays if day.year == year
+            }
+
+            bitmap = 0
+            # running[n] is the number of working days before day n of the year.
+            running = array("H", [0]) * (days + 1)
+            for day in range(days):
+                worked = (first + day - 1) % 7 < 5 and day not in holidays
+                if worked:
+                    bitmap |= 1 << day
+                running[day + 1] = running[day] + worked
+
+            index = self.years[year] = (bitmap, running)
+        return index
+
+    def is_working_day(self, day: date) -> bool:
+        bitmap, _ = self._year(day.year)
+        return bool(bitmap >> (day.timetuple().tm_yday - 1) & 1)
+
+    def count(self, start_date: date, end_date: date) -> int:
+        """Working days between both dates inclusive."""
+        total = 0
+        for year in range(start_date.year, end_date.year + 1):
+            _, running = self._year(year)
+            first = 0
+            last = len(running) - 1
+            if year == start_date.year:
+                first = start_date.timetuple().tm_yday - 1
+            if year == end_date.year:
+                last = end_date.timetuple().tm_yday
+            total += max(running[last] - running[first], 0)
+        return total
@@ -1,4 +1,41 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
+from prometheus_client import Gauge, Histogram
+
+from config.settings import (
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_MAX_QUEUE,
+    PASSWORD_HASH_WORKERS,
+)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hashes are already waiting for a worker thread."""
+
+
+# bcrypt releases the GIL while hashing, so a small thread pool keeps the
+# 100-300 ms of work per call off the event loop.
+_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_slots = asyncio.Semaphore(PASSWORD_HASH_WORKERS)
+_waiting = 0
+
+HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth", "Password hash/verify calls waiting for a thread"
+)
+HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight", "Password hash/verify calls currently running"
+)
+HASH_WAIT_SECONDS = Histogram(
+    "password_hash_wait_seconds", "Time spent waiting for a password hash thread"
+)
+HASH_SECONDS = Histogram(
+    "password_hash_seconds", "Time spent hashing or verifying a password"
+)
 
 
 def truncate(password: str) -> bytes:
@@ -6,7 +43,7 @@ def truncate(password: str) -> bytes:
 
 
 def hash_password(password: str) -> str:
-    hashed = bcrypt.hashpw(truncate(password), bcrypt.gensalt())
+    hashed = bcrypt.hashpw(truncate(password), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
     return hashed.decode()
 
 
@@ -14,6 +51,49 @@ def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(truncate(password), hashed.encode())
 
 
+def needs_rehash(hashed: str) -> bool:
+    """Whether a stored hash was made with a different bcrypt cost factor."""
+    try:
+        return int(hashed.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+async def _run(func, *args):
+    global _waiting
+
+    if _waiting >= PASSWORD_HASH_MAX_QUEUE:
+        raise PasswordHasherBusy()
+
+    _waiting += 1
+    HASH_QUEUE_DEPTH.inc()
+    queued_at = time.perf_counter()
+    try:
+        await _slots.acquire()
+    finally:
+        _waiting -= 1
+        HASH_QUEUE_DEPTH.dec()
+
+    started_at = time.perf_counter()
+    HASH_WAIT_SECONDS.observe(started_at - queued_at)
+    HASH_IN_FLIGHT.inc()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, func, *args)
+    finally:
+        HASH_IN_FLIGHT.dec()
+        HASH_SECONDS.observe(time.perf_counter() - started_at)
+        _slots.release()
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await _run(verify_password, password, hashed)
+
+
 # from passlib.context import CryptContext
 
 # pwd_hasher = CryptContext(schemes=["argon2"])
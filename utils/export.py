@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+from sqlmodel import SQLModel
+
+from config.db import async_session
+from config.settings import EXPORT_BATCH_SIZE
+from utils.text_options import ExportFormat
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+async def stream_rows(
+    query,
+    fields: list[str],
+    format: ExportFormat,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    scalars: bool = True,
+) -> AsyncIterator[str]:
+    """Yield ``query`` serialized as NDJSON or CSV, one batch of rows at a time.
+
+    Rows come from a server-side cursor and the session only holds weak
+    references to them, so memory stays flat however many rows there are.  The
+    generator opens its own session because it runs after the request
+    handler has returned.  Pass ``scalars=False`` for column projections, whose
+    rows are read by label instead of as model instances.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if format == ExportFormat.CSV:
+        writer.writerow(fields)
+
+    async with async_session() as session:
+        stream = session.stream_scalars if scalars else session.stream
+        result = await stream(query.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            for obj in partition:
+                row = [_plain(getattr(obj, field)) for field in fields]
+                if format == ExportFormat.CSV:
+                    writer.writerow(row)
+                else:
+                    buffer.write(json.dumps(dict(zip(fields, row))))
+                    buffer.write("\n")
+
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_response(
+    query,
+    schema: type[SQLModel],
+    format: ExportFormat,
+    filename: str,
+    scalars: bool = True,
+) -> StreamingResponse:
+    """Stream ``query`` with the fields of ``schema`` as an attachment."""
+    fields = list(schema.model_fields)
+    return StreamingResponse(
+        stream_rows(query=query, fields=fields, format=format, scalars=scalars),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{format}"'
+        },
+    )
@@ -1,16 +1,28 @@
-from datetime import date, timedelta
+from datetime import date
+from decimal import Decimal
+from functools import lru_cache
 import calendar
 import math
 from uuid import UUID
 
+from dateutil.relativedelta import relativedelta
 from fastapi import HTTPException, status
+from sqlalchemy import bindparam, column, values
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
+from sqlmodel import select, update
 
+from config.settings import MAX_LOAN_PERIODS
 from models.payment_schedule import Payment, PaymentSchedule
+from models.period_year import Period
 from schemas.loan import LoanEntriesCreate
 from schemas.payment_schedule import PaymentScheduleCreate
 from services.payment_schedule import PaymentScheduleService
+from utils import money
+from utils.amortization import amortize
+from utils.business_days import BusinessCalendar
+
+# asyncpg refuses statements with more bind parameters than this.
+MAX_BIND_PARAMS = 32767
 
 MONTH_NAMES = {
     1: "January",
@@ -28,20 +40,30 @@ MONTH_NAMES = {
 }
 
 
-def count_working_days(start_date, end_date):
+def count_working_days(
+    start_date, end_date, business_calendar: BusinessCalendar | None = None
+):
+    """Weekdays between both dates inclusive, without walking the range.
+
+    With a ``business_calendar`` its holidays are left out as well.
+    """
     if start_date and end_date:
         total_days = (end_date - start_date).days + 1
-        working_days = 0
+        if total_days <= 0:
+            return 0
+        if business_calendar is not None:
+            return business_calendar.count(start_date, end_date)
 
-        for day in range(total_days):
-            current_day = start_date + timedelta(days=day)
-            if current_day.weekday() < 5:
-                working_days += 1
-
-        return working_days
+        weeks, remainder = divmod(total_days, 7)
+        first = start_date.weekday()
+        return weeks * 5 + sum(
+            1 for day in range(remainder) if (first + day) % 7 < 5
+        )
 
 
+@lru_cache(maxsize=64)
 def generate_calender(year):
+    """Day numbers of each week of every month; cached, so do not mutate it."""
     cal = calendar.Calendar()
     year_calender = {}
 
@@ -59,6 +81,83 @@ def get_days_in_month(year: int, month: int):
     return calendar.monthrange(year, month)[1]
 
 
+def whole_periods(duration) -> int:
+    """Round a (possibly fractional) duration up to whole months.
+
+    Any fraction of a month counts, however small: 2.004 months is 3.
+    """
+    return math.ceil(Decimal(duration))
+
+
+def resolve_term(amount, duration=None, monthly_repayment=None):
+    """Work out ``(periods, installment, duration)`` for a loan.
+
+    A monthly repayment takes precedence over the duration: it fixes the
+    principal repaid per month and the duration follows from it.  Terms
+    longer than ``MAX_LOAN_PERIODS`` are rejected.
+    """
+    amount_cents = money.to_cents(amount)
+    installment = money.to_cents(monthly_repayment)
+
+    if amount_cents and installment:
+        term = (
+            money.periods(amount_cents, installment),
+            monthly_repayment,
+            money.ratio(amount_cents, installment),
+        )
+    elif amount_cents and duration:
+        term = (whole_periods(duration), None, duration)
+    else:
+        return 0, None, duration
+
+    if term[0] > MAX_LOAN_PERIODS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"A loan cannot run for more than {MAX_LOAN_PERIODS} periods",
+        )
+    return term
+
+
+def due_dates(start_date: date, months: int) -> list[date]:
+    """Installment ``n`` falls due ``n - 1`` months after ``start_date``."""
+    return [start_date + relativedelta(months=month) for month in range(months)]
+
+
+async def backfill_due_periods(
+    start_date: date,
+    end_date: date,
+    session: AsyncSession,
+    loan_entry_id: UUID | None = None,
+) -> int:
+    """Set the period of installments due between the dates that have none.
+
+    An installment belongs to the earliest created period whose dates cover
+    its due date.  New schedules are placed this way, and since only existing
+    periods can be found, creating periods later runs it again for the
+    installments that fall in them.  One UPDATE; nothing is committed here.
+    """
+    schedules = PaymentSchedule.__table__
+    periods = Period.__table__
+    period_id = (
+        select(periods.c.id)
+        .where(
+            periods.c.start_date <= schedules.c.due_date,
+            periods.c.end_date >= schedules.c.due_date,
+        )
+        .order_by(periods.c.created_at)
+        .limit(1)
+        .scalar_subquery()
+    )
+    query = update(schedules).where(
+        schedules.c.period_id.is_(None),
+        schedules.c.due_date.between(start_date, end_date),
+    )
+    if loan_entry_id:
+        query = query.where(schedules.c.loan_entry_id == loan_entry_id)
+    result = await session.exec(query.values(period_id=period_id))
+    return result.rowcount
+
+
 async def defualt_schedule_generation(
     start_date: date,
     loan_id: UUID,
@@ -68,39 +167,58 @@ async def defualt_schedule_generation(
     try:
         from models.loan import LoanEntries
         loan_entry = await session.get(LoanEntries, loan_id)
+        duration = data.duration
         if isinstance(start_date, date):
-            if data.amount and data.monthly_repayment:
-                duration = data.amount / data.monthly_repayment
-                data.duration = duration
-                data.monthly_repayment = data.amount / duration
-
-            if data.amount and data.duration:
-                data.monthly_repayment = data.amount / data.duration
-
-            if data.amount and data.duration and data.monthly_repayment:
-                amount_left = data.amount
-                for month in range(1, math.ceil(data.duration) + 1):
-                    monthly_amount = min(amount_left, data.monthly_repayment)
-                    amount_left = round(amount_left - monthly_amount, 4)
-                    await PaymentScheduleService.create_schedule(
-                        data=PaymentScheduleCreate(
-                            loan_entry_id=loan_id,
-                            month=month,
-                            employee_id=loan_entry.employee_id,
-                            employee_code=loan_entry.employee_code,
-                            employee_fullname=loan_entry.employee_fullname,
-                            monthly_payment=monthly_amount,
-                            balance_bf=amount_left + monthly_amount,
-                            balance=amount_left,
-                            # company_id=loan_id.company_id,
-                            # company_name=loan_id.company_name,
-                            user_id=loan_entry.user_id,
-                            # user_name=loan_id.user_name,
-                        ),
-                        session=session,
+            periods, installment, duration = resolve_term(
+                amount=data.amount,
+                duration=data.duration,
+                monthly_repayment=data.monthly_repayment,
+            )
+            data.duration = duration
+
+            if periods:
+                schedule = amortize(
+                    principal=data.amount,
+                    periods=periods,
+                    rate=data.interest_rate,
+                    calculation_type=data.calculation_type,
+                    interest_term=data.interest_term,
+                    installment=installment,
+                )
+                schedule_rows = schedule.rows()
+                dues = due_dates(start_date, len(schedule_rows))
+                if schedule_rows:
+                    data.monthly_repayment = schedule_rows[0]["monthly_payment"]
+                    loan_entry.monthly_repayment = data.monthly_repayment
+                    loan_entry.periodic_principal = schedule_rows[0]["principal"]
+
+                schedules = [
+                    PaymentScheduleCreate(
+                        loan_entry_id=loan_id,
+                        month=row["month"],
+                        due_date=due_date,
+                        employee_code=loan_entry.employee_code,
+                        employee_fullname=loan_entry.employee_fullname,
+                        monthly_payment=row["monthly_payment"],
+                        interest=row["interest"],
+                        balance_bf=row["balance_bf"],
+                        balance=row["balance"],
+                        company_id=loan_entry.company_id,
+                        company_name=loan_entry.company_name,
+                        user_id=loan_entry.user_id,
+                    )
+                    for row, due_date in zip(schedule_rows, dues)
+                ]
+
+                await PaymentScheduleService.create_schedules(
+                    data=schedules, session=session
+                )
+                if dues:
+                    await backfill_due_periods(
+                        dues[0], dues[-1], session, loan_entry_id=loan_id
                     )
-                    if amount_left <= 0:
-                        break
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     return duration
@@ -111,17 +229,62 @@ async def get_sorted_schedules_and_min_month(
 ) -> tuple[list[PaymentSchedule], PaymentSchedule]:
     query = (
         select(PaymentSchedule)
-        .where(PaymentSchedule.loan_entry_id == loan_entry_id)
+        .where(
+            PaymentSchedule.loan_entry_id == loan_entry_id,
+            PaymentSchedule.is_deleted.is_not(True),
+        )
         .order_by(PaymentSchedule.month.asc())
     )
     schedules = await session.exec(query)
     schedules = schedules.unique().all()
-    min_month = schedules[0]
+    min_month = first_unpaid_schedule(schedules)
     return schedules, min_month
 
 
+def first_unpaid_schedule(schedules: list[PaymentSchedule]) -> PaymentSchedule | None:
+    return next((schedule for schedule in schedules if not schedule.paid), None)
+
+
+async def bulk_update(model, rows: list[dict], session: AsyncSession) -> int:
+    """Update many rows of ``model`` by primary key in a single statement.
+
+    Every row is a dict holding ``id`` plus the same set of columns to set.  On
+    Postgres this is one ``UPDATE ... FROM (VALUES ...)`` per as many rows as
+    fit in ``MAX_BIND_PARAMS``; other databases get an executemany of the same
+    UPDATE.  Nothing is committed here.
+    """
+    if not rows:
+        return 0
+
+    table = model.__table__
+    if session.bind.dialect.name != "postgresql":
+        await session.exec(
+            update(table).where(table.c.id == bindparam("_id")),
+            params=[
+                {"_id": row["id"], **{k: v for k, v in row.items() if k != "id"}}
+                for row in rows
+            ],
+        )
+        return len(rows)
+
+    keys = list(rows[0])
+    chunk = MAX_BIND_PARAMS // len(keys)
+    for start in range(0, len(rows), chunk):
+        data = values(
+            *(column(key, table.c[key].type) for key in keys), name="data"
+        ).data([tuple(row[key] for key in keys) for row in rows[start : start + chunk]])
+        await session.exec(
+            update(table)
+            .where(table.c.id == data.c.id)
+            .values({key: data.c[key] for key in keys if key != "id"})
+        )
+    return len(rows)
+
+
 async def delete_payment_by_loan_entry_id(loan_entry_id: UUID, session: AsyncSession):
-    query = select(Payment).where(Payment.loan_entry_id == loan_entry_id)
+    query = select(Payment).where(
+        Payment.loan_entry_id == loan_entry_id, Payment.is_deleted.is_not(True)
+    )
     result = await session.exec(query)
 
     payments = result.unique().all()
@@ -0,0 +1,71 @@
+"""Fixed-point money helpers.
+
+Amounts cross the service boundary as ``Decimal`` (that is what the DECIMAL
+columns and schemas carry) but all arithmetic happens on integer cents.
+There is one rounding policy: values are rounded half-up to the cent when
+they enter, and integer divisions round half-up as well.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable, Sequence
+
+ROUNDING = ROUND_HALF_UP
+CENT = Decimal("0.01")
+HUNDRED = Decimal(100)
+ZERO = Decimal("0.00")
+
+
+def to_cents(value: Decimal | int | str | None) -> int:
+    """Convert an amount to integer cents, ``None`` counting as zero."""
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value * 100
+    if not isinstance(value, Decimal):
+        value = Decimal(value)
+    return int((value * HUNDRED).to_integral_value(rounding=ROUNDING))
+
+
+def to_decimal(cents: int) -> Decimal:
+    """Convert integer cents back to a two-place ``Decimal``."""
+    return Decimal(cents).scaleb(-2)
+
+
+def quantize(value: Decimal | int | str | None) -> Decimal:
+    return to_decimal(to_cents(value))
+
+
+def round_div(numerator: int, denominator: int) -> int:
+    """Integer division rounding half-up, for non-negative numerators."""
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def total(values: Iterable[Decimal | int | str | None]) -> int:
+    """Sum amounts as integer cents."""
+    return sum(map(to_cents, values))
+
+
+def periods(amount: int, installment: int) -> int:
+    """Number of instalments of ``installment`` cents needed to repay ``amount``."""
+    return -(-amount // installment)
+
+
+def ratio(amount: int, installment: int) -> Decimal:
+    """``amount / installment`` rounded to two places, e.g. a loan duration."""
+    return to_decimal(round_div(amount * 100, installment))
+
+
+def allocate(amount: int, due: Sequence[int], paid: Sequence[int]) -> list[int]:
+    """Spread ``amount`` cents over rows in order, filling each row's shortfall.
+
+    Returns the cents applied to every row; anything left over once all rows
+    are settled is not applied.
+    """
+    applied = []
+    for row_due, row_paid in zip(due, paid):
+        share = min(amount, row_due - row_paid) if amount > 0 else 0
+        if share < 0:
+            share = 0
+        applied.append(share)
+        amount -= share
+    return applied
@@ -0,0 +1,221 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import func, text, tuple_
+from sqlalchemy.exc import CompileError
+from sqlmodel import SQLModel, select
+from sqlmodel.sql.expression import SelectOfScalar
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config.settings import MAX_PAGE_SIZE
+from schemas.base import ResponseModel
+from utils.text_options import CountMode
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def _load(value: Any, column) -> Any:
+    if value is None:
+        return None
+
+    python_type = column.type.python_type
+    if python_type in (datetime, date):
+        return python_type.fromisoformat(value)
+    if python_type in (UUID, Decimal):
+        return python_type(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any], backward: bool = False) -> str:
+    payload = json.dumps({"k": [_dump(value) for value in values], "b": backward})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence) -> tuple[list[Any], bool]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        values = payload["k"]
+        if len(values) != len(keys):
+            raise ValueError("cursor does not match the sort keys")
+        return [_load(v, key) for v, key in zip(values, keys)], bool(payload["b"])
+    except (binascii.Error, KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from None
+
+
+def parse_fields(fields: str | None, schema: type[SQLModel]) -> list[str] | None:
+    """Field names from a comma-separated ``fields`` parameter, checked against
+    ``schema``; ``None`` when the client wants every field."""
+    if not fields:
+        return None
+
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",")))
+    names = [name for name in names if name]
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"Unknown fields: {', '.join(unknown) or fields}",
+        )
+    return names
+
+
+def projection(
+    model: type[SQLModel],
+    schema: type[SQLModel],
+    fields: list[str] | None = None,
+    keys: Sequence = (),
+) -> list:
+    """The columns of ``model`` that ``schema`` reads, for ``select(*columns)``.
+
+    Selecting these instead of the entity returns plain rows: no instances are
+    built and nothing is tracked by the session.  ``fields`` narrows them to a
+    sparse fieldset; the pagination ``keys`` are always added so the cursors
+    can still be read.
+    """
+    names = fields or list(schema.model_fields)
+    columns = [getattr(model, name) for name in names]
+    return columns + [key for key in keys if key.key not in names]
+
+
+async def estimate_rows(session: AsyncSession, query) -> int | None:
+    """Planner row estimate for ``query``; ``None`` when it cannot be obtained."""
+    dialect = session.bind.dialect
+    if dialect.name != "postgresql":
+        return None
+
+    try:
+        sql = query.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    except (CompileError, NotImplementedError):
+        return None
+
+    result = await session.exec(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(session: AsyncSession, query, mode: CountMode) -> int:
+    query = query.order_by(None).limit(None).offset(None)
+
+    if mode == CountMode.ESTIMATE:
+        estimate = await estimate_rows(session=session, query=query)
+        if estimate is not None:
+            return estimate
+
+    result = await session.exec(select(func.count()).select_from(query.subquery()))
+    return result.one()
+
+
+async def paginate(
+    session: AsyncSession,
+    query,
+    keys: Sequence,
+    limit: int = 10,
+    cursor: str | None = None,
+    descending: bool = False,
+    count: CountMode | None = None,
+) -> ResponseModel:
+    """Return one keyset page of ``query`` ordered by ``keys``.
+
+    ``keys`` must be non-null columns that together are unique (end them with
+    the primary key) so every row has exactly one position.  ``next`` and
+    ``previous`` hold opaque cursors for the neighbouring pages and ``count``
+    is only filled in when a ``count`` mode is requested.
+
+    A ``query`` over columns rather than an entity (see ``projection``) must
+    select the ``keys``; its rows come back as dicts.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    total = await count_rows(session, query, count) if count else None
+
+    backward = False
+    if cursor:
+        values, backward = decode_cursor(cursor, keys)
+        if descending != backward:
+            query = query.where(tuple_(*keys) < tuple(values))
+        else:
+            query = query.where(tuple_(*keys) > tuple(values))
+
+    reverse = descending != backward
+    order = [key.desc() if reverse else key.asc() for key in keys]
+    result = await session.exec(query.order_by(None).order_by(*order).limit(limit + 1))
+
+    entities = isinstance(query, SelectOfScalar)
+    rows = list(result.unique().all() if entities else result.all())
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backward:
+        rows.reverse()
+
+    next_cursor = previous_cursor = None
+    if rows:
+        first = [getattr(rows[0], key.key) for key in keys]
+        last = [getattr(rows[-1], key.key) for key in keys]
+        if has_more or backward:
+            next_cursor = encode_cursor(last)
+        if (has_more and backward) or (cursor and not backward):
+            previous_cursor = encode_cursor(first, backward=True)
+
+    if not entities:
+        rows = [row._asdict() for row in rows]
+
+    return ResponseModel(
+        count=total, next=next_cursor, previous=previous_cursor, results=rows
+    )
+
+
+def with_links(page: ResponseModel, request: Request) -> ResponseModel:
+    """Turn the page's cursor tokens into absolute links for ``request``."""
+    url = request.url.remove_query_params("cursor")
+    if page.next:
+        page.next = str(url.include_query_params(cursor=page.next))
+    if page.previous:
+        page.previous = str(url.include_query_params(cursor=page.previous))
+    return page
+
+
+def page_response(
+    page: ResponseModel, schema: type[SQLModel], fields: list[str] | None = None
+) -> Response:
+    """Serialize ``page`` straight to JSON bytes with only the fields of ``schema``,
+    or just ``fields`` when given.
+
+    Each row is written by its own model's serializer instead of first being
+    validated into ``schema``, which costs more than the serialization
+    itself.  Every field of ``schema`` must exist on the rows.
+    """
+    include = {
+        "count": True,
+        "next": True,
+        "previous": True,
+        "results": {"__all__": set(fields or schema.model_fields)},
+    }
+    return Response(
+        content=page.model_dump_json(include=include), media_type="application/json"
+    )
+
+
+def item_response(
+    item: Any, schema: type[SQLModel], fields: list[str] | None = None
+) -> Response:
+    """``item`` as ``schema`` in JSON, narrowed to ``fields`` when given."""
+    content = schema.model_validate(item).model_dump_json(
+        include=set(fields) if fields else None
+    )
+    return Response(content=content, media_type="application/json")
@@ -0,0 +1,124 @@
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from config.settings import RATE_LIMIT_BACKEND, REDIS_URL, REQUESTS_PER_MINUTE
+
+
+class RateLimiter(ABC):
+    """Allows ``limit`` requests per ``window`` seconds for each key."""
+
+    def __init__(self, limit: int = REQUESTS_PER_MINUTE, window: int = 60):
+        self.limit = limit
+        self.window = window
+
+    @abstractmethod
+    async def is_rate_limited(self, key: str) -> bool:
+        """Record a request for ``key`` and tell whether it is over the limit."""
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """Per-process token bucket, O(1) per check.
+
+    Buckets are kept in last-used order, so idle ones (which would be full
+    again anyway) are evicted from the front without scanning, and the map
+    never holds more than ``max_keys`` buckets.
+    """
+
+    def __init__(
+        self,
+        limit: int = REQUESTS_PER_MINUTE,
+        window: int = 60,
+        max_keys: int = 100_000,
+    ):
+        super().__init__(limit=limit, window=window)
+        self.max_keys = max_keys
+        self.rate = limit / window
+        self.buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def evict(self, now: float):
+        while self.buckets:
+            key, (_, updated) = next(iter(self.buckets.items()))
+            if now - updated < self.window and len(self.buckets) <= self.max_keys:
+                break
+            del self.buckets[key]
+
+    async def is_rate_limited(self, key: str) -> bool:
+        now = time.monotonic()
+        tokens, updated = self.buckets.pop(key, (float(self.limit), now))
+        tokens = min(self.limit, tokens + (now - updated) * self.rate)
+
+        limited = tokens < 1
+        if not limited:
+            tokens -= 1
+
+        self.buckets[key] = (tokens, now)
+        self.evict(now)
+
+        return limited
+
+
+class RedisRateLimiter(RateLimiter):
+    """Sliding-window counter shared by every worker through Redis.
+
+    Two fixed-window counters (current and previous) are kept per key and the
+    previous one is weighted by how much of it still overlaps the sliding
+    window.  Each check is one pipelined round trip and keys expire on their
+    own after two windows.
+    """
+
+    def __init__(
+        self,
+        limit: int = REQUESTS_PER_MINUTE,
+        window: int = 60,
+        client=None,
+        url: str | None = REDIS_URL,
+        prefix: str = "ratelimit",
+    ):
+        super().__init__(limit=limit, window=window)
+        if client is None:
+            if not url:
+                raise RuntimeError(
+                    "The redis rate limit backend requires REDIS_URL to be set"
+                )
+            try:
+                from redis import asyncio as redis
+            except ImportError as e:
+                raise RuntimeError(
+                    "The redis rate limit backend requires the 'redis' package"
+                ) from e
+            client = redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    async def is_rate_limited(self, key: str) -> bool:
+        now = time.time()
+        window, elapsed = divmod(now, self.window)
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        current_key = f"{self.prefix}:{digest}:{int(window)}"
+        previous_key = f"{self.prefix}:{digest}:{int(window) - 1}"
+
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.get(previous_key)
+            pipe.incr(current_key)
+            pipe.expire(current_key, self.window * 2)
+            previous, current, _ = await pipe.execute()
+
+        weight = 1 - elapsed / self.window
+        return int(previous or 0) * weight + int(current) > self.limit
+
+
+RATE_LIMIT_BACKENDS = {
+    "memory": InMemoryRateLimiter,
+    "redis": RedisRateLimiter,
+}
+
+
+def get_rate_limiter(
+    backend: str = RATE_LIMIT_BACKEND, limit: int = REQUESTS_PER_MINUTE
+) -> RateLimiter:
+    try:
+        return RATE_LIMIT_BACKENDS[backend](limit=limit)
+    except KeyError:
+        raise ValueError(f"Unknown rate limit backend: {backend}") from None
@@ -0,0 +1,144 @@
+from typing import Hashable, TypeVar
+
+from prometheus_client import Counter
+from sqlmodel import SQLModel, literal, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config.settings import REFERENCE_CACHE_SIZE, REFERENCE_CACHE_TTL_SECONDS
+from utils.cache import TTLCache
+
+Model = TypeVar("Model", bound=SQLModel)
+
+REFERENCE_CACHE_HITS = Counter(
+    "reference_cache_hits", "Reference rows served from the cache", ["model"]
+)
+REFERENCE_CACHE_MISSES = Counter(
+    "reference_cache_misses", "Reference rows read from the database", ["model"]
+)
+
+
+class ReferenceCache:
+    """Per-worker read-through cache of rows that rarely change, by primary key.
+
+    Entries are detached copies: read them, never add them to a session.
+    Each entry carries the version of its table and row it was read under;
+    ``invalidate`` bumps that version, so a copy read before a change is never
+    served after it, even when the read finishes last.  Changes made by other
+    workers are picked up once the TTL runs out.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None):
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.table_versions: dict[str, int] = {}
+        self.row_versions: dict[tuple[str, Hashable], int] = {}
+
+    def _version(self, key: tuple[str, Hashable]) -> tuple[int, int]:
+        return self.table_versions.get(key[0], 0), self.row_versions.get(key, 0)
+
+    def _lookup(self, key: tuple[str, Hashable]):
+        entry = self.entries.get(key, count=False)
+        if entry is not None and entry[0] == self._version(key):
+            REFERENCE_CACHE_HITS.labels(model=key[0]).inc()
+            return entry[1]
+        REFERENCE_CACHE_MISSES.labels(model=key[0]).inc()
+        return None
+
+    def _store(self, model: type[Model], obj: Model, version: tuple[int, int]):
+        key = (model.__tablename__, obj.id)
+        copy = model(**obj.model_dump())
+        self.entries.set(key, (version, copy))
+        return copy
+
+    async def get(
+        self, model: type[Model], id: Hashable, session: AsyncSession
+    ) -> Model | None:
+        key = (model.__tablename__, id)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        version = self._version(key)
+        obj = await session.get(model, id)
+        if obj is None:
+            return None
+        return self._store(model, obj, version)
+
+    async def get_many(
+        self, model: type[Model], ids: set, session: AsyncSession
+    ) -> dict[Hashable, Model]:
+        """Rows for ``ids`` that exist, with the misses read in one query."""
+        found = {}
+        missing = set()
+        for id in ids:
+            cached = self._lookup((model.__tablename__, id))
+            if cached is not None:
+                found[id] = cached
+            else:
+                missing.add(id)
+
+        if missing:
+            versions = {id: self._version((model.__tablename__, id)) for id in missing}
+            result = await session.exec(select(model).where(model.id.in_(missing)))
+            for obj in result.all():
+                found[obj.id] = self._store(model, obj, versions[obj.id])
+        return found
+
+    async def get_together(
+        self,
+        refs: dict[type[SQLModel], Hashable],
+        session: AsyncSession,
+        uncached: tuple[type[SQLModel], ...] = (),
+    ) -> dict[type[SQLModel], SQLModel | None]:
+        """Rows of several tables by primary key, in at most one round trip.
+
+        Cache misses, and ``uncached`` models that are always read fresh, are
+        LEFT JOINed onto a one-row select, so a missing row comes back as
+        ``None`` without hiding the others.
+        """
+        found = {}
+        wanted = {}
+        versions = {}
+        for model, id in refs.items():
+            key = (model.__tablename__, id)
+            if model not in uncached:
+                cached = self._lookup(key)
+                if cached is not None:
+                    found[model] = cached
+                    continue
+                versions[model] = self._version(key)
+            wanted[model] = id
+
+        if wanted:
+            query = select(*wanted).select_from(select(literal(1)).subquery())
+            for model, id in wanted.items():
+                query = query.outerjoin(model, model.id == id)
+            # Always exactly one row.  With a single model it is the model
+            # itself, or None, which ``one()`` would take for no row at all.
+            (row,) = (await session.exec(query)).all()
+            if len(wanted) == 1:
+                row = (row,)
+
+            for model, obj in zip(wanted, row):
+                if obj is not None and model in versions:
+                    obj = self._store(model, obj, versions[model])
+                found[model] = obj
+        return found
+
+    def invalidate(self, model: type[SQLModel], id: Hashable | None = None):
+        """Drop the cached row ``id`` of ``model``, or every row when omitted."""
+        name = model.__tablename__
+        if id is None:
+            self.table_versions[name] = self.table_versions.get(name, 0) + 1
+            self.row_versions = {
+                key: value for key, value in self.row_versions.items() if key[0] != name
+            }
+            self.entries.pop_where(lambda key, _: key[0] == name)
+        else:
+            key = (name, id)
+            self.row_versions[key] = self.row_versions.get(key, 0) + 1
+            self.entries.pop(key)
+
+
+reference_cache = ReferenceCache(
+    maxsize=REFERENCE_CACHE_SIZE, ttl=REFERENCE_CACHE_TTL_SECONDS
+)
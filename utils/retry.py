@@ -0,0 +1,41 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy.exc import DBAPIError
+
+from config.settings import DB_RETRY_ATTEMPTS, DB_RETRY_BACKOFF_SECONDS
+
+T = TypeVar("T")
+
+# serialization_failure and deadlock_detected: the transaction did nothing
+# wrong and can simply be run again.
+RETRYABLE_SQLSTATES = {"40001", "40P01"}
+
+
+def is_retryable(error: BaseException) -> bool:
+    if not isinstance(error, DBAPIError):
+        return False
+
+    orig = error.orig
+    code = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    return code in RETRYABLE_SQLSTATES
+
+
+async def retry_on_conflict(
+    operation: Callable[[], Awaitable[T]],
+    attempts: int = DB_RETRY_ATTEMPTS,
+    backoff: float = DB_RETRY_BACKOFF_SECONDS,
+) -> T:
+    """Run ``operation`` again when it fails with a serialization failure or deadlock.
+
+    ``operation`` must run a whole transaction and roll it back before raising.
+    Retries back off exponentially with jitter; the last error is re-raised.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return await operation()
+        except DBAPIError as e:
+            if attempt == attempts or not is_retryable(e):
+                raise
+            await asyncio.sleep(backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
@@ -18,3 +18,13 @@ class InterestTerm(StrEnum):
 class PaymentType(StrEnum):
     Default = "Default"
     Custom = "Custom"
+
+
+class CountMode(StrEnum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"